@@ -0,0 +1,222 @@
+"""
+Scaling benchmarks for the algorithms in `network_algs`.
+
+Runs ShareKey.does_scheme_exist, ShareSecret.get_cut_vertices, ShareSecret.get_alternating_path and
+get_connect_sets over random DAGs of varying size, density and number of targets. Reports wall time,
+peak memory and throughput, writes the results to JSON and optionally compares them with a stored baseline.
+
+The graphs come from one or more families of `network_algs.generators` (`--family`). The density p sets the
+expected number of edges, about p*V*(V-1)/2 as for `random_dag`, and each family turns it into its own parameters.
+
+Usage
+-----
+    python benchmarks/bench_scaling.py --output results.json
+    python benchmarks/bench_scaling.py --baseline results.json --tolerance 1.25
+    python benchmarks/bench_scaling.py --family random barabasi_albert watts_strogatz layered
+
+Peak memory is measured with `tracemalloc` in a separate run of each case, since tracing every allocation
+slows the code down several times. It covers allocations made by Python (including NumPy) but not memory
+allocated inside igraph's C core.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import igraph as ig
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from network_algs import ShareKey, ShareSecret, get_connect_sets, to_graph
+from network_algs.dominators import get_dominator_tree
+from network_algs.generators import random_dag, barabasi_albert_dag, watts_strogatz_dag, layered_dag
+
+def _edges_per_vertex(NUM_V: int, p: float):
+    return max(1, round(p * (NUM_V - 1) / 2))
+
+def _layered(NUM_V: int, p: float, rng):
+    # about sqrt(V) layers of sqrt(V) vertices, with the edge probability between layers raised to keep the edge count
+    size = max(1, round(NUM_V ** 0.5))
+    layer_sizes = [size] * (NUM_V // size) + ([NUM_V % size] if NUM_V % size else [])
+    return layered_dag(layer_sizes, min(1.0, _edges_per_vertex(NUM_V, p) / size), rng)
+
+FAMILIES = {
+    "random": lambda NUM_V, p, rng: random_dag(NUM_V, p, rng),
+    "barabasi_albert": lambda NUM_V, p, rng: barabasi_albert_dag(NUM_V, _edges_per_vertex(NUM_V, p), rng),
+    "watts_strogatz": lambda NUM_V, p, rng: watts_strogatz_dag(NUM_V, 2 * _edges_per_vertex(NUM_V, p), 0.1, rng),
+    "layered": _layered,
+}
+
+def shuffled_dag(family: str, NUM_V: int, p: float, seed: int):
+    """
+    DAG from one of the `FAMILIES` with shuffled vertex labels, so that the vertex numbering is not a
+    topological order.
+    """
+    rng = np.random.default_rng(seed)
+    edges = FAMILIES[family](NUM_V, p, rng)
+    perm = rng.permutation(NUM_V)
+    return to_graph(NUM_V, perm[edges])
+
+def pick_targets(Graph: ig.Graph, num_targets: int, seed: int):
+    """
+    Picks targets from the last half of a topological order so most vertices have a chance to reach them.
+    """
+    rng = np.random.default_rng(seed)
+    order = Graph.topological_sorting(mode='out')
+    tail = order[len(order) // 2:]
+    return [int(t) for t in rng.choice(tail, size=min(num_targets, len(tail)), replace=False)]
+
+def pick_pair(Graph: ig.Graph, seed: int, tries: int=20):
+    """
+    Picks a source and a target with at least one cut vertex between them, so that `ShareSecret` has alternating
+    paths to look for. Falls back to the first and last vertex of a topological order if `tries` random sources
+    have no such target.
+    """
+    rng = np.random.default_rng(seed)
+    order = Graph.topological_sorting(mode='out')
+    for source in rng.choice(order, size=min(tries, len(order)), replace=False):
+        source = int(source)
+        idom = get_dominator_tree(Graph, source)
+        # a target has a cut vertex if its immediate dominator is some vertex other than the source
+        targets = [t for t, d in enumerate(idom) if d is not None and d != -1 and d != source]
+        if targets:
+            return source, int(rng.choice(targets))
+    return order[0], order[-1]
+
+def _share_key(Graph, targets, pair):
+    return ShareKey(Graph, targets).does_scheme_exist()
+
+def _cut_vertices(Graph, targets, pair):
+    return ShareSecret(Graph, *pair).get_cut_vertices()
+
+def _alternating_path(Graph, targets, pair):
+    return ShareSecret(Graph, *pair).get_alternating_path()
+
+def _connect_sets(Graph, targets, pair):
+    return get_connect_sets(Graph)
+
+CASES = {
+    "share_key": _share_key,
+    "cut_vertices": _cut_vertices,
+    "alternating_path": _alternating_path,
+    "connect_sets": _connect_sets,
+}
+
+def run_case(case: str, NUM_V: int, p: float, num_targets: int, repeats: int, seed: int, family: str="random"):
+    """
+    Times one benchmark case on `repeats` random graphs, then runs it once more on each graph under
+    `tracemalloc` for the peak memory. Graph generation and the choice of targets and pairs are not included
+    in the timings.
+    """
+    func = CASES[case]
+    times = []
+    peak_mem = 0
+    for r in range(repeats):
+        Graph = shuffled_dag(family, NUM_V, p, seed + r)
+        targets = pick_targets(Graph, num_targets, seed + r)
+        pair = pick_pair(Graph, seed + r) if case in ("cut_vertices", "alternating_path") else None
+        start = time.perf_counter()
+        func(Graph, targets, pair)
+        times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        func(Graph, targets, pair)
+        peak_mem = max(peak_mem, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    total = sum(times)
+    return {
+        "case": case,
+        "family": family,
+        "num_vertices": NUM_V,
+        "density": p,
+        "num_targets": num_targets,
+        "repeats": repeats,
+        "mean_s": total / repeats,
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "graphs_per_s": repeats / total if total > 0 else float("inf"),
+        "peak_mem_bytes": peak_mem,
+    }
+
+def _key(result: dict):
+    # results written before there were several families are for `random_dag`
+    return (result["case"], result.get("family", "random"), result["num_vertices"], result["density"], result["num_targets"])
+
+def compare(results: list, baseline: list, tolerance: float):
+    """
+    Compares median times with a baseline. Returns the results that are slower than `tolerance` times the baseline.
+    """
+    baseline_by_key = {_key(b): b for b in baseline}
+    regressions = []
+    for result in results:
+        base = baseline_by_key.get(_key(result))
+        if base is None or base["median_s"] <= 0:
+            continue
+        ratio = result["median_s"] / base["median_s"]
+        result["baseline_median_s"] = base["median_s"]
+        result["ratio"] = ratio
+        if ratio > tolerance:
+            regressions.append(result)
+    return regressions
+
+def main(argv: list=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=sorted(CASES))
+    parser.add_argument("--family", nargs="+", choices=sorted(FAMILIES), default=["random"],
+                        help="graph families from network_algs.generators")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[50, 100, 200])
+    parser.add_argument("--densities", nargs="+", type=float, default=[0.05, 0.2])
+    parser.add_argument("--targets", nargs="+", type=int, default=[2, 4])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against the results stored in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="report a regression if the median time exceeds the baseline by this factor")
+    args = parser.parse_args(argv)
+
+    results = []
+    for family in args.family:
+        for case in args.cases:
+            # only ShareKey depends on the number of targets
+            target_counts = args.targets if case == "share_key" else [0]
+            for NUM_V in args.sizes:
+                for p in args.densities:
+                    for num_targets in target_counts:
+                        result = run_case(case, NUM_V, p, num_targets, args.repeats, args.seed, family)
+                        results.append(result)
+                        print(f"{family:<16} {case:<18} V={NUM_V:<6} p={p:<5} D={num_targets:<3} "
+                              f"median={result['median_s']:.4f}s  {result['graphs_per_s']:.2f} graphs/s  "
+                              f"peak={result['peak_mem_bytes'] / 2**20:.2f} MiB")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['family']} {r['case']} V={r['num_vertices']} p={r['density']} D={r['num_targets']}: "
+                  f"{r['ratio']:.2f}x baseline")
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "igraph": ig.__version__,
+                "numpy": np.__version__,
+                "args": vars(args),
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
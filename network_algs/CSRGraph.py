@@ -0,0 +1,240 @@
+import itertools
+import igraph as ig
+import numpy as np
+from .tracing import get_tracer
+
+LAYER_COST = 32     # rough cost of one vectorized step over a layer, in units of one Python loop iteration
+
+class CSRGraph:
+    def __init__(self, NUM_V: int, edges: np.ndarray, topological_order: list=None):
+        """
+        Compressed sparse row representation of a directed graph. The out-edges of vertex v are
+        `out_indices[out_indptr[v]:out_indptr[v + 1]]` and its in-edges are stored the same way in
+        `in_indptr`/`in_indices`. Neighbours are sorted, as in igraph. The arrays are built once, after which
+        traversals run over them without calling back into igraph.
+
+        Parameters
+        ----------
+        - NUM_V : int
+            - The number of vertices in the graph
+        - edges : np.ndarray
+            - Integer array of shape (E, 2) holding (source, target) pairs
+        - topological_order : list
+            - Topological order to use. Computed from the arrays if None.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        out_indptr, out_indices = _compress(NUM_V, edges[:, 0], edges[:, 1])
+        in_indptr, in_indices = _compress(NUM_V, edges[:, 1], edges[:, 0])
+        self._set_arrays(NUM_V, out_indptr, out_indices, in_indptr, in_indices, topological_order)
+
+    def _set_arrays(self, NUM_V, out_indptr, out_indices, in_indptr, in_indices, topological_order):
+        self.NUM_V = NUM_V
+        self.NUM_E = len(out_indices)
+        self.out_indptr, self.out_indices = out_indptr, out_indices
+        self.in_indptr, self.in_indices = in_indptr, in_indices
+        self._topological_order = topological_order
+        self._topological_position = None
+        self._adjlists = {}
+        self._layers = {}
+
+    @classmethod
+    def from_arrays(cls, NUM_V: int, out_indptr: np.ndarray, out_indices: np.ndarray, in_indptr: np.ndarray,
+                    in_indices: np.ndarray, topological_order=None):
+        """
+        Wraps existing CSR arrays, e.g. memory-mapped ones (see `loaders.load_graph_cache`), without copying them.
+        The arrays must be consistent: sorted neighbours, and the in-edges the transpose of the out-edges.
+        """
+        csr = cls.__new__(cls)
+        csr._set_arrays(NUM_V, out_indptr, out_indices, in_indptr, in_indices, topological_order)
+        return csr
+
+    @classmethod
+    def from_graph(cls, Graph: ig.Graph, topological_order: list=None):
+        """
+        Builds the arrays from an `ig.Graph`. Unless it is given, the topological order is taken from igraph, so
+        it is the same as `Graph.topological_sorting()`.
+        """
+        get_tracer().count("igraph_calls")
+        NUM_E = Graph.ecount()
+        edges = np.fromiter(itertools.chain.from_iterable(Graph.get_edgelist()), dtype=np.int64, count=2 * NUM_E)
+        if topological_order is None:
+            get_tracer().count("igraph_calls")
+            topological_order = Graph.topological_sorting(mode='out')
+        return cls(Graph.vcount(), edges.reshape(NUM_E, 2), topological_order)
+
+    def edges(self):
+        """
+        Returns the edges as an int64 array of shape (E, 2), sorted by source and then target.
+        """
+        sources = np.repeat(np.arange(self.NUM_V, dtype=np.int64), np.diff(self.out_indptr))
+        return np.column_stack((sources, self.out_indices))
+
+    def to_graph(self):
+        """
+        Builds a directed `ig.Graph` with the same vertices and edges.
+        """
+        return ig.Graph(self.NUM_V, self.edges(), directed=True)
+
+    def vcount(self):
+        return self.NUM_V
+
+    def ecount(self):
+        return self.NUM_E
+
+    def _arrays(self, mode: str):
+        if mode == 'out':
+            return self.out_indptr, self.out_indices
+        if mode == 'in':
+            return self.in_indptr, self.in_indices
+        raise ValueError(f"mode must be 'out' or 'in', not {mode!r}")
+
+    def neighbors(self, vertex: int, mode: str='out'):
+        """
+        Returns the neighbours of `vertex` in ascending order.
+        """
+        if mode == 'all':
+            return sorted(self.neighbors(vertex, 'out') + self.neighbors(vertex, 'in'))
+        indptr, indices = self._arrays(mode)
+        return indices[indptr[vertex]:indptr[vertex + 1]].tolist()
+
+    def get_adjlist(self, mode: str='out'):
+        """
+        Returns the adjacency list as a list of lists, for loops that are faster over Python lists than over
+        array slices. Built once per mode and shared, so it must not be modified.
+        """
+        if mode not in self._adjlists:
+            indptr, indices = self._arrays(mode)
+            flat = indices.tolist()
+            bounds = indptr.tolist()
+            self._adjlists[mode] = [flat[bounds[v]:bounds[v + 1]] for v in range(self.NUM_V)]
+        return self._adjlists[mode]
+
+    def gather(self, vertices: np.ndarray, mode: str='out'):
+        """
+        Returns the neighbours of all `vertices` concatenated in order, and the number of neighbours of each vertex.
+        """
+        return _gather(*self._arrays(mode), vertices)
+
+    def are_adjacent(self, source: int, target: int):
+        """
+        Returns True if there is an edge from `source` to `target`. Binary search in the sorted out-edges of `source`.
+        """
+        start, end = self.out_indptr[source], self.out_indptr[source + 1]
+        i = start + np.searchsorted(self.out_indices[start:end], target)
+        return bool(i < end and self.out_indices[i] == target)
+
+    def topological_sorting(self, mode: str='out'):
+        """
+        Returns a topological order as a list. For mode 'in' the order is reversed.
+        """
+        if self._topological_order is None:
+            self._topological_order = np.concatenate(self.layers('out')).tolist() if self.NUM_V else []
+        elif not isinstance(self._topological_order, list):
+            self._topological_order = np.asarray(self._topological_order).tolist()
+        if mode == 'in':
+            return self._topological_order[::-1]
+        return self._topological_order
+
+    def topological_position(self):
+        """
+        Returns an int64 array with the position of each vertex in `topological_sorting()`.
+        """
+        if self._topological_position is None:
+            position = np.empty(self.NUM_V, dtype=np.int64)
+            position[np.asarray(self.topological_sorting(), dtype=np.int64)] = np.arange(self.NUM_V)
+            self._topological_position = position
+        return self._topological_position
+
+    def layers(self, mode: str='out'):
+        """
+        Splits the vertices into layers with no edges inside a layer. For mode 'out' the first layer holds the
+        vertices without incoming edges and every edge points to a later layer. For mode 'in' the first layer
+        holds the vertices without outgoing edges and every edge points to an earlier layer. Each layer is
+        found with a few array operations (Kahn's algorithm, one layer at a time).
+
+        Returns
+        -------
+        - :list
+            - One int64 array of vertices per layer
+        """
+        if mode not in self._layers:
+            # peel the vertices whose remaining in-degree (mode 'out') or out-degree (mode 'in') is zero
+            degree = np.diff(self._arrays('in' if mode == 'out' else 'out')[0])
+            layers = []
+            frontier = np.flatnonzero(degree == 0)
+            while len(frontier):
+                layers.append(frontier)
+                neighbours, _ = self.gather(frontier, mode)
+                if not len(neighbours):
+                    break
+                decrement = np.bincount(neighbours, minlength=self.NUM_V)
+                degree -= decrement
+                frontier = np.flatnonzero((decrement > 0) & (degree == 0))
+            if sum(len(layer) for layer in layers) != self.NUM_V:
+                raise ValueError("The graph is not a DAG.")
+            self._layers[mode] = layers
+        return self._layers[mode]
+
+    def vectorize_by_layers(self):
+        """
+        Returns True if a layer by layer vectorized pass is expected to beat a Python loop over the vertices.
+        This is the case unless the graph is so deep that most layers hold only a few vertices.
+        """
+        return len(self.layers('in')) * LAYER_COST <= self.NUM_V + self.NUM_E
+
+    def subcomponent(self, vertex: int, mode: str='out', masked_vertices: np.ndarray=None):
+        """
+        Returns the vertices reachable from `vertex` (mode 'out') or that reach it (mode 'in'), including
+        itself. Breadth-first search that expands a whole frontier per step.
+
+        Parameters
+        ----------
+        - vertex : int
+            - The start vertex
+        - mode : str
+            - 'out' or 'in'
+        - masked_vertices : np.ndarray
+            - Optional boolean array. Vertices marked True are neither entered nor expanded.
+
+        Returns
+        -------
+        - :np.ndarray
+            - int64 array of the vertices found, in the order they are found
+        """
+        frontier = np.array([vertex], dtype=np.int64)
+        if masked_vertices is not None and masked_vertices[vertex]:
+            return frontier
+        seen = np.zeros(self.NUM_V, dtype=bool) if masked_vertices is None else masked_vertices.copy()
+        seen[vertex] = True
+        found = [frontier]
+        while len(frontier):
+            neighbours, _ = self.gather(frontier, mode)
+            neighbours = neighbours[~seen[neighbours]]
+            # keep the first occurrence of each new vertex, in the order they are found
+            frontier = neighbours[np.sort(np.unique(neighbours, return_index=True)[1])]
+            seen[frontier] = True
+            found.append(frontier)
+        return np.concatenate(found)
+
+def _compress(NUM_V: int, rows: np.ndarray, columns: np.ndarray):
+    """
+    Returns (indptr, indices) for the edges rows[i] -> columns[i], with the columns of each row sorted.
+    """
+    order = np.argsort(rows * max(NUM_V, 1) + columns, kind='stable')
+    indptr = np.zeros(NUM_V + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=NUM_V), out=indptr[1:])
+    return indptr, np.ascontiguousarray(columns[order])
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, vertices: np.ndarray):
+    """
+    Returns the concatenated neighbours of `vertices`, in order, and the number of neighbours of each vertex.
+    """
+    starts = indptr[vertices]
+    counts = indptr[vertices + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), counts
+    # position of each gathered edge: the start of its row plus its offset within the row
+    row_offsets = np.cumsum(counts) - counts
+    positions = np.repeat(starts - row_offsets, counts) + np.arange(total)
+    return indices[positions], counts
@@ -0,0 +1,150 @@
+import igraph as ig
+from .base_funcs import *
+from .MaskedGraph import as_masked_graph, count_igraph_calls
+from .tracing import get_tracer
+
+class _BitsetsWithout(dict):
+    """
+    Connect sets of the vertices whose set was recomputed, falling back to the sets of the whole graph for
+    every other vertex. Only indexing falls back, `get` and `in` see the recomputed sets alone.
+    """
+    def __init__(self, base: list):
+        super().__init__()
+        self.base = base
+
+    def __missing__(self, vertex: int):
+        return self.base[vertex]
+
+class CutVertexAnalysis:
+    def __init__(self, Graph: ig.Graph, cut_vertex: int, connect_bitsets: list=None):
+        """
+        Precomputes the alternating path structure around a single cut vertex. None of this depends on the source
+        or target, so one instance answers `alt_path_exists` for every source/target pair of the cut vertex.
+
+        Removing the edges of the cut vertex only changes the connect sets of its descendants, so only these are
+        computed and stored (`connect_bitsets_without`). Every other vertex keeps its set from the whole graph.
+
+        Parameters
+        ----------
+        - Graph : ig.Graph
+            - Input graph. Pass a `MaskedGraph` view to share its adjacency lists and topological order between analyses.
+        - cut_vertex : int
+            - The cut vertex whose incoming and outgoing edges are removed
+        - connect_bitsets : list
+            - The connect sets of the whole graph (see `get_connect_bitsets`), computed if not given. They must
+              be kept up to date by the caller, after `update` is called (see `GraphContext`).
+        """
+        self.Graph = Graph
+        self.cut_vertex = cut_vertex
+        count_igraph_calls(Graph)
+        self.in_cut = Graph.neighbors(cut_vertex, mode='in')
+        if connect_bitsets is None:
+            connect_bitsets = get_connect_bitsets(Graph)
+
+        # connect sets of the graph with the edges of the cut vertex removed: the descendants of the cut vertex
+        # are recomputed, every other vertex is looked up in the sets of the whole graph
+        view = as_masked_graph(Graph)
+        position = view.topological_position()
+        descendants = sorted(view.subcomponent(cut_vertex, mode='out'), key=position.__getitem__)
+        self.connectivity_bitsets = self.connect_bitsets_without = _BitsetsWithout(connect_bitsets)
+        with get_tracer().phase("connect_sets"):
+            propagate_connect_bitsets(self.connectivity_bitsets, view.get_adjlist(mode='in'), descendants, cut_vertex)
+
+        self._component_bitsets = None  # components of meta graph H, see `_get_component_bitsets`
+        self._touched_components = {}   # vertex -> bitset of components its connect set intersects
+
+    def update(self, changed: list):
+        """
+        Brings the analysis up to date after edges or vertices were added to or deleted from the graph. Only
+        the connect sets of `changed` are recomputed, and the components of meta graph H only if the in-neighbours
+        of the cut vertex or their connect sets changed. Must be called before the connect sets of the whole
+        graph are updated, since sets that did not change are read from them.
+
+        Parameters
+        ----------
+        - changed : list
+            - The vertices downstream of the changed edges (whose connect sets may differ), in topological order
+        """
+        in_adjlist = self.Graph.get_adjlist(mode='in')
+        before = {vertex: self.connectivity_bitsets[vertex] for vertex in changed}
+        # every changed vertex is written to `connect_bitsets_without`, so none of them falls through to a set of
+        # the whole graph once that is updated
+        propagate_connect_bitsets(self.connectivity_bitsets, in_adjlist, changed, self.cut_vertex)
+        updated = {vertex for vertex, bits in before.items() if self.connectivity_bitsets[vertex] != bits}
+
+        in_cut = self.Graph.neighbors(self.cut_vertex, mode='in')
+        if in_cut != self.in_cut or updated.intersection(in_cut):
+            self.in_cut = in_cut
+            self._component_bitsets = None
+            self._touched_components = {}
+        else:
+            for vertex in updated:
+                self._touched_components.pop(vertex, None)
+
+    def _get_component_bitsets(self):
+        """
+        Joins in-neighbours of the cut vertex whose connect sets intersect, i.e., that are adjacent in meta graph H,
+        and returns the union of the connect sets of each resulting component. Computed when first needed.
+        """
+        if self._component_bitsets is None:
+            with get_tracer().phase("H_construction"):
+                self._component_bitsets = self._find_component_bitsets()
+        return self._component_bitsets
+
+    def _find_component_bitsets(self):
+        # Each set is only compared with the components it shares a vertex with, not with every earlier set. The
+        # component of a shared vertex is found from its bit, and all vertices of that component are then dropped
+        # from the shared ones, so each component is looked up at most once per set. Sets that share nothing
+        # cost one AND with the vertices seen so far.
+        components = {}             # last in-neighbour added to a component -> union of the connect sets of the component
+        seen = 0
+        for i, v in enumerate(self.in_cut):
+            bits = self.connectivity_bitsets[v]
+            union = bits
+            shared = bits & seen
+            while shared:
+                low = shared & -shared
+                root = next(j for j, component in components.items() if component & low)
+                other = components.pop(root)
+                union |= other
+                shared &= ~other
+            seen |= bits
+            components[i] = union
+        return list(components.values())
+
+    def _get_touched_components(self, vertex: int):
+        """
+        Returns a bitset of the components of meta graph H that `vertex` would be adjacent to.
+        """
+        if vertex not in self._touched_components:
+            bits = self.connectivity_bitsets[vertex]
+            touched = 0
+            for i, component in enumerate(self._get_component_bitsets()):
+                if bits & component:
+                    touched |= 1 << i
+            self._touched_components[vertex] = touched
+        return self._touched_components[vertex]
+
+    def alt_path_exists(self, source: int, target: int):
+        """
+        Determines if an alternating path exists around the cut vertex for a source and target. Gives the same
+        answer as `alt_path_exists` in `base_funcs`.
+
+        Parameters
+        ----------
+        - self : CutVertexAnalysis
+            - Current class instance
+        - source : int
+            - The source vertex
+        - target : int
+            - The target vertex
+
+        Returns
+        -------
+        - :bool
+            - True if there is an alternating path, False otherwise.
+        """
+        # source and target are adjacent in H, or both are adjacent to the same component of in-neighbours
+        if self.connectivity_bitsets[source] & self.connectivity_bitsets[target]:
+            return True
+        return self._get_touched_components(source) & self._get_touched_components(target) != 0
@@ -0,0 +1,41 @@
+class DisjointSet:
+    def __init__(self, size: int):
+        """
+        Union-find structure over the elements 0, ..., size - 1 with path halving and union by size.
+
+        Parameters
+        ----------
+        - size : int
+            - Number of elements
+        """
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, i: int):
+        """
+        Returns the representative of the set containing `i`.
+        """
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        """
+        Merges the sets containing `i` and `j`. Returns the representative of the merged set.
+        """
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return root_i
+        if self.size[root_i] < self.size[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+        self.size[root_i] += self.size[root_j]
+        return root_i
+
+    def connected(self, i: int, j: int):
+        """
+        Returns True if `i` and `j` are in the same set.
+        """
+        return self.find(i) == self.find(j)
@@ -0,0 +1,305 @@
+import bisect
+import weakref
+from collections import namedtuple
+import igraph as ig
+import numpy as np
+from .CutVertexAnalysis import CutVertexAnalysis
+from .LRUCache import LRUCache
+from .MaskedGraph import MaskedGraph, mask_cut_vertex
+from .ReachabilityIndex import ReachabilityIndex
+from .ResultStore import graph_fingerprint
+from .base_funcs import get_connect_bitsets, propagate_connect_bitsets
+from .dominators import get_dominator_tree
+from .reachability import get_reachability_bitmap, update_reachability_bitmap
+from .tracing import get_tracer
+
+# Passed to the analyses on a context after the graph changed. `upstream` and `downstream` are the sets of vertices
+# that reach, or are reached by, a changed edge. Both are None if every vertex may have changed, and `deleted` then
+# lists the deleted vertices (possibly none) in ascending order.
+GraphChange = namedtuple("GraphChange", ["upstream", "downstream", "deleted"])
+
+class GraphContext:
+    def __init__(self, Graph: ig.Graph, cache_size: int=256, verify_edges: bool=False):
+        """
+        The precomputation on a graph that does not depend on the sources or targets of an analysis: topological
+        order and positions, adjacency lists, connect sets, dominator trees, the `CutVertexAnalysis` of each vertex,
+        reachability bitmaps and the `ReachabilityIndex`. Everything is computed the first time it is needed.
+
+        Pass one context to any number of `ShareKey`, `ShareSecret` and `ShareSecretBatch` instances on the same
+        graph, and the work is done once for all of them. Edit the graph through the context (or through any of
+        the analyses on it) to keep the precomputation up to date, see `add_edges`.
+
+        Parameters
+        ----------
+        - Graph : ig.Graph
+            - Input graph (a DAG)
+        - cache_size : int
+            - Maximum number of dominator trees, of connect sets with a cut vertex removed and of `CutVertexAnalysis`
+              objects kept in memory
+        - verify_edges : bool
+            - By default `check_graph` only notices direct edits on `Graph` that change the number of vertices or
+              edges. If True, it also compares a hash of the edge list, so edits that keep both counts are noticed
+              too. This costs a pass over the edges per check, i.e., per public call of the analyses.
+        """
+        self.Graph = Graph
+        self.cache_size = cache_size
+        self.verify_edges = verify_edges
+        self._analyses = weakref.WeakSet()      # ShareKey and ShareSecret instances told about changes, see `subscribe`
+        self._reset()
+
+    def _reset(self):
+        self.view = MaskedGraph(self.Graph)     # shares the adjacency lists, order and CSR arrays with the per-vertex views
+        self._signature = self._get_signature()
+        self._fingerprint = None
+        self._connectivity_bitsets = None
+        self._reachability_index = None
+        self._reachability = LRUCache(8)                            # tuple of targets -> vertex x target bitmap
+        self._dominator_trees = LRUCache(self.cache_size)           # source -> dominator tree
+        self._cut_analyses = LRUCache(self.cache_size)              # u -> CutVertexAnalysis, also holds the connect sets without u
+
+    @property
+    def topological_order(self):
+        """
+        A topological order of the graph. Edits keep it valid in place, so it must not be modified.
+        """
+        return self.view.topological_sorting(mode='out')
+
+    def topological_position(self):
+        """
+        Returns a list with the position of each vertex in `topological_order`, which must not be modified.
+        """
+        return self.view.topological_position()
+
+    def get_adjlist(self, mode: str='out'):
+        """
+        Returns the adjacency list of the graph, which must not be modified.
+        """
+        return self.view.get_adjlist(mode=mode)
+
+    def cache_info(self):
+        """
+        Returns the hit and miss counters of every cache, as a dict mapping each name to a `CacheInfo` tuple.
+        """
+        return {
+            "dominator_trees": self._dominator_trees.info(),
+            "cut_analyses": self._cut_analyses.info(),
+            "reachability": self._reachability.info(),
+        }
+
+    def subscribe(self, analysis):
+        """
+        Registers an analysis to be told about changes to the graph. It must provide `_graph_changed(change)`,
+        which receives a `GraphChange`, and `_check_delete(deleted)`, which raises ValueError if the vertices
+        it needs would be deleted. Only a weak reference is kept.
+        """
+        self._analyses.add(analysis)
+
+    def check_graph(self):
+        """
+        Starts over if vertices or edges were added to or deleted from `self.Graph` other than through this context.
+        The analyses call this once per public call, and not again for the work done inside it.
+        """
+        if self._signature != self._get_signature():
+            self.clear()
+
+    def _get_signature(self):
+        edges = hash(tuple(self.Graph.get_edgelist())) if self.verify_edges else None
+        return self.Graph.vcount(), self.Graph.ecount(), edges
+
+    def clear(self):
+        """
+        Drops every cached result, here and in every analysis on this context.
+        """
+        self._reset()
+        self._notify(GraphChange(None, None, []))
+
+    def fingerprint(self):
+        """
+        Returns the `graph_fingerprint` of the graph, computed once per version of the graph.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = graph_fingerprint(self.view)
+        return self._fingerprint
+
+    def get_connect_bitsets(self):
+        """
+        Returns the connect sets of the whole graph as bitsets (see `get_connect_bitsets`).
+        """
+        if self._connectivity_bitsets is None:
+            self._connectivity_bitsets = get_connect_bitsets(self.view)
+        return self._connectivity_bitsets
+
+    def get_connect_bitsets_without(self, cut_vertex: int):
+        """
+        Returns the connect sets (as bitsets) of the graph with the edges of `cut_vertex` removed. Removing the cut
+        vertex only changes the sets of its descendants, so just these are recomputed from the connect sets of the
+        whole graph. They are kept by the `CutVertexAnalysis` of the cut vertex (see `get_cut_analysis`).
+
+        Returns
+        -------
+        - :dict
+            - Maps each vertex whose set may have changed to its new bitset. Every other vertex keeps its set from
+              `get_connect_bitsets()`.
+        """
+        return self.get_cut_analysis(cut_vertex).connect_bitsets_without
+
+    def get_cut_graph(self, cut_vertex: int):
+        """
+        Returns a `MaskedGraph` view of the graph with the edges of `cut_vertex` masked out (see `mask_cut_vertex`).
+        """
+        return mask_cut_vertex(self.view, cut_vertex)
+
+    def get_dominator_tree(self, source: int):
+        """
+        Returns the dominator tree rooted at `source` (see `get_dominator_tree`).
+        """
+        return self._dominator_trees.get(source, lambda: get_dominator_tree(self.Graph, source))
+
+    def get_cut_analysis(self, u: int):
+        """
+        Returns the alternating path structure around `u`, which is shared by every source and target.
+        """
+        return self._cut_analyses.get(u, lambda: CutVertexAnalysis(self.view, u, self.get_connect_bitsets()))
+
+    def get_reachability_bitmap(self, targets: list):
+        """
+        Returns which vertices reach which of `targets` (see `get_reachability_bitmap`). The bitmaps of the last
+        few target lists are kept and updated when the graph is edited.
+        """
+        return self._reachability.get(tuple(targets), lambda: get_reachability_bitmap(self.view, targets))
+
+    def get_reachability_index(self, build: bool=True):
+        """
+        Returns the `ReachabilityIndex` of the graph, building it the first time it is needed. With `build`
+        False, returns None instead of building it.
+        """
+        if self._reachability_index is None and build:
+            self._reachability_index = ReachabilityIndex(self.view)
+        return self._reachability_index
+
+    def reaches(self, source: int, target: int):
+        """
+        Returns True if there is a path from `source` to `target`, using whatever is cheapest: the connect sets if
+        they are computed, otherwise the reachability index. Building the index costs about as much as a dozen
+        dominator trees, so until the dominator tree cache evicts trees the tree of the source is read instead,
+        which the cut vertices need anyway.
+        """
+        if self._connectivity_bitsets is not None:
+            return (self._connectivity_bitsets[target] >> source) & 1 == 1
+        trees = self._dominator_trees
+        if self._reachability_index is None and (trees.maxsize is None or trees.misses <= trees.maxsize or source in trees):
+            return self.get_dominator_tree(source)[target] is not None
+        return self.get_reachability_index().reaches(source, target)
+
+    def add_edges(self, edges):
+        """
+        Adds edges to `self.Graph` and updates the precomputation instead of starting over. An edge a -> b only
+        changes the dominator trees and reachability of the ancestors of a and the connect sets of the
+        descendants of b, so only these are recomputed. Edges that already exist are skipped.
+
+        Raises ValueError if an edge would create a cycle. The edges before it are still added.
+
+        Parameters
+        ----------
+        - edges : list
+            - (source, target) pairs
+        """
+        self.check_graph()
+        try:
+            for source, target in edges:
+                if self.view.add_edges([(source, target)]):
+                    self._reachability_index = None     # new pairs may be reachable, see ReachabilityIndex
+                    self._edge_changed(source, target)
+        finally:
+            self._signature = self._get_signature()
+
+    def delete_edges(self, edges):
+        """
+        Deletes edges from `self.Graph` and updates the precomputation like `add_edges`.
+
+        Parameters
+        ----------
+        - edges : list
+            - (source, target) pairs
+        """
+        self.check_graph()
+        try:
+            for source, target in edges:
+                self.view.delete_edges([(source, target)])
+                self._edge_changed(source, target)
+        finally:
+            self._signature = self._get_signature()
+
+    def add_vertices(self, n: int):
+        """
+        Adds `n` isolated vertices to `self.Graph`.
+        """
+        self.check_graph()
+        NUM_V = self.Graph.vcount()
+        self.view.add_vertices(n)
+        self._reachability_index = None
+        if self._connectivity_bitsets is not None:
+            self._connectivity_bitsets.extend(1 << v for v in range(NUM_V, NUM_V + n))
+        for key, bitmap in self._reachability.items():
+            self._reachability.put(key, np.vstack([bitmap, np.zeros((n, bitmap.shape[1]), dtype=bitmap.dtype)]))
+        # no source reaches the new vertices, so they have no immediate dominator
+        for idom in self._dominator_trees.values():
+            idom.extend([None] * n)
+        for analysis in self._cut_analyses.values():
+            analysis.update([])
+        self._signature = self._get_signature()
+        self._changed(GraphChange(set(), set(), None))
+
+    def delete_vertices(self, vertices: list):
+        """
+        Deletes vertices from `self.Graph`. igraph renumbers every vertex after a deleted one, so the
+        precomputation starts over and the analyses on this context renumber their vertices. Raises ValueError,
+        without deleting anything, if an analysis needs one of the vertices.
+        """
+        deleted = sorted(set(vertices))
+        for analysis in list(self._analyses):
+            analysis._check_delete(deleted)
+        self.Graph.delete_vertices(deleted)
+        self._reset()
+        self._notify(GraphChange(None, None, deleted))
+
+    def _edge_changed(self, source: int, target: int):
+        """
+        Updates the precomputation after the edge source -> target was added or deleted. Only sources that reach
+        the edge get a different dominator tree or reachability, and only vertices it reaches get a different
+        connect set.
+        """
+        upstream = self.view.subcomponent(source, mode='in')
+        downstream = self.view.subcomponent(target, mode='out')
+        position = self.topological_position()
+        upstream.sort(key=position.__getitem__, reverse=True)
+        downstream.sort(key=position.__getitem__)
+
+        out_adjlist = self.get_adjlist(mode='out')
+        for key, bitmap in self._reachability.items():
+            update_reachability_bitmap(bitmap, out_adjlist, list(key), upstream)
+
+        upstream_set = set(upstream)
+        self._dominator_trees.discard(lambda s: s in upstream_set)
+        with get_tracer().phase("connect_sets"):
+            # the analyses read the sets that did not change from the connect sets of the whole graph, so they
+            # are updated first
+            for analysis in self._cut_analyses.values():
+                analysis.update(downstream)
+            if self._connectivity_bitsets is not None:
+                propagate_connect_bitsets(self._connectivity_bitsets, self.get_adjlist(mode='in'), downstream)
+        self._changed(GraphChange(upstream_set, set(downstream), None))
+
+    def _changed(self, change: GraphChange):
+        self._fingerprint = None
+        self._notify(change)
+
+    def _notify(self, change: GraphChange):
+        for analysis in list(self._analyses):
+            analysis._graph_changed(change)
+
+def renumber(vertex: int, deleted: list):
+    """
+    Returns the number of `vertex` after the vertices in `deleted` (sorted) were deleted, like igraph renumbers them.
+    """
+    return vertex - bisect.bisect_left(deleted, vertex)
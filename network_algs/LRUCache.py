@@ -0,0 +1,97 @@
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+class LRUCache:
+    def __init__(self, maxsize: int=1024):
+        """
+        A bounded mapping that evicts the least recently used entry once `maxsize` entries are stored.
+        Keeps hit and miss counters in the style of `functools.lru_cache`.
+
+        Parameters
+        ----------
+        - maxsize : int
+            - Maximum number of entries. Use None for an unbounded cache.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, compute):
+        """
+        Returns the value stored for `key`. On a miss the value is computed with `compute()` and stored.
+
+        Parameters
+        ----------
+        - key
+            - Any hashable key
+        - compute : callable
+            - Called without arguments to produce the value on a miss
+
+        Returns
+        -------
+        - The cached or newly computed value
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self._data[key] = value
+            if self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return value
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Stores `value` for `key`, replacing any previous value, and evicts the least recently used entry if needed.
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes every entry and resets the counters.
+        """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def discard(self, predicate):
+        """
+        Removes the entries whose key satisfies `predicate`. Returns the number of removed entries.
+        """
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def values(self):
+        """
+        Returns the stored values without changing their recency.
+        """
+        return list(self._data.values())
+
+    def items(self):
+        """
+        Returns the stored (key, value) pairs without changing their recency.
+        """
+        return list(self._data.items())
+
+    def info(self):
+        """
+        Returns a `CacheInfo` tuple with the hit and miss counters and the current size.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,321 @@
+import bisect
+from collections import deque
+import igraph as ig
+import numpy as np
+from .CSRGraph import CSRGraph
+from .tracing import get_tracer
+
+class MaskedGraph:
+    def __init__(self, Graph: ig.Graph, masked_vertices=(), masked_edges=()):
+        """
+        A view of a graph with some vertices or edges masked out, used instead of `Graph.copy()` followed by
+        `delete_vertices` or `delete_edges`. A masked vertex keeps its number but loses all of its edges, so no
+        index shifting is needed. The adjacency lists, topological order and CSR arrays (see `CSRGraph`) of the
+        underlying graph are computed when first needed and shared by every view derived from it with `mask`.
+
+        Only the methods used by the algorithms in this package are provided. They follow the igraph signatures.
+        The underlying graph may only be changed through `add_edges`, `delete_edges` and `add_vertices`, which
+        update the shared structures instead of recomputing them.
+
+        Parameters
+        ----------
+        - Graph : ig.Graph
+            - The underlying graph, which the view itself never modifies
+        - masked_vertices : iterable
+            - Vertices whose incoming and outgoing edges are ignored
+        - masked_edges : iterable
+            - (source, target) pairs of edges that are ignored
+        """
+        self.Graph = Graph
+        self.masked_vertices = frozenset(masked_vertices)
+        self.masked_edges = frozenset(masked_edges)
+        self._shared = {}   # CSR arrays, adjacency lists and topological order of the underlying graph, shared between views
+
+    def mask(self, masked_vertices=(), masked_edges=()):
+        """
+        Returns a new view with additional vertices or edges masked out. The new view shares the precomputed
+        structures of this one.
+        """
+        view = MaskedGraph(self.Graph, self.masked_vertices.union(masked_vertices), self.masked_edges.union(masked_edges))
+        view._shared = self._shared
+        return view
+
+    def csr(self):
+        """
+        Returns the `CSRGraph` of the underlying graph (without any masks), building it the first time it is needed.
+        """
+        if "csr" not in self._shared:
+            self._shared["csr"] = CSRGraph.from_graph(self.Graph, self.topological_sorting(mode='out'))
+        return self._shared["csr"]
+
+    def _base_adjlist(self, mode: str):
+        if mode not in self._shared:
+            get_tracer().count("igraph_calls")
+            self._shared[mode] = self.Graph.get_adjlist(mode=mode)
+        return self._shared[mode]
+
+    def _is_masked(self, source: int, target: int):
+        return source in self.masked_vertices or target in self.masked_vertices or (source, target) in self.masked_edges
+
+    def vcount(self):
+        return self.Graph.vcount()
+
+    def neighbors(self, vertex: int, mode: str='all'):
+        """
+        Returns the neighbours of `vertex` that are joined to it by an edge that is not masked.
+        """
+        if mode == 'all':
+            return sorted(self.neighbors(vertex, 'out') + self.neighbors(vertex, 'in'))
+        if vertex in self.masked_vertices:
+            return []
+        if mode == 'out':
+            return [v for v in self._base_adjlist('out')[vertex] if not self._is_masked(vertex, v)]
+        return [v for v in self._base_adjlist('in')[vertex] if not self._is_masked(v, vertex)]
+
+    def get_adjlist(self, mode: str='out'):
+        """
+        Returns an indexable adjacency list. Neighbours are filtered when a vertex is looked up, not up front.
+        Without any masks this is the (shared) adjacency list of the underlying graph, which must not be modified.
+        """
+        if not self.masked_vertices and not self.masked_edges and mode != 'all':
+            return self._base_adjlist(mode)
+        return _MaskedAdjlist(self, mode)
+
+    def are_adjacent(self, source: int, target: int):
+        if self._is_masked(source, target):
+            return False
+        get_tracer().count("igraph_calls")
+        return self.Graph.are_adjacent(source, target)
+
+    def topological_position(self):
+        """
+        Returns a list with the position of each vertex in `topological_sorting()`. Shared, so it must not be modified.
+        """
+        if "position" not in self._shared:
+            position = [0] * self.vcount()
+            for i, vertex in enumerate(self.topological_sorting(mode='out')):
+                position[vertex] = i
+            self._shared["position"] = position
+        return self._shared["position"]
+
+    def add_edges(self, edges):
+        """
+        Adds edges to the underlying graph and updates the shared adjacency lists and topological order in place.
+        An edge that contradicts the order only reorders the vertices between its endpoints (Pearce-Kelly), so
+        the cost depends on the size of that region and not on the size of the graph. Edges that already exist
+        are skipped.
+
+        Raises ValueError if an edge would create a cycle. The edges before it are still added.
+
+        Returns
+        -------
+        - :list
+            - The edges that were added
+        """
+        out_adjlist, in_adjlist = self._base_adjlist('out'), self._base_adjlist('in')
+        self.topological_position()
+        added = []
+        try:
+            for source, target in edges:
+                i = bisect.bisect_left(out_adjlist[source], target)
+                if i < len(out_adjlist[source]) and out_adjlist[source][i] == target:
+                    continue
+                self._reorder(source, target)
+                out_adjlist[source].insert(i, target)
+                bisect.insort(in_adjlist[target], source)
+                added.append((source, target))
+        finally:
+            get_tracer().count("igraph_calls")
+            self.Graph.add_edges(added)
+            self._structure_changed()
+        return added
+
+    def delete_edges(self, edges):
+        """
+        Deletes edges from the underlying graph and from the shared adjacency lists. The topological order stays valid.
+        """
+        edges = [(source, target) for source, target in edges]
+        get_tracer().count("igraph_calls")
+        self.Graph.delete_edges(edges)
+        for source, target in edges:
+            if "out" in self._shared:
+                self._shared["out"][source].remove(target)
+            if "in" in self._shared:
+                self._shared["in"][target].remove(source)
+        self._structure_changed()
+
+    def add_vertices(self, n: int):
+        """
+        Adds `n` isolated vertices to the underlying graph. They are placed at the end of the topological order.
+        """
+        NUM_V = self.vcount()
+        get_tracer().count("igraph_calls")
+        self.Graph.add_vertices(n)
+        for mode in ("out", "in"):
+            if mode in self._shared:
+                self._shared[mode].extend([] for _ in range(n))
+        if ("topological_sorting", "out") in self._shared:
+            self._shared[("topological_sorting", "out")].extend(range(NUM_V, NUM_V + n))
+        if "position" in self._shared:
+            self._shared["position"].extend(range(NUM_V, NUM_V + n))
+        self._structure_changed()
+
+    def _structure_changed(self):
+        # the CSR arrays and the reversed order are rebuilt when next needed
+        self._shared.pop("csr", None)
+        self._shared.pop(("topological_sorting", "in"), None)
+
+    def _reorder(self, source: int, target: int):
+        """
+        Restores the topological order for a new edge source -> target. If the target comes after the source
+        nothing changes. Otherwise the vertices between them that the target reaches are moved after the vertices
+        between them that reach the source, keeping their relative order.
+        """
+        order = self.topological_sorting(mode='out')
+        position = self.topological_position()
+        lower, upper = position[target], position[source]
+        if lower > upper:
+            return
+        forward = self._bounded_search(target, 'out', lambda p: p <= upper)
+        if source in forward:
+            raise ValueError(f"Adding edge ({source}, {target}) would create a cycle.")
+        backward = self._bounded_search(source, 'in', lambda p: p >= lower)
+
+        moved = sorted(backward, key=position.__getitem__) + sorted(forward, key=position.__getitem__)
+        slots = sorted(position[v] for v in moved)
+        for vertex, slot in zip(moved, slots):
+            order[slot] = vertex
+            position[vertex] = slot
+
+    def _bounded_search(self, start: int, mode: str, keep):
+        """
+        Returns the vertices reachable from `start` along `mode` edges through vertices whose position satisfies `keep`.
+        """
+        adjlist = self._base_adjlist(mode)
+        position = self.topological_position()
+        found = {start}
+        stack = [start]
+        while stack:
+            for w in adjlist[stack.pop()]:
+                if w not in found and keep(position[w]):
+                    found.add(w)
+                    stack.append(w)
+        return found
+
+    def topological_sorting(self, mode: str='out'):
+        """
+        Returns a topological order of the underlying graph, which stays valid when vertices or edges are masked.
+        """
+        key = ('topological_sorting', mode)
+        if key not in self._shared:
+            get_tracer().count("igraph_calls")
+            self._shared[key] = self.Graph.topological_sorting(mode=mode)
+        return self._shared[key]
+
+    def subcomponent(self, vertex: int, mode: str='all'):
+        """
+        Returns the vertices reachable from `vertex`, including itself, in the order they are found.
+        """
+        if not self.masked_vertices and not self.masked_edges:
+            get_tracer().count("igraph_calls")
+            return self.Graph.subcomponent(vertex, mode=mode)
+        if mode != 'all' and not self.masked_edges:
+            masked = np.zeros(self.vcount(), dtype=bool)
+            masked[list(self.masked_vertices)] = True
+            return self.csr().subcomponent(vertex, mode, masked).tolist()
+        modes = ['out', 'in'] if mode == 'all' else [mode]
+        found = [vertex]
+        seen = {vertex}
+        queue = deque([vertex])
+        while queue:
+            v = queue.popleft()
+            for m in modes:
+                for w in self.neighbors(v, m):
+                    if w not in seen:
+                        seen.add(w)
+                        found.append(w)
+                        queue.append(w)
+        return found
+
+    def get_shortest_paths(self, v: int, to=None, mode: str='out'):
+        """
+        Breadth-first search for shortest paths from `v`. Neighbours are visited in the same order as igraph
+        visits them, so the paths are the ones `Graph.get_shortest_paths` returns on a copy with the masked
+        edges deleted. A single search serves every vertex in `to`, and it stops once all of them are found.
+
+        Parameters
+        ----------
+        - v : int
+            - Start vertex
+        - to : int or list
+            - A target vertex or a list of target vertices. None for every vertex.
+
+        Returns
+        -------
+        - :list
+            - One path (a list of vertices) per target, empty if the target cannot be reached
+        """
+        targets = range(self.vcount()) if to is None else [to] if isinstance(to, int) else list(to)
+        remaining = set(targets)
+        parent = {v: None}
+        remaining.discard(v)
+        queue = deque([v])
+        while queue and remaining:
+            u = queue.popleft()
+            for w in self.neighbors(u, mode):
+                if w not in parent:
+                    parent[w] = u
+                    remaining.discard(w)
+                    queue.append(w)
+
+        paths = []
+        for target in targets:
+            if target not in parent:
+                paths.append([])
+                continue
+            path = [target]
+            while parent[path[-1]] is not None:
+                path.append(parent[path[-1]])
+            path.reverse()
+            paths.append(path)
+        return paths
+
+class _MaskedAdjlist:
+    def __init__(self, view: MaskedGraph, mode: str):
+        self.view = view
+        self.mode = mode
+
+    def __getitem__(self, vertex: int):
+        return self.view.neighbors(vertex, self.mode)
+
+    def __len__(self):
+        return self.view.vcount()
+
+def count_igraph_calls(Graph, n: int=1):
+    """
+    Adds `n` to the "igraph_calls" counter if `Graph` is an `ig.Graph`. A `MaskedGraph` counts the calls it
+    passes on to igraph itself, so callers that accept either use this instead of counting unconditionally.
+    """
+    if isinstance(Graph, ig.Graph):
+        get_tracer().count("igraph_calls", n)
+
+def as_masked_graph(Graph):
+    """
+    Returns `Graph` unchanged if it is already a `MaskedGraph`, otherwise a view of it with nothing masked.
+    """
+    return Graph if isinstance(Graph, MaskedGraph) else MaskedGraph(Graph)
+
+def as_csr_graph(Graph):
+    """
+    Returns the `CSRGraph` of `Graph`. A `CSRGraph` is returned unchanged and a `MaskedGraph` returns the shared
+    arrays of its underlying graph, ignoring its masks. An `ig.Graph` is converted.
+    """
+    if isinstance(Graph, CSRGraph):
+        return Graph
+    return as_masked_graph(Graph).csr()
+
+def mask_cut_vertex(Graph, cut_vertex: int):
+    """
+    Copy-free counterpart of `del_cut_edges`: a view of `Graph` with the incoming and outgoing edges of `cut_vertex` masked out.
+    """
+    return as_masked_graph(Graph).mask(masked_vertices=[cut_vertex])
@@ -0,0 +1,324 @@
+import asyncio
+import json
+import logging
+import socket
+import time
+import igraph as ig
+from .GraphContext import GraphContext
+from .LRUCache import LRUCache
+from .ShareKey import ShareKey
+from .ShareSecretBatch import ShareSecretBatch
+from .loaders import load_graph
+
+MAX_LINE_BYTES = 2**26      # a request with an inline edge list can be large
+
+logger = logging.getLogger(__name__)
+
+class QueryServer:
+    def __init__(self, path: str=None, host: str="127.0.0.1", port: int=0, max_graphs: int=8, idle_timeout: float=600,
+                 target_sets: int=8, cache_size: int=100000, analysis_cache_size: int=256):
+        """
+        A long-running local server that keeps named graphs and their precomputation (topological order,
+        reachability, dominator trees, connect sets) in memory between queries. Clients send one JSON object per
+        line over a Unix socket or a localhost TCP connection and get one JSON object per line back, see `send_query`.
+
+        Every request has an "op" and may have an "id", which is copied into the response. Responses to requests
+        on the same connection can arrive out of order, but a query waits for any load of its graph that was
+        received before it. The operations are
+            - {"op": "load", "graph": name, "path": file, "orientation": "index", "seed": null}
+              or {"op": "load", "graph": name, "num_vertices": n, "edges": [[a, b], ...]}
+            - {"op": "unload", "graph": name} and {"op": "graphs"}
+            - {"op": "does_scheme_exist", "graph": name, "targets": [...]}
+            - {"op": "min_source_set", "graph": name, "targets": [...], "exact": false}
+            - {"op": "cut_vertices" | "alternating_path" | "alternating_paths", "graph": name, "source": s, "target": t}
+        A response is {"id": ..., "ok": true, "result": ..., "seconds": ...} or {"id": ..., "ok": false, "error": message}.
+
+        Queries run in threads. Queries on the same graph are serialized, since the analysis objects are not
+        thread-safe, and queries on different graphs run concurrently.
+
+        Parameters
+        ----------
+        - path : str
+            - Path of a Unix socket to listen on. If None, listen on `host` and `port` instead.
+        - host : str
+            - Host for TCP, localhost by default
+        - port : int
+            - Port for TCP. 0 picks a free port, see `address`.
+        - max_graphs : int
+            - Maximum number of graphs kept in memory. Loading another one evicts the least recently used graph.
+        - idle_timeout : float
+            - Seconds after which an unused graph is evicted. None keeps graphs until they are unloaded.
+              A graph loaded from a file is loaded again when it is next queried.
+        - target_sets : int
+            - Maximum number of target sets per graph with a warm `ShareKey`
+        - cache_size, analysis_cache_size : int
+            - Cache sizes of each `ShareKey` (see `ShareKey`). `analysis_cache_size` is also the cache size of the
+              `ShareSecretBatch` of each graph. Together with `target_sets` they bound the memory used per graph.
+        """
+        self.path = path
+        self.host = host
+        self.port = port
+        self.max_graphs = max_graphs
+        self.idle_timeout = idle_timeout
+        self.target_sets = target_sets
+        self.cache_size = cache_size
+        self.analysis_cache_size = analysis_cache_size
+        self.address = None             # Unix socket path or (host, port) once the server is started
+        self._graphs = {}               # name -> _GraphEntry
+        self._load_requests = {}        # name -> load request of a graph read from a file, to reload it after eviction
+        self._pending_loads = {}        # name -> task reading a graph from a file, awaited by queries on that graph
+        self._server = None
+        self._evictor = None
+
+    async def start(self):
+        """
+        Starts listening. Requests are served until `close` is called.
+        """
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=self.path, limit=MAX_LINE_BYTES)
+            self.address = self.path
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, limit=MAX_LINE_BYTES)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        if self.idle_timeout is not None:
+            self._evictor = asyncio.create_task(self._evict_idle_graphs())
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._evictor is not None:
+            self._evictor.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def load(self, name: str, Graph: ig.Graph):
+        """
+        Makes `Graph` available to queries under `name`, replacing any graph of that name.
+        """
+        self._load_requests.pop(name, None)
+        self._add_graph(name, Graph)
+
+    async def handle(self, request: dict):
+        """
+        Answers a single request (see the class docstring) and returns the response.
+        """
+        start = time.perf_counter()
+        try:
+            operation = getattr(self, "_op_" + str(request.get("op")), None)
+            if operation is None:
+                raise ValueError(f"Unknown operation {request.get('op')!r}.")
+            result = await operation(request)
+        except KeyError as error:
+            return {"id": request.get("id"), "ok": False, "error": f"Missing field {error} in request."}
+        except Exception as error:
+            return {"id": request.get("id"), "ok": False, "error": f"{type(error).__name__}: {error}"}
+        return {"id": request.get("id"), "ok": True, "result": result, "seconds": time.perf_counter() - start}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass        # the client went away or sent a line longer than MAX_LINE_BYTES
+        finally:
+            writer.close()
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object.")
+        except ValueError as error:
+            response = {"id": None, "ok": False, "error": f"Invalid request: {error}"}
+        else:
+            response = await self.handle(request)
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def _evict_idle_graphs(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 60) / 2)
+            now = time.monotonic()
+            for name, entry in list(self._graphs.items()):
+                if not entry.lock.locked() and now - entry.last_used > self.idle_timeout:
+                    del self._graphs[name]
+
+    def _add_graph(self, name: str, Graph: ig.Graph):
+        self._graphs.pop(name, None)
+        while len(self._graphs) >= self.max_graphs:
+            idle = [(entry.last_used, other) for other, entry in self._graphs.items() if not entry.lock.locked()]
+            if not idle:
+                break
+            del self._graphs[min(idle)[1]]
+        self._graphs[name] = _GraphEntry(Graph, self.target_sets, self.cache_size, self.analysis_cache_size)
+
+    async def _get_graph(self, request: dict):
+        name = request["graph"]
+        if name in self._pending_loads:
+            await asyncio.wait([self._pending_loads[name]])     # a failed load is reported to the load request
+        if name not in self._graphs:
+            if name not in self._load_requests:
+                raise ValueError(f"Unknown graph {name!r}.")
+            await self._op_load(self._load_requests[name])    # evicted while idle
+        entry = self._graphs[name]
+        entry.last_used = time.monotonic()
+        return entry
+
+    async def _run(self, request: dict, query):
+        """
+        Runs `query(entry)` in a thread while holding the lock of the requested graph.
+        """
+        entry = await self._get_graph(request)
+        async with entry.lock:
+            result = await asyncio.to_thread(query, entry)
+        entry.last_used = time.monotonic()
+        return result
+
+    async def _op_load(self, request: dict):
+        name = request["graph"]
+        if "path" in request:
+            # registered before the first await, so queries received after this request wait for the graph
+            load = self._pending_loads[name] = asyncio.create_task(self._read_graph(request))
+            try:
+                Graph = await load
+            finally:
+                superseded = self._pending_loads.get(name) is not load
+                if not superseded:
+                    del self._pending_loads[name]
+            if superseded:      # a later load or unload of the same name was received meanwhile
+                return {"vertices": Graph.vcount(), "edges": Graph.ecount()}
+            self._load_requests[name] = request
+        else:
+            Graph = ig.Graph(request["num_vertices"], [tuple(edge) for edge in request["edges"]], directed=True)
+            if not Graph.is_dag():
+                raise ValueError("The graph is not a DAG.")
+            self._pending_loads.pop(name, None)
+            self._load_requests.pop(name, None)
+        self._add_graph(name, Graph)
+        return {"vertices": Graph.vcount(), "edges": Graph.ecount()}
+
+    async def _read_graph(self, request: dict):
+        csr = await asyncio.to_thread(load_graph, request["path"], request.get("orientation", "index"), request.get("seed"))
+        return await asyncio.to_thread(csr.to_graph)
+
+    async def _op_unload(self, request: dict):
+        self._load_requests.pop(request["graph"], None)
+        self._pending_loads.pop(request["graph"], None)
+        return self._graphs.pop(request["graph"], None) is not None
+
+    async def _op_graphs(self, request: dict):
+        now = time.monotonic()
+        return {name: {"vertices": entry.Graph.vcount(), "edges": entry.Graph.ecount(), "target_sets": len(entry.share_keys),
+                       "idle_seconds": now - entry.last_used} for name, entry in self._graphs.items()}
+
+    async def _op_does_scheme_exist(self, request: dict):
+        targets = request["targets"]
+        return await self._run(request, lambda entry: entry.share_key(targets).does_scheme_exist())
+
+    async def _op_min_source_set(self, request: dict):
+        targets = request["targets"]
+        exact = request.get("exact", False)
+        return await self._run(request, lambda entry: entry.share_key(targets).get_min_source_set(exact=exact))
+
+    async def _op_cut_vertices(self, request: dict):
+        source, target = request["source"], request["target"]
+        return await self._run(request, lambda entry: entry.batch.share_secret(source, target).get_cut_vertices())
+
+    async def _op_alternating_path(self, request: dict):
+        source, target = request["source"], request["target"]
+        return await self._run(request, lambda entry: entry.batch.share_secret(source, target).get_alternating_path())
+
+    async def _op_alternating_paths(self, request: dict):
+        # JSON object keys are strings, so the paths are returned as [cut vertex, path] pairs in topological order
+        source, target = request["source"], request["target"]
+        paths = await self._run(request, lambda entry: entry.batch.share_secret(source, target).get_alternating_paths())
+        return [[cut_vertex, path] for cut_vertex, path in paths.items()]
+
+class _GraphEntry:
+    def __init__(self, Graph: ig.Graph, target_sets: int, cache_size: int, analysis_cache_size: int):
+        """
+        The in-memory state of one graph: a `ShareSecretBatch` for source/target pairs and a `ShareKey` per target
+        set, which share one `GraphContext`.
+        """
+        self.Graph = Graph
+        self.cache_size = cache_size
+        self.analysis_cache_size = analysis_cache_size
+        self.context = GraphContext(Graph, analysis_cache_size)
+        self.batch = ShareSecretBatch(Graph, context=self.context)
+        self.share_keys = LRUCache(target_sets)     # tuple of targets -> ShareKey
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+    def share_key(self, targets: list):
+        create = lambda: ShareKey(self.Graph, list(targets), self.cache_size, self.analysis_cache_size, context=self.context)
+        return self.share_keys.get(tuple(targets), create)
+
+def run_server(path: str=None, host: str="127.0.0.1", port: int=0, graphs: dict=None, **options):
+    """
+    Starts a `QueryServer` and serves requests until interrupted.
+
+    Parameters
+    ----------
+    - path, host, port
+        - Where to listen, see `QueryServer`
+    - graphs : dict
+        - Graphs to load at startup, mapping each name to a file path (see `load_graph`)
+    - options
+        - Further arguments for `QueryServer`
+    """
+    async def main():
+        server = QueryServer(path, host, port, **options)
+        for name, graph_path in (graphs or {}).items():
+            await server.handle({"op": "load", "graph": name, "path": graph_path})
+        await server.start()
+        logger.info("Listening on %s", server.address)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+    asyncio.run(main())
+
+def send_query(address, *requests: dict, timeout: float=None):
+    """
+    Sends requests to a running `QueryServer` over one connection and returns the responses in the order of the requests.
+
+    Parameters
+    ----------
+    - address
+        - Unix socket path (str) or (host, port) tuple, see `QueryServer.address`
+    - requests : dict
+        - Requests as described in `QueryServer`
+
+    Returns
+    -------
+    - :list
+        - One response per request
+    """
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(address if isinstance(address, str) else tuple(address))
+        ids = []
+        for i, request in enumerate(requests):
+            request = dict(request)
+            request.setdefault("id", i)
+            ids.append(request["id"])
+            connection.sendall(json.dumps(request).encode() + b"\n")
+        connection.shutdown(socket.SHUT_WR)
+        with connection.makefile("rb") as stream:
+            responses = {}
+            for line in stream:
+                response = json.loads(line)
+                responses[response["id"]] = response
+    return [responses.get(i) for i in ids]
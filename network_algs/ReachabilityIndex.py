@@ -0,0 +1,113 @@
+import random
+import igraph as ig
+from .MaskedGraph import as_masked_graph
+from .tracing import get_tracer
+
+class ReachabilityIndex:
+    def __init__(self, Graph: ig.Graph, num_labels: int=2, seed: int=0):
+        """
+        Answers whether one vertex reaches another in a DAG. Building the index costs O(num_labels * (V+E)),
+        after which most queries are answered by comparing a few integers.
+
+        The index holds GRAIL interval labels (Yildirim, Chaoji and Zaki, 2010). Each depth-first traversal gives
+        every vertex an interval [low, post], where post is its post-order rank and low is the smallest rank
+        among its descendants. If u reaches v, the interval of v lies inside the interval of u. The topological
+        position and the height (longest path to a sink) give two more such necessary conditions. A pair that
+        passes every check is settled by a depth-first search that skips vertices failing the checks.
+
+        The labels stay valid when edges are deleted, since that never makes new pairs reachable. They must be
+        rebuilt when edges or vertices are added.
+
+        Parameters
+        ----------
+        - Graph : ig.Graph
+            - Input graph (a DAG), or its `MaskedGraph` view to share its adjacency lists and topological order
+        - num_labels : int
+            - Number of depth-first traversals. More labels reject more pairs without a search.
+        - seed : int
+            - Seed for the order in which the traversals visit the sources
+        """
+        view = as_masked_graph(Graph)
+        self.NUM_V = view.vcount()
+        self._out_adjlist = view.get_adjlist(mode='out')
+        self._position = view.topological_position()
+        self._height = None
+        self._labels = []   # (low, post) per traversal
+
+        tracer = get_tracer()
+        rng = random.Random(seed)
+        in_adjlist = view.get_adjlist(mode='in')
+        sources = [v for v in range(self.NUM_V) if not in_adjlist[v]]
+        with tracer.phase("reachability_index"):
+            for i in range(num_labels):
+                rng.shuffle(sources)
+                self._labels.append(self._traverse(sources, reverse=i % 2 == 1))
+
+    def _traverse(self, roots: list, reverse: bool):
+        """
+        Depth-first traversal from `roots` that returns the GRAIL label (low, post) of every vertex. Odd
+        traversals visit the children in reverse order, so the labels differ. The first one also computes the heights.
+        """
+        out_adjlist = self._out_adjlist
+        NUM_V = self.NUM_V
+        low = [0] * NUM_V
+        post = [0] * NUM_V
+        height = [0] * NUM_V if self._height is None else None
+        visited = bytearray(NUM_V)
+        rank = 0
+        for root in roots:
+            visited[root] = 1
+            stack = [(root, iter(reversed(out_adjlist[root]) if reverse else out_adjlist[root]))]
+            while stack:
+                vertex, children = stack[-1]
+                for child in children:
+                    if not visited[child]:
+                        visited[child] = 1
+                        stack.append((child, iter(reversed(out_adjlist[child]) if reverse else out_adjlist[child])))
+                        break
+                else:
+                    # every child is finished, so its label (and height) is final
+                    stack.pop()
+                    smallest = rank
+                    for child in out_adjlist[vertex]:
+                        if low[child] < smallest:
+                            smallest = low[child]
+                    low[vertex] = smallest
+                    post[vertex] = rank
+                    rank += 1
+                    if height is not None and out_adjlist[vertex]:
+                        height[vertex] = 1 + max(height[child] for child in out_adjlist[vertex])
+        if height is not None:
+            self._height = height
+        return low, post
+
+    def _may_reach(self, u: int, v: int):
+        """
+        Returns False if the labels show that `u` (other than `v`) does not reach `v`, True if it might.
+        """
+        if self._position[u] >= self._position[v] or self._height[u] <= self._height[v]:
+            return False
+        for low, post in self._labels:
+            if low[v] < low[u] or post[v] > post[u]:
+                return False
+        return True
+
+    def reaches(self, u: int, v: int):
+        """
+        Returns True if there is a path from `u` to `v`. A vertex reaches itself.
+        """
+        if u == v:
+            return True
+        if not self._may_reach(u, v):
+            return False
+        get_tracer().count("reachability_searches")
+        seen = {u}
+        stack = [u]
+        while stack:
+            for w in self._out_adjlist[stack.pop()]:
+                if w == v:
+                    return True
+                if w not in seen and self._may_reach(w, v):
+                    seen.add(w)
+                    stack.append(w)
+        return False
@@ -0,0 +1,172 @@
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+from .MaskedGraph import as_csr_graph
+from .tracing import get_tracer
+
+StoreInfo = namedtuple("StoreInfo", ["hits", "misses", "entries", "max_bytes", "currbytes"])
+
+class ResultStore:
+    def __init__(self, path: str, max_bytes: int=256 * 2**20):
+        """
+        A persistent store of analysis results in an SQLite file. Results are keyed by the fingerprint of the graph
+        (see `graph_fingerprint`) and a query tuple such as ("cut_vertices", source, target), so a rerun on an
+        unchanged graph reads its results back instead of recomputing them. Once the stored values exceed
+        `max_bytes`, the least recently used ones are evicted.
+
+        The store can be shared by several processes; SQLite serializes the writes.
+
+        Parameters
+        ----------
+        - path : str
+            - Path of the SQLite file. It is created if it does not exist.
+        - max_bytes : int
+            - Maximum total size of the stored (pickled) values
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "fingerprint TEXT, query TEXT, value BLOB, size INTEGER, last_used REAL, "
+            "PRIMARY KEY (fingerprint, query))"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+
+    def get(self, fingerprint: str, query: tuple, compute):
+        """
+        Returns the value stored for `fingerprint` and `query`. On a miss the value is computed with `compute()`
+        and stored.
+
+        Parameters
+        ----------
+        - fingerprint : str
+            - Fingerprint of the graph, see `graph_fingerprint`
+        - query : tuple
+            - Identifies the result. Must only hold values with a stable repr (ints, strings, tuples).
+        - compute : callable
+            - Called without arguments to produce the value on a miss
+
+        Returns
+        -------
+        - The stored or newly computed value
+        """
+        tracer = get_tracer()
+        key = repr(query)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM results WHERE fingerprint = ? AND query = ?", (fingerprint, key)
+            ).fetchone()
+            if row is not None:
+                self.hits += 1
+                self._connection.execute(
+                    "UPDATE results SET last_used = ? WHERE fingerprint = ? AND query = ?", (time.time(), fingerprint, key)
+                )
+        if row is not None:
+            tracer.count("store_hits")
+            return pickle.loads(row[0])
+
+        self.misses += 1
+        tracer.count("store_misses")
+        value = compute()
+        self.put(fingerprint, query, value)
+        return value
+
+    def put(self, fingerprint: str, query: tuple, value):
+        """
+        Stores `value` for `fingerprint` and `query` and evicts the least recently used values if the store is too
+        large. A value larger than `max_bytes` is not stored.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                    (fingerprint, repr(query), blob, len(blob), time.time()),
+                )
+                excess = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0] - self.max_bytes
+                if excess > 0:
+                    evicted = 0
+                    for rowid, size in connection.execute("SELECT rowid, size FROM results ORDER BY last_used").fetchall():
+                        if evicted >= excess:
+                            break
+                        connection.execute("DELETE FROM results WHERE rowid = ?", (rowid,))
+                        evicted += size
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def clear(self, fingerprint: str=None):
+        """
+        Removes every stored value, or only those of one graph if `fingerprint` is given, and resets the counters.
+        """
+        with self._lock:
+            if fingerprint is None:
+                self._connection.execute("DELETE FROM results")
+            else:
+                self._connection.execute("DELETE FROM results WHERE fingerprint = ?", (fingerprint,))
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Returns a `StoreInfo` tuple with the hit and miss counters of this instance, the number of stored values
+        and their total size.
+        """
+        with self._lock:
+            entries, currbytes = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return StoreInfo(self.hits, self.misses, entries, self.max_bytes, currbytes)
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, key):
+        fingerprint, query = key
+        with self._lock:
+            return self._connection.execute(
+                "SELECT 1 FROM results WHERE fingerprint = ? AND query = ?", (fingerprint, repr(query))
+            ).fetchone() is not None
+
+    def __len__(self):
+        return self.info().entries
+
+def graph_fingerprint(Graph):
+    """
+    Returns a hash of the vertex count and the sorted edge list of a graph. Graphs with the same vertices and
+    edges get the same fingerprint however they were built. Attributes are ignored.
+
+    Parameters
+    ----------
+    - Graph : ig.Graph
+        - Input graph, or its `MaskedGraph` view or `CSRGraph`
+
+    Returns
+    -------
+    - :str
+        - Hexadecimal digest
+    """
+    csr = as_csr_graph(Graph)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(np.array([csr.NUM_V, csr.NUM_E], dtype="<i8").tobytes())
+    digest.update(np.ascontiguousarray(csr.out_indptr, dtype="<i8").tobytes())
+    digest.update(np.ascontiguousarray(csr.out_indices, dtype="<i8").tobytes())
+    return digest.hexdigest()
@@ -1,13 +1,220 @@
 import igraph as ig
 import numpy as np
 from .base_funcs import *
+from .GraphContext import GraphChange, GraphContext, renumber
+from .LRUCache import LRUCache
+from .reachability import reaches_all_targets
+from .parallel import get_m_SU_parallel, all_columns_protected_parallel
+from .ResultStore import ResultStore
+from .SourceCutMatrix import SourceCutMatrix
+from .set_cover import greedy_set_cover, exact_set_cover
+from .tracing import Tracer, get_tracer, traced
 
 class ShareKey:
-    def __init__(self, Graph: ig.Graph, targets: list):
+    def __init__(self, Graph: ig.Graph, targets: list, cache_size: int=100000, analysis_cache_size: int=256, tracer: Tracer=None,
+                 store: ResultStore=None, context: GraphContext=None):
+        """
+        Parameters
+        ----------
+        - Graph : ig.Graph
+            - Input graph (a DAG)
+        - targets : list
+            - The target vertices that should learn the key
+        - cache_size : int
+            - Maximum number of entries in each of the cut vertex and alternating path caches
+        - analysis_cache_size : int
+            - Maximum number of dominator trees (per source) and `CutVertexAnalysis` objects (per vertex) kept in
+              memory. The dominator trees and analyses are kept by `context` if it is given, with its own limit.
+        - tracer : Tracer
+            - Receives events, phase timings and counters (see `tracing`). Defaults to the active tracer, which is silent.
+        - store : ResultStore
+            - Persistent store for the potential sources, cut vertices, source/cut matrix and the final answer. A rerun
+              on the same graph and targets reads them back instead of recomputing them.
+        - context : GraphContext
+            - Precomputation on `Graph` shared with other `ShareKey` and `ShareSecret` instances, e.g. for other
+              targets. Edits through any of them update all of them.
+        """
+        if context is not None and context.Graph is not Graph:
+            raise ValueError("The context belongs to a different graph.")
         self.Graph = Graph
+        self.tracer = tracer
+        self.store = store
         self.targets = targets
-        self.topological_order = Graph.topological_sorting(mode='out')
         self.NUM_V = Graph.vcount()
+        # topological order, dominator trees, reachability and `CutVertexAnalysis` objects, see GraphContext
+        self.context = context if context is not None else GraphContext(Graph, analysis_cache_size)
+        self.context.subscribe(self)
+
+        self._is_cut = LRUCache(cache_size)                     # (source, target, u) -> bool
+        self._alt_path = LRUCache(cache_size)                   # (source, target, u) -> bool
+        self._cut_vertices = LRUCache(analysis_cache_size)      # source -> {target: set of cut vertices}
+        self._m_SU = None                                       # last source/cut matrix, patched after edits
+        self._dirty_rows = set()                                # rows and columns of `_m_SU` that edits may have changed
+        self._dirty_columns = set()
+
+    @property
+    def topological_order(self):
+        return self.context.topological_order
+
+    def clear_cache(self):
+        """
+        Drops every cached result, including those of the context. Edits made directly on `self.Graph` that
+        change the number of vertices or edges are noticed by the next query anyway (see `GraphContext.check_graph`).
+        """
+        self.context.clear()
+
+    def add_edges(self, edges):
+        """
+        Adds edges to `self.Graph` and updates the analysis instead of starting over. An edge a -> b only changes
+        what the ancestors of a reach and the connect sets of the descendants of b, so only the reachability rows,
+        cut vertices and alternating path structures of these vertices are recomputed. The next `get_m_SU` patches
+        the previous matrix in the rows and columns of these vertices. Edges that already exist are skipped.
+
+        Raises ValueError if an edge would create a cycle. The edges before it are still added.
+
+        Parameters
+        ----------
+        - edges : list
+            - (source, target) pairs
+        """
+        self.context.add_edges(edges)
+
+    def delete_edges(self, edges):
+        """
+        Deletes edges from `self.Graph` and updates the analysis like `add_edges`.
+
+        Parameters
+        ----------
+        - edges : list
+            - (source, target) pairs
+        """
+        self.context.delete_edges(edges)
+
+    def add_vertices(self, n: int):
+        """
+        Adds `n` isolated vertices to `self.Graph`. They reach no target and are never cut vertices, so only new
+        columns are added to the source/cut matrix.
+        """
+        self.context.add_vertices(n)
+
+    def delete_vertices(self, vertices: list):
+        """
+        Deletes vertices from `self.Graph` and renumbers the targets like igraph does. Since every vertex after a
+        deleted one is renumbered, all cached results are dropped. Raises ValueError if a target is deleted.
+        """
+        self.context.delete_vertices(vertices)
+
+    def _check_delete(self, deleted: list):
+        if any(t in deleted for t in self.targets):
+            raise ValueError("The targets cannot be deleted.")
+
+    def _graph_changed(self, change: GraphChange):
+        """
+        Updates the cached results after the context changed the graph, see `GraphChange`.
+        """
+        self.NUM_V = self.Graph.vcount()
+        if change.upstream is None:
+            if change.deleted:
+                self.targets = [renumber(t, change.deleted) for t in self.targets]
+            self._m_SU = None
+            self._dirty_rows = set()
+            self._dirty_columns = set()
+            for cache in self._caches().values():
+                cache.clear()
+            return
+
+        # dominator trees rooted upstream of the edge change, connect sets (and so meta graph H) change downstream
+        upstream, downstream = change.upstream, change.downstream
+        self._cut_vertices.discard(lambda s: s in upstream)
+        self._is_cut.discard(lambda key: key[0] in upstream)
+        self._alt_path.discard(lambda key: key[0] in downstream or key[1] in downstream or key[2] in downstream)
+
+        if downstream.intersection(self.targets):
+            self._m_SU = None       # alternating paths towards a target changed for every source
+        else:
+            self._dirty_rows |= upstream | downstream
+            self._dirty_columns |= downstream
+
+    def cache_info(self):
+        """
+        Returns the hit and miss counters of every cache, including the dominator tree and `CutVertexAnalysis`
+        caches of the context.
+
+        Returns
+        -------
+        - :dict
+            - Maps the name of each cache to a `CacheInfo` tuple
+        """
+        info = {name: cache.info() for name, cache in self._caches().items()}
+        context_info = self.context.cache_info()
+        info["dominator_trees"] = context_info["dominator_trees"]
+        info["cut_analyses"] = context_info["cut_analyses"]
+        return info
+
+    def _caches(self):
+        return {
+            "is_cut": self._is_cut,
+            "alt_path": self._alt_path,
+            "cut_vertices": self._cut_vertices,
+        }
+
+    def _check_graph(self):
+        """
+        Clears the caches if vertices or edges were added to or deleted from `self.Graph` since they were filled.
+        """
+        self.context.check_graph()
+
+    def _stored(self, query: tuple, compute):
+        """
+        Returns `compute()`, going through the persistent store if there is one. `query` is extended by the targets.
+        """
+        if self.store is None:
+            return compute()
+        return self.store.get(self.context.fingerprint(), query + (tuple(self.targets),), compute)
+
+    def _get_reachability(self):
+        """
+        Returns the bitmap of which vertices reach which targets, computing it the first time it is needed.
+        """
+        return self.context.get_reachability_bitmap(self.targets)
+
+    def _get_cut_vertices(self, source: int):
+        """
+        Returns the cut vertices between `source` and every target. They are read off a single dominator tree
+        rooted at the source, which is computed the first time the source is queried.
+        """
+        def compute():
+            idom = self.context.get_dominator_tree(source)
+            return {t: set(cut_vertices_from_dominators(idom, source, t)) for t in self.targets}
+        return self._cut_vertices.get(source, lambda: self._stored(("cut_vertices", source), compute))
+
+    def _get_reachability_index(self):
+        """
+        Returns the `ReachabilityIndex` of the graph, or None while the dominator trees still fit in their cache.
+        Building the index costs about as much as a dozen dominator trees, so it only pays off once trees are
+        evicted and would otherwise be built again.
+        """
+        trees = self._cut_vertices
+        return self.context.get_reachability_index(build=trees.maxsize is not None and trees.misses > trees.maxsize)
+
+    def _is_cut_vertex(self, source: int, target: int, u: int):
+        def compute():
+            # a vertex the source does not reach is no cut vertex, which is cheaper to check than building the dominator tree
+            if source not in self._cut_vertices:
+                index = self._get_reachability_index()
+                if index is not None and not index.reaches(source, u):
+                    return False
+            return u in self._get_cut_vertices(source)[target]
+        return self._is_cut.get((source, target, u), compute)
+
+    def _get_cut_analysis(self, u: int):
+        """
+        Returns the alternating path structure around `u`, which the context shares with every source and target.
+        """
+        return self.context.get_cut_analysis(u)
+
+    def _alt_path_exists(self, source: int, target: int, u: int):
+        return self._alt_path.get((source, target, u), lambda: self._get_cut_analysis(u).alt_path_exists(source, target))
 
     def _u_does_not_learn(self, source: int, target: int,  u: int):
         """
@@ -34,20 +241,161 @@ class ShareKey:
         """
 
         # if self.Graph.vertex_connectivity(source, target, neighbors="ignore") == 0:
-        print(f"source: {source}\ttarget: {target}\tu: {u}")
+        tracer = get_tracer()
         if source == u:
-            print("source == u\n")
+            tracer.event("u_does_not_learn", source=source, target=target, u=u, reason="source == u")
             return 0
-        elif not is_cut_vertex(self.Graph, source, target, u):
-            print("not cut-vertex\n")
+        elif not self._is_cut_vertex(source, target, u):
+            tracer.event("u_does_not_learn", source=source, target=target, u=u, reason="not cut-vertex")
             return 1
-        elif alt_path_exists(self.Graph, source, target, u):
-            print("alt path exists\n")
+        elif self._alt_path_exists(source, target, u):
+            tracer.event("u_does_not_learn", source=source, target=target, u=u, reason="alt path exists")
             return 1
-        print("otherwise\n")
+        tracer.event("u_does_not_learn", source=source, target=target, u=u, reason="otherwise")
         return 0
 
-    def does_scheme_exist(self):
+    def _get_m_SU_entry(self, source: int, u: int):
+        """
+        Returns the entry of the source/cut matrix for `source` and `u`, i.e., 1 if the source keeps `u` from learning the key.
+        """
+        return 1 if all(self._u_does_not_learn(source, t, u) == 1 for t in self.targets) else 0
+
+    def _get_m_SU_column(self, u: int, V_potential_sources: list):
+        """
+        Returns the column of the source/cut matrix for vertex `u`, i.e., whether each potential source keeps `u` from learning the key.
+        """
+        return [self._get_m_SU_entry(s, u) for s in V_potential_sources]
+
+    def _find_protecting_source(self, u: int, V_potential_sources: list):
+        """
+        Returns the first source in `V_potential_sources` that keeps `u` from learning the key, or None if there is none.
+        Sources for which `u` is not a cut vertex towards any target are tried first, since they need no alternating path.
+        """
+        for s in V_potential_sources:
+            if s != u and not any(self._is_cut_vertex(s, t, u) for t in self.targets):
+                return s
+        for s in V_potential_sources:
+            if s != u and all(self._u_does_not_learn(s, t, u) == 1 for t in self.targets):
+                return s
+        return None
+
+    def _order_sources(self, V_potential_sources: list):
+        """
+        Orders the potential sources by the number of cut vertices between them and the targets, fewest first.
+        Sources with few cut vertices are the most likely to protect a given vertex.
+        """
+        return sorted(V_potential_sources, key=lambda s: sum(len(cuts) for cuts in self._get_cut_vertices(s).values()))
+
+    def _get_potential_sources(self):
+        """
+        Returns the vertices that reach every target, in topological order.
+        """
+        reaches_targets = reaches_all_targets(self._get_reachability(), len(self.targets))
+        return [s for s in self.topological_order if reaches_targets[s]]
+
+    def _all_columns_protected(self, V_potential_sources: list, V_no_targets: list, workers: int):
+        """
+        Returns True if every vertex in `V_no_targets` is kept from learning the key by some potential source.
+        """
+        V_potential_sources = self._order_sources(V_potential_sources)
+        if workers is not None and workers > 1:
+            return all_columns_protected_parallel(self.Graph, self.targets, V_potential_sources, V_no_targets, workers)
+        return all(self._find_protecting_source(u, V_potential_sources) is not None for u in V_no_targets)
+
+    def _get_m_SU(self, V_potential_sources: list, V_no_targets: list, workers: int):
+        """
+        Returns the whole source/cut matrix with one row per potential source and one column per vertex in `V_no_targets`.
+        """
+        if self._m_SU is not None:
+            return self._patch_m_SU(self._m_SU, V_potential_sources, V_no_targets)
+        if workers is not None and workers > 1:
+            return get_m_SU_parallel(self.Graph, self.targets, V_potential_sources, V_no_targets, workers)
+
+        # Initialize matrix of potential sources and potential cut vertices
+        m_SU = SourceCutMatrix(V_potential_sources, V_no_targets)
+
+        # populate matrix
+        for u_index, u in enumerate(V_no_targets):
+            m_SU.set_column(u_index, self._get_m_SU_column(u, V_potential_sources))
+        return m_SU
+
+    def _patch_m_SU(self, previous: SourceCutMatrix, V_potential_sources: list, V_no_targets: list):
+        """
+        Returns the source/cut matrix after edits to the graph, copying the entries of `previous` that cannot have
+        changed. An entry (s, u) can only change if s reaches a changed edge or is reached by it (a dirty row), or
+        if u is reached by it, since only then its connect sets and meta graph H change (a dirty column).
+        """
+        m_SU = SourceCutMatrix(V_potential_sources, V_no_targets)
+        previous_rows = {s: i for i, s in enumerate(previous.rows)}
+        previous_columns = {u: j for j, u in enumerate(previous.columns)}
+        clean = [j for j, u in enumerate(V_no_targets) if u in previous_columns and u not in self._dirty_columns]
+        clean_previous = [previous_columns[V_no_targets[j]] for j in clean]
+        dirty = [j for j, u in enumerate(V_no_targets) if u not in previous_columns or u in self._dirty_columns]
+
+        for i, s in enumerate(V_potential_sources):
+            if s not in previous_rows or s in self._dirty_rows:
+                m_SU.set_row(i, [self._get_m_SU_entry(s, u) for u in V_no_targets])
+                continue
+            row = np.zeros(len(V_no_targets), dtype=bool)
+            row[clean] = previous.row(previous_rows[s])[clean_previous]
+            for j in dirty:
+                row[j] = self._get_m_SU_entry(s, V_no_targets[j])
+            m_SU.set_row(i, row)
+        return m_SU
+
+    def _get_rows_and_columns(self):
+        """
+        Returns the potential sources (vertices which are connected to all targets) and the vertices that must not learn the key, V \\ D.
+        """
+        with get_tracer().phase("potential_sources"):
+            V_potential_sources = self._stored(("potential_sources",), self._get_potential_sources)
+            V_no_targets = [s for s in self.topological_order if s not in self.targets]
+        return V_potential_sources, V_no_targets
+
+    @traced
+    def get_m_SU(self, workers: int=None):
+        """
+        Fills the whole source/cut matrix. Entry (s, u) is 1 if source s keeps vertex u from learning the key for every target.
+
+        Parameters
+        ----------
+        - self: ShareKey
+            - Current class instance
+        - workers: int
+            - If greater than 1, evaluate the columns with a pool of this many processes
+
+        Returns
+        -------
+        - m_SU : SourceCutMatrix
+            - Packed matrix whose `rows` are the potential sources and whose `columns` are the vertices in V \\ D
+        """
+        self._check_graph()
+        V_potential_sources, V_no_targets = self._get_rows_and_columns()
+        with get_tracer().phase("cut_checks"):
+            m_SU = self._stored(("m_SU",), lambda: self._get_m_SU(V_potential_sources, V_no_targets, workers))
+        self._m_SU = m_SU
+        self._dirty_rows = set()
+        self._dirty_columns = set()
+        return m_SU
+
+    @traced
+    def iter_m_SU_columns(self):
+        """
+        Yields the columns of the source/cut matrix one at a time, for graphs where even the packed matrix is too large
+        to keep. Nothing is stored in the result store.
+
+        Yields
+        ------
+        - :tuple
+            - (u, column) where column is a bool array with one entry per potential source (see `get_m_SU`)
+        """
+        self._check_graph()
+        V_potential_sources, V_no_targets = self._get_rows_and_columns()
+        for u in V_no_targets:
+            yield u, np.array(self._get_m_SU_column(u, V_potential_sources), dtype=bool)
+
+    @traced
+    def does_scheme_exist(self, workers: int=None, full_matrix: bool=False):
         """
         Determines if a scheme for sharing a key exists for a network G.
         This is Function 2 from our discussions.
@@ -56,6 +404,12 @@ class ShareKey:
         ----------
         - self: ShareKey
             - Current class instance
+        - workers: int
+            - If greater than 1, evaluate the columns of the source/cut matrix with a pool of this many processes
+        - full_matrix: bool
+            - If True, fill the whole source/cut matrix (see `get_m_SU`) and report it as an "m_SU" tracing event for diagnostics. Otherwise the matrix is checked one
+              column at a time, each column stops at its first protecting source and the check returns False as soon as
+              a column has no protecting source.
 
         Returns
         -------
@@ -64,38 +418,58 @@ class ShareKey:
             - False: Otherwise
         """
         
-        # find potential sources (vertices which are connected to all targets)
-        V_potential_sources = []
-        V_no_targets = [] # vertices in graph excluding targets, V \ D
-        for s in self.topological_order:
-            if all(self.Graph.vertex_connectivity(s, t, checks=False, neighbors='negative') != 0 for t in self.targets if s != t):
-                V_potential_sources.append(s)
-            if s not in self.targets:
-                V_no_targets.append(s)
-        
-        NUM_POTENTIAL_SOURCES = len(V_potential_sources)
-        NUM_POTENTIAL_CUTS = len(V_no_targets)
+        self._check_graph()
+        tracer = get_tracer()
 
-        # Initialize matrix of potential sources and potential cut vertices
-        m_SU = np.asmatrix( np.zeros((NUM_POTENTIAL_SOURCES, NUM_POTENTIAL_CUTS)) )
+        if not full_matrix:
+            V_potential_sources, V_no_targets = self._get_rows_and_columns()
+            with tracer.phase("cut_checks"):
+                return self._stored(("does_scheme_exist",), lambda: self._all_columns_protected(V_potential_sources, V_no_targets, workers))
 
-        # populate matrix
-        for s in V_potential_sources:
-            for u in V_no_targets:
-                s_index = V_potential_sources.index(s)
-                u_index = V_no_targets.index(u)
-                m_SU[s_index, u_index] = 1 if all(self._u_does_not_learn(s, t, u) == 1 for t in self.targets) else 0
+        m_SU = self.get_m_SU(workers)
 
-        scheme_exists = True    # initially set this to True
+        # a vertex not in `targets` learns about the key if no potential source covers its column
+        scheme_exists = m_SU.all_columns_covered()
         
-        # check if a vertex not in `targets` learns about the key
-        for i in range(NUM_POTENTIAL_CUTS):
-            if np.sum(m_SU[:,i]) == 0:
-                scheme_exists = False
-                break
-        
-        print(f"Vertex associated with row index: {V_potential_sources}")
-        print(f"Vertex associated with column index: {V_no_targets}")
-        print(f"{m_SU}\n")
+        tracer.event("m_SU", rows=m_SU.rows, columns=m_SU.columns, matrix=m_SU)
         
         return scheme_exists
+
+    @traced
+    def get_min_source_set(self, exact: bool=False, workers: int=None, max_nodes: int=1000000):
+        """
+        Returns a small set of sources that together keep every vertex in V \\ D from learning the key, i.e., rows of
+        the source/cut matrix whose union covers every column. This is the set of sources to provision.
+
+        Parameters
+        ----------
+        - self: ShareKey
+            - Current class instance
+        - exact: bool
+            - If True, return a minimum set found by branch and bound (see `exact_set_cover`). Only meant for small
+              instances. Otherwise return the greedy set, which is within a factor ln|V| of the minimum.
+        - workers: int
+            - If greater than 1, fill the source/cut matrix with a pool of this many processes
+        - max_nodes: int
+            - Search limit for `exact`
+
+        Returns
+        -------
+        - :list
+            - The selected sources, or None if no scheme exists. Empty if there is no vertex outside the targets to
+              protect.
+        """
+        m_SU = self.get_m_SU(workers)
+        NUM_SOURCES, NUM_COLUMNS = m_SU.shape
+        if NUM_COLUMNS == 0:
+            return []           # nothing to protect
+        if NUM_SOURCES == 0:
+            return None
+
+        rows = [m_SU.row_bitset(i) for i in range(NUM_SOURCES)]
+        universe = (1 << NUM_COLUMNS) - 1
+        with get_tracer().phase("set_cover"):
+            selected = exact_set_cover(rows, universe, max_nodes) if exact else greedy_set_cover(rows, universe)
+        if selected is None:
+            return None
+        return [m_SU.rows[i] for i in selected]
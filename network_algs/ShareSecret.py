@@ -1,16 +1,64 @@
 import igraph as ig
 from .base_funcs import *
+from .tracing import Tracer, get_tracer, traced
+from .GraphContext import GraphContext, renumber
+from .ShareSecretBatch import ShareSecretBatch
+from .ResultStore import ResultStore
 
 class ShareSecret:
-    def __init__(self, Graph: ig.Graph, source: int, target: int):
+    def __init__(self, Graph: ig.Graph, source: int, target: int, tracer: Tracer=None, batch: ShareSecretBatch=None, store: ResultStore=None, context: GraphContext=None):
         self.Graph = Graph
+        self.tracer = tracer            # receives status events, phase timings and counters, see tracing.py
         self.source = source
         self.target = target
-        self.topological_order = Graph.topological_sorting(mode='out')
-        self.connectivity_sets = None   # allow user to access this set when computed in get_alternating_path()
-        self.intersection_sets = None   # allow user to access this set when computed in get_alternating_path()
+        # precomputation shared with other pairs on the same graph. Results go through `store` (or the store of `batch`) if there is one.
+        self.batch = batch if batch is not None else ShareSecretBatch(Graph, tracer, store=store, context=context)
+        self.context = self.batch.context   # checked for direct edits to the graph once per public call
+        self.context.subscribe(self)        # renumbers the source and target when vertices are deleted
+        self.connectivity_sets = None   # allow user to access this set when computed in get_alternating_path(), keyed by the vertices of H for the last cut vertex
+        self.intersection_sets = None   # allow user to access this set when computed in get_alternating_path(), for the last cut vertex
         # self.paths = {}
 
+    @property
+    def topological_order(self):
+        return self.batch.topological_order
+
+    def add_edges(self, edges):
+        """
+        Adds edges to `self.Graph` and updates the precomputation of the batch (see `ShareSecretBatch.add_edges`).
+        """
+        self.batch.add_edges(edges)
+
+    def delete_edges(self, edges):
+        """
+        Deletes edges from `self.Graph` and updates the precomputation of the batch (see `ShareSecretBatch.delete_edges`).
+        """
+        self.batch.delete_edges(edges)
+
+    def add_vertices(self, n: int):
+        """
+        Adds `n` isolated vertices to `self.Graph`.
+        """
+        self.batch.add_vertices(n)
+
+    def delete_vertices(self, vertices: list):
+        """
+        Deletes vertices from `self.Graph` and renumbers the source and target like igraph does.
+        Raises ValueError if the source or target is deleted.
+        """
+        self.batch.delete_vertices(vertices)
+
+    def _check_delete(self, deleted: list):
+        if self.source in deleted or self.target in deleted:
+            raise ValueError("The source and target cannot be deleted.")
+
+    def _graph_changed(self, change):
+        # nothing is cached here, see `GraphContext.subscribe`
+        if change.deleted:
+            self.source = renumber(self.source, change.deleted)
+            self.target = renumber(self.target, change.deleted)
+
+    @traced
     def get_cut_vertices(self):
         """
         Find all cut vertices in a DAG graph. Returns a list of these vertices.
@@ -25,111 +73,207 @@ class ShareSecret:
             - A list containing the cut-vertices for a source and target.
               Returns an empty list if vertices are not connected or no cut-vertex exists.
         """
+        self.context.check_graph()
+        return self._get_cut_vertices()
+
+    def _get_cut_vertices(self):
+        return self.batch.stored(("cut_vertices", self.source, self.target), self._find_cut_vertices)
 
+    def _find_cut_vertices(self):
         cut_vertices = []
-        source_i = self.topological_order.index(self.source)
-        target_i = self.topological_order.index(self.target)
+        tracer = get_tracer()
 
-        # check if source and target are already directly connected
-        if self.Graph.are_adjacent(self.source, self.target):
-            print("Source and target are directly connected.\nNo network scheme needed.")
-            return cut_vertices
+        with tracer.phase("cut_checks"):
+            # check if source and target are already directly connected
+            tracer.count("igraph_calls")
+            if self.Graph.are_adjacent(self.source, self.target):
+                tracer.event("status", message="Source and target are directly connected. No network scheme needed.")
+                return cut_vertices
 
-        # check if source and target are connected
-        if self.Graph.vertex_connectivity(self.source, self.target, neighbors="ignore") == 0:
-            print("Source is not connected to target.\n")
-            return cut_vertices
+            # check if source and target are connected
+            if not self.context.reaches(self.source, self.target):
+                tracer.event("status", message="Source is not connected to target.")
+                return cut_vertices
 
-        # iterate from the vertex succeeding the source to the vertex preceeding the target
-        for u in self.topological_order[source_i+1:target_i]:
-            G_tmp = self.Graph.copy()
-            G_tmp.delete_vertices(u)
+            # the cut vertices are the strict dominators of the target in the dominator tree rooted at the source
+            idom = self.context.get_dominator_tree(self.source)
 
-            # compensate for graph resizing
-            source_tmp = self.source - 1 if u < self.source else self.source
-            target_tmp = self.target - 1 if u < self.target else self.target
+            cut_vertices = cut_vertices_from_dominators(idom, self.source, self.target)
+        return cut_vertices
 
-            # if s and t are no longer connected then u is a cut-vertex, append to list
-            if G_tmp.vertex_connectivity(source_tmp, target_tmp, neighbors="ignore") == 0:
-                cut_vertices.append(u)
+    def _get_alternating_path_around(self, cut_vertex: int):
+        """
+        Finds an alternating path around a single cut vertex. This is the one cut vertex algorithm.
 
-        del G_tmp
-        return cut_vertices
+        Returns
+        -------
+        - :tuple
+            - (P_alt, H) if an alternating path exists, None otherwise
+        """
+        tracer = get_tracer()
+
+        # get set of incoming edges to cut vertex + source + target
+        tracer.count("igraph_calls")
+        in_cut_source_target = self.Graph.neighbors(cut_vertex, mode='in')
+        in_cut_source_target.append(self.target)
+        if self.source not in in_cut_source_target:
+            in_cut_source_target.append(self.source)
+
+        # with the cut vertex removed, get the connect sets of the vertices in meta graph H
+        updated = self.context.get_connect_bitsets_without(cut_vertex)
+        self.connectivity_sets = {v: bitset_to_list(updated[v]) for v in in_cut_source_target}
+        
+        # check if alt path exists before building meta graph H
+        with tracer.phase("H_construction"):
+            P_alt_exists = H_path_exists(self.connectivity_sets, in_cut_source_target, self.source, self.target)
+        if not P_alt_exists:
+            tracer.event("status", message=f"No alternating path exists around cut vertex {cut_vertex}.")
+            return
+        tracer.event("status", message=f"Alternating path exists around cut vertex {cut_vertex}")
+
+        G_tmp = self.context.get_cut_graph(cut_vertex)      # create temporary graph which disconnects the cut vertex from the original graph
+
+        with tracer.phase("H_construction"):
+            # get the intersection of the connect sets and the edges for meta graph H
+            self.intersection_sets, edges_H = get_intersection_set_H_edges(G_tmp, self.connectivity_sets, in_cut_source_target)
+
+            # make meta graph H
+            H_NUM_V = len(in_cut_source_target)
+            source_H = in_cut_source_target.index(self.source)
+            target_H = in_cut_source_target.index(self.target)
+            H = ig.Graph(H_NUM_V, edges_H)
+            H.vs["name"] = range(H_NUM_V)
+            H.vs[source_H]["name"] = 'S'
+            H.vs[target_H]["name"] = 'T'
+
+        # get a shortest path in the graph H
+        tracer.count("igraph_calls", 2)
+        P_alt_H = H.get_shortest_paths(source_H, target_H)[0]
+        
+        # each hop of the H path joins two colliders through an intersecting vertex of their connect sets, found
+        # by a dict lookup instead of a scan of the intersection set of the current collider. The lookup is built
+        # once per collider on the path: collider -> {neighbouring collider: intersections}
+        intersections = {}
+        for collider in {in_cut_source_target[v] for v in P_alt_H[:-1]}:
+            by_neighbour = intersections[collider] = {}
+            for vertex, intersect in self.intersection_sets[collider]:
+                by_neighbour.setdefault(vertex, []).append(intersect)
+
+        hops = []
+        colliders_from = {}     # intersecting vertex -> colliders it needs a path to
+        for i in range( len(P_alt_H) - 1 ):
+            P_alt_H_to_G_curr = in_cut_source_target[P_alt_H[i]]    # covert to current vertex in Graph using path from H
+            P_alt_H_to_G_next = in_cut_source_target[P_alt_H[i+1]]  # covert to next vertex in Graph using path from H
+            for intersect in intersections[P_alt_H_to_G_curr].get(P_alt_H_to_G_next, []):
+                intersecting_vertex = intersect[0]
+                # account for starting at the source
+                first_collider = P_alt_H_to_G_curr if P_alt_H_to_G_curr != self.source or len(P_alt_H) == 2 else None
+                hops.append((intersecting_vertex, first_collider, P_alt_H_to_G_next))
+                colliders = colliders_from.setdefault(intersecting_vertex, [])
+                colliders.extend(c for c in (first_collider, P_alt_H_to_G_next) if c is not None and c not in colliders)
 
+        # one breadth-first search per intersecting vertex finds the shortest paths to all of its colliders
+        paths_from = {}
+        for intersecting_vertex, colliders in colliders_from.items():
+            paths_from[intersecting_vertex] = dict(zip(colliders, G_tmp.get_shortest_paths(intersecting_vertex, colliders)))
+
+        P_alt = []  # list for alternating path
+        for intersecting_vertex, P_alt_H_to_G_curr, P_alt_H_to_G_next in hops:
+            if P_alt_H_to_G_curr is not None:
+                P_alt.append(list(paths_from[intersecting_vertex][P_alt_H_to_G_curr]))   # the shortest path from an intersecting vertex to the current collider
+            P_alt.append(list(paths_from[intersecting_vertex][P_alt_H_to_G_next]))       # the shortest path from an intersecting vertex to the next collider
+
+        return P_alt, H
+
+    @traced
+    def get_alternating_paths(self, Graph_H=False):
+        """
+        Gets an alternating path around every cut vertex between the initialized source and target.
+
+        Parameters
+        ----------
+        - self : ShareSecret
+            - The current class instance
+        - Graph_H : bool
+            - If True, also return meta graph H for every cut vertex
+
+        Returns
+        -------
+        - paths : dict
+            - Maps each cut vertex, in topological order, to its alternating path (or to (P_alt, H) if `Graph_H` is True).
+              Cut vertices without an alternating path map to None.
+        """
+        self.context.check_graph()
+        if Graph_H:
+            return self._find_alternating_paths(Graph_H)
+        return self.batch.stored(("alternating_paths", self.source, self.target), lambda: self._find_alternating_paths(Graph_H))
+
+    def _find_alternating_paths(self, Graph_H: bool):
+        paths = {}
+        for cut_vertex in self._get_cut_vertices():
+            result = self._get_alternating_path_around(cut_vertex)
+            if result is None or Graph_H:
+                paths[cut_vertex] = result
+            else:
+                paths[cut_vertex] = result[0]
+        return paths
+
+    @traced
     def get_alternating_path(self, Graph_H=False):
         """
         Gets the alternating path for the graph used to initialize the graph for communication bewtween the initialized
-        source and target.
+        source and target. With several cut vertices, the alternating paths around each of them are concatenated.
 
         Parameters
         ----------
         - self : ShareSecret
             - The current class instance
+        - Graph_H : bool
+            - If True, also return meta graph H. With several cut vertices, this is a list with one H per cut vertex.
 
         Returns
         -------
         - P_alt : list
-            - The alternating path
+            - The alternating path. None if there is no cut vertex or some cut vertex has no alternating path.
         """
-        
+        self.context.check_graph()
+        return self._get_alternating_path(Graph_H)
+
+    def _get_alternating_path(self, Graph_H: bool):
+        # meta graph H is not stored, so only the path on its own is read from the store
+        if Graph_H:
+            return self._find_alternating_path(Graph_H)
+        return self.batch.stored(("alternating_path", self.source, self.target), lambda: self._find_alternating_path(Graph_H))
+
+    def _find_alternating_path(self, Graph_H: bool):
+        tracer = get_tracer()
 
         # get all cut vertices between the source and target
-        cut_vertices = self.get_cut_vertices()
+        cut_vertices = self._get_cut_vertices()
 
-        # check if any cut vertices exists or too many exist. This alorithm is only implemented for 1 cut vertex
+        # check if any cut vertices exists
         num_cut_vertices = len(cut_vertices)
-        if num_cut_vertices != 1:
-            print(f"Number of cut vertices: {num_cut_vertices}.\nAlternating path with this algorithm does not exist.")
+        if num_cut_vertices == 0:
+            tracer.event("status", message=f"Number of cut vertices: {num_cut_vertices}. Alternating path with this algorithm does not exist.")
             return
-        
-        # get set of incoming edges to cut vertex + source + target
-        in_cut_source_target = self.Graph.neighbors(cut_vertices[0], mode='in')
-        in_cut_source_target.append(self.target)
-        if self.source not in in_cut_source_target:
-            in_cut_source_target.append(self.source)
-        
-        G_tmp = del_cut_edges(self.Graph, cut_vertices[0])      # create temporary graph which disconnects the cut vertex from the original graph
-        self.connectivity_sets = get_connect_sets(G_tmp)        # with the cut vertex removed, get the connect sets
-        
-        # get the intersection of the connect sets and the edges for meta graph H
-        self.intersection_sets, edges_H = get_intersection_set_H_edges(G_tmp, self.connectivity_sets, in_cut_source_target)
-
-        # make meta graph H
-        H_NUM_V = len(in_cut_source_target)
-        source_H = in_cut_source_target.index(self.source)
-        target_H = in_cut_source_target.index(self.target)
-        H = ig.Graph(H_NUM_V, edges_H)
-        H.vs["name"] = range(H_NUM_V)
-        H.vs[source_H]["name"] = 'S'
-        H.vs[target_H]["name"] = 'T'
 
-        # get a shortest path in the graph H
-        P_alt_H = H.get_shortest_paths(source_H, target_H)[0]
-        
-        # check if alt path exists
-        if len(P_alt_H) == 0:
-            print("No alternating path exists.\n")
-            return
-        print("Alternating path exists")
-        
-        P_alt = []  # list for alternating path
-        
-        for i in range( len(P_alt_H) - 1 ):
-            P_alt_H_to_G_curr = in_cut_source_target[P_alt_H[i]]    # covert to current vertex in Graph using path from H
-            P_alt_H_to_G_next = in_cut_source_target[P_alt_H[i+1]]  # covert to next vertex in Graph using path from H
-            intersection_tmp = self.intersection_sets[P_alt_H_to_G_curr] # intersection set for current vertex
-            for j in range( len(intersection_tmp) ):
-                intersection_set_tuple = intersection_tmp[j]        # get tuple j in intersection set
-                if intersection_set_tuple[0] == P_alt_H_to_G_next:  # check if tuple j is the tuple associated with the next vertex 
-                    if P_alt_H_to_G_curr != self.source or len(P_alt_H) == 2:   # account for starting at the source
-                        P_alt.append(G_tmp.get_shortest_paths(intersection_set_tuple[1][0], P_alt_H_to_G_curr)[0])  # append the shortest path from an intersecting vertex to the current collider
-                    P_alt.append(G_tmp.get_shortest_paths(intersection_set_tuple[1][0], P_alt_H_to_G_next)[0])      # append the shortest path from an intersecting vertex to the next collider
+        P_alt = []
+        H_per_cut_vertex = []
+        for cut_vertex in cut_vertices:
+            result = self._get_alternating_path_around(cut_vertex)
+            if result is None:
+                tracer.event("status", message="No alternating path exists.")
+                return
+            P_alt.extend(result[0])
+            H_per_cut_vertex.append(result[1])
+        tracer.event("status", message="Alternating path exists")
 
         if Graph_H:
-            return P_alt, H
+            return P_alt, H_per_cut_vertex[0] if num_cut_vertices == 1 else H_per_cut_vertex
         else:
             return P_alt
 
+    @traced
     def get_source_to_target_path(self):
         """
         Returns a path from the source to the target if it exists
@@ -144,10 +288,12 @@ class ShareSecret:
         - source_to_target : list
             - The shortest path from the source to the target if it exists
         """
-        source_to_target = self.Graph.get_shortest_paths(self.source, self.target)[0]
-        
-        if len(source_to_target) == 0:
-            print("No path between source and target exists")
+        tracer = get_tracer()
+        self.context.check_graph()
+        if not self.context.reaches(self.source, self.target):
+            tracer.event("status", message="No path between source and target exists")
             return
+        tracer.count("igraph_calls")
+        source_to_target = self.Graph.get_shortest_paths(self.source, self.target)[0]
         
         return source_to_target
\ No newline at end of file
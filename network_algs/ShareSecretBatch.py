@@ -0,0 +1,181 @@
+import igraph as ig
+from .GraphContext import GraphContext
+from .ResultStore import ResultStore
+from .tracing import Tracer, traced, use_tracer
+
+class ShareSecretBatch:
+    def __init__(self, Graph: ig.Graph, tracer: Tracer=None, cache_size: int=64, store: ResultStore=None, context: GraphContext=None):
+        """
+        Shares the work of `ShareSecret` across many source/target pairs on the same graph. The topological order and
+        the connect sets of the graph are computed once. Dominator trees (per source) and the connect sets with a
+        cut vertex disconnected (per cut vertex) are kept in bounded caches, so memory stays
+        flat however many pairs are requested. All of this lives in a `GraphContext`, which may also be shared
+        with `ShareKey` instances on the same graph.
+
+        Parameters
+        ----------
+        - Graph : ig.Graph
+            - Input graph (a DAG)
+        - tracer : Tracer
+            - Receives events, phase timings and counters (see `tracing`)
+        - cache_size : int
+            - Maximum number of dominator trees and of per cut vertex results kept in memory. Ignored if `context` is given.
+        - store : ResultStore
+            - Persistent store for the cut vertices and alternating paths of every pair
+        - context : GraphContext
+            - Precomputation on `Graph` to use instead of a new one
+        """
+        if context is not None and context.Graph is not Graph:
+            raise ValueError("The context belongs to a different graph.")
+        self.Graph = Graph
+        self.tracer = tracer
+        self.store = store
+        self.context = context if context is not None else GraphContext(Graph, cache_size)
+
+    @property
+    def topological_order(self):
+        return self.context.topological_order
+
+    def get_connect_bitsets(self):
+        """
+        Returns the connect sets of the whole graph as bitsets, computing them the first time they are needed.
+        """
+        self.context.check_graph()
+        return self.context.get_connect_bitsets()
+
+    def get_reachability_index(self):
+        """
+        Returns the `ReachabilityIndex` of the graph, building it the first time it is needed.
+        """
+        self.context.check_graph()
+        return self.context.get_reachability_index()
+
+    def reaches(self, source: int, target: int):
+        """
+        Returns True if there is a path from `source` to `target` (see `GraphContext.reaches`).
+        """
+        self.context.check_graph()
+        return self.context.reaches(source, target)
+
+    def stored(self, query: tuple, compute):
+        """
+        Returns `compute()`, going through the persistent store if there is one.
+        """
+        if self.store is None:
+            return compute()
+        return self.store.get(self.context.fingerprint(), query, compute)
+
+    def get_dominator_tree(self, source: int):
+        """
+        Returns the dominator tree rooted at `source`.
+        """
+        self.context.check_graph()
+        return self.context.get_dominator_tree(source)
+
+    def get_connect_bitsets_without(self, cut_vertex: int):
+        """
+        Returns the connect sets (as bitsets) of the graph with the edges of `cut_vertex` removed, see
+        `GraphContext.get_connect_bitsets_without`.
+        """
+        self.context.check_graph()
+        return self.context.get_connect_bitsets_without(cut_vertex)
+
+    def add_edges(self, edges):
+        """
+        Adds edges to `self.Graph` and updates the precomputation instead of starting over: the dominator trees of
+        the sources upstream of an edge are dropped and the connect sets of the vertices downstream of it are
+        recomputed. Edges that already exist are skipped.
+
+        Raises ValueError if an edge would create a cycle. The edges before it are still added.
+
+        Parameters
+        ----------
+        - edges : list
+            - (source, target) pairs
+        """
+        self.context.add_edges(edges)
+
+    def delete_edges(self, edges):
+        """
+        Deletes edges from `self.Graph` and updates the precomputation like `add_edges`.
+
+        Parameters
+        ----------
+        - edges : list
+            - (source, target) pairs
+        """
+        self.context.delete_edges(edges)
+
+    def add_vertices(self, n: int):
+        """
+        Adds `n` isolated vertices to `self.Graph`.
+        """
+        self.context.add_vertices(n)
+
+    def delete_vertices(self, vertices: list):
+        """
+        Deletes vertices from `self.Graph`. igraph renumbers the remaining vertices, so the precomputation starts over.
+        """
+        self.context.delete_vertices(vertices)
+
+    def get_cut_graph(self, cut_vertex: int):
+        """
+        Returns a `MaskedGraph` view of the graph with the edges of `cut_vertex` masked out (see `mask_cut_vertex`).
+        """
+        self.context.check_graph()
+        return self.context.get_cut_graph(cut_vertex)
+
+    def share_secret(self, source: int, target: int):
+        """
+        Returns a `ShareSecret` instance for `source` and `target` that uses the precomputation of this batch.
+        """
+        from .ShareSecret import ShareSecret     # imported here to avoid a circular import
+        return ShareSecret(self.Graph, source, target, tracer=self.tracer, batch=self)
+
+    @traced
+    def iter_alternating_paths(self, pairs: list=None, sources: list=None, targets: list=None, Graph_H: bool=False):
+        """
+        Yields the alternating path of every requested source/target pair as soon as it is computed. The graph is
+        checked for direct edits once, when the first pair is requested.
+
+        Parameters
+        ----------
+        - self : ShareSecretBatch
+            - The current class instance
+        - pairs : list
+            - Iterable of (source, target) tuples. May be a generator.
+        - sources : list
+            - Used when `pairs` is None: every pair of a vertex in `sources` and a vertex in `targets` is analysed
+        - targets : list
+            - Targets for `sources`. Defaults to every vertex the source can reach.
+        - Graph_H : bool
+            - If True, yield meta graph H with each path (see `ShareSecret.get_alternating_path`)
+
+        Yields
+        ------
+        - :tuple
+            - (source, target, P_alt) where P_alt is the result of `ShareSecret.get_alternating_path` for the pair
+        """
+        self.context.check_graph()
+        if pairs is None:
+            if sources is None:
+                raise ValueError("Either pairs or sources must be given.")
+            pairs = self._iter_pairs(sources, targets)
+        for source, target in pairs:
+            # the tracer of `traced` is only active while the generator is created
+            with use_tracer(self.tracer):
+                P_alt = self.share_secret(source, target)._get_alternating_path(Graph_H)
+            yield source, target, P_alt
+
+    def _iter_pairs(self, sources: list, targets: list):
+        """
+        Generates the pairs for `iter_alternating_paths`, grouped by source so each dominator tree is built once.
+        """
+        for source in sources:
+            if targets is None:
+                idom = self.context.get_dominator_tree(source)
+                source_targets = [v for v in self.topological_order if v != source and idom[v] is not None]
+            else:
+                source_targets = [t for t in targets if t != source]
+            for target in source_targets:
+                yield source, target
@@ -0,0 +1,96 @@
+import numpy as np
+
+class SourceCutMatrix:
+    def __init__(self, rows: list, columns: list):
+        """
+        The 0/1 matrix of potential sources (rows) and potential cut vertices (columns) used by
+        `ShareKey.does_scheme_exist`, stored as a packed bitmap with one bit per entry. Each row is packed
+        little-endian, so bit j % 8 of byte j // 8 is column j. This takes 1/64 of the memory of a float64 matrix,
+        and whether a column is covered by some row is computed with bitwise operations on whole bytes.
+
+        Parameters
+        ----------
+        - rows : list
+            - The potential sources, one per row
+        - columns : list
+            - The potential cut vertices, one per column
+        """
+        self.rows = list(rows)
+        self.columns = list(columns)
+        self.shape = (len(self.rows), len(self.columns))
+        self.bits = np.zeros((self.shape[0], -(-self.shape[1] // 8)), dtype=np.uint8)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def set_column(self, j: int, column):
+        """
+        Sets column `j` from a sequence of 0/1 (or bool) values, one per row.
+        """
+        self.bits[np.asarray(column, dtype=bool), j >> 3] |= np.uint8(1 << (j & 7))
+
+    def set_row(self, i: int, row):
+        """
+        Sets row `i` from a sequence of 0/1 (or bool) values, one per column.
+        """
+        self.bits[i] = np.packbits(np.asarray(row, dtype=bool), bitorder='little')
+
+    def column(self, j: int):
+        """
+        Returns column `j` as a bool array.
+        """
+        return (self.bits[:, j >> 3] >> (j & 7)) & 1 == 1
+
+    def row(self, i: int):
+        """
+        Returns row `i` as a bool array.
+        """
+        return np.unpackbits(self.bits[i], count=self.shape[1], bitorder='little').view(bool)
+
+    def row_bitset(self, i: int):
+        """
+        Returns row `i` as a Python int in which bit j is column j.
+        """
+        return int.from_bytes(self.bits[i].tobytes(), 'little')
+
+    def iter_rows(self):
+        """
+        Yields (source, row as a bool array) one row at a time, so the matrix is never unpacked as a whole.
+        """
+        for i, source in enumerate(self.rows):
+            yield source, self.row(i)
+
+    def column_coverage(self):
+        """
+        Returns a bool array with one entry per column. True if at least one row has a 1 in the column, i.e.,
+        some potential source keeps the vertex from learning the key.
+        """
+        union = np.bitwise_or.reduce(self.bits, axis=0) if self.shape[0] else np.zeros(self.bits.shape[1], dtype=np.uint8)
+        return np.unpackbits(union, count=self.shape[1], bitorder='little').view(bool)
+
+    def uncovered_columns(self):
+        """
+        Returns the vertices of the columns that no row covers.
+        """
+        return [self.columns[j] for j in np.flatnonzero(~self.column_coverage())]
+
+    def all_columns_covered(self):
+        """
+        Returns True if every column has a 1 in some row. This is the condition for a key dissemination scheme to exist.
+        """
+        return bool(self.column_coverage().all())
+
+    def to_dense(self, dtype=bool):
+        """
+        Unpacks the whole matrix into an array of shape `shape`. Only meant for small matrices.
+        """
+        return np.unpackbits(self.bits, axis=1, count=self.shape[1], bitorder='little').astype(dtype)
+
+    def __eq__(self, other):
+        if not isinstance(other, SourceCutMatrix):
+            return NotImplemented
+        return self.rows == other.rows and self.columns == other.columns and np.array_equal(self.bits, other.bits)
+
+    def __repr__(self):
+        return f"SourceCutMatrix({self.shape[0]} sources x {self.shape[1]} vertices, {self.nbytes} bytes)"
@@ -1,4 +1,16 @@
 # from .alt_path_primitive import *
 from .base_funcs import *
 from .ShareKey import ShareKey
-from .ShareSecret import ShareSecret
\ No newline at end of file
+from .SourceCutMatrix import SourceCutMatrix
+from .set_cover import greedy_set_cover, exact_set_cover
+from .ShareSecret import ShareSecret
+from .ShareSecretBatch import ShareSecretBatch
+from .CutVertexAnalysis import CutVertexAnalysis
+from .GraphContext import GraphContext
+from .LRUCache import LRUCache
+from .ReachabilityIndex import ReachabilityIndex
+from .ResultStore import ResultStore, graph_fingerprint
+from .QueryServer import QueryServer, run_server, send_query
+from .tracing import Tracer, NullTracer, LoggingTracer, CallbackTracer
+from .generators import random_dag, barabasi_albert_dag, watts_strogatz_dag, layered_dag, to_graph
+from .loaders import read_konect, read_graphml, read_gt, read_graph, orient_dag, load_graph, save_graph_cache, load_graph_cache
\ No newline at end of file
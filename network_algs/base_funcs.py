@@ -1,4 +1,8 @@
 import igraph as ig
+from .dominators import get_dominator_tree, cut_vertices_from_dominators
+from .tracing import get_tracer
+from .DisjointSet import DisjointSet
+from .MaskedGraph import count_igraph_calls, mask_cut_vertex
 
 def del_cut_edges(Graph: ig.Graph, cut_vertex: int):
     """
@@ -15,13 +19,18 @@ def del_cut_edges(Graph: ig.Graph, cut_vertex: int):
     -------
     G_tmp : ig.Graph
         Returns a copy of the input graph G with edges for `cut_vertex` removed.
+        Use `mask_cut_vertex` for a view that does not copy the graph.
     """
+    tracer = get_tracer()
+    tracer.count("graph_copies")
+    tracer.count("igraph_calls", 3)
     G_tmp = Graph.copy()
     in_cut = Graph.neighbors(cut_vertex, mode='in')
     out_cut = Graph.neighbors(cut_vertex, mode='out')
     rm_edges_in = [(i, cut_vertex) for i in in_cut]
     rm_edges_out = [(cut_vertex, i) for i in out_cut]
     rm_edges = rm_edges_in + rm_edges_out
+    tracer.count("igraph_calls")
     G_tmp.delete_edges(rm_edges)
     return G_tmp
 
@@ -46,19 +55,14 @@ def is_cut_vertex(Graph: ig.Graph, source: int, target: int, u: int):
     True if `u` is a cut vertex of `source` and `target`
     False if `u` is not a cut vertex of `source` and `target`
     """
-    G_tmp = Graph.copy()
-    G_tmp.delete_vertices(u)
-    # compensate for graph resizing
-    source_tmp = source - 1 if u < source else source
-    target_tmp = target - 1 if u < target else target
     if source == target:
          return False
-    elif G_tmp.vertex_connectivity(source_tmp, target_tmp, neighbors="negative") == 0 and \
-        Graph.vertex_connectivity(source, target, neighbors="negative") != 0:
-        return True
-    return False
+    # u is a cut vertex exactly when it strictly dominates the target in the dominator tree rooted at the source
+    with get_tracer().phase("cut_checks"):
+        idom = get_dominator_tree(Graph, source)
+        return u in cut_vertices_from_dominators(idom, source, target)
 
-def get_connect_sets(Graph: ig.Graph):
+def get_connect_sets(Graph: ig.Graph, bitsets: bool=False):
     """
     Creates a set for each vertex. These sets contain all of the vertices 
     that are connected to a specific vertex. For simplicity, the vertex 
@@ -68,21 +72,89 @@ def get_connect_sets(Graph: ig.Graph):
     ---------
     Graph: ig.Graph
         The current graph
+    bitsets: bool
+        If True, return each set packed into a Python int (see `get_connect_bitsets`)
     
     Return
     ------
     Connectivity_sets : list
+        A list of vertices in ascending order for each vertex, or one int per vertex if `bitsets` is True
     """
-    V_ordered = Graph.topological_sorting(mode='out')
-    NUM_V = Graph.vcount()
-    connectivity_sets = [[] for i in range(NUM_V)]
-    for i, vertex in enumerate(V_ordered):
-        connectivity_sets[vertex].append(vertex)                            # append vertex to its own set
-        for rest_v in V_ordered[i+1:]:                                      # iterate throw the rest of the vertices in front of the current one
-            if Graph.are_adjacent(vertex, rest_v):                          # check if current vertex is adjacent to another succeeding vertex
-                connectivity_sets[rest_v].extend(connectivity_sets[vertex]) # append set of current vertex to succeeding vertex, i.e., pass the set along
-        connectivity_sets[vertex] = list(set(connectivity_sets[vertex]))    # get rid of diplicates in sets
-    return connectivity_sets
+    connectivity_bitsets = get_connect_bitsets(Graph)
+    if bitsets:
+        return connectivity_bitsets
+    return [bitset_to_list(b) for b in connectivity_bitsets]
+
+def get_connect_bitsets(Graph: ig.Graph):
+    """
+    Same as `get_connect_sets` but each set is stored as a bitset, i.e., bit `v` of
+    `connectivity_bitsets[u]` is set if vertex `v` is connected to vertex `u`. The sets are 
+    built in topological order by OR-ing the sets of the incoming neighbours of each vertex.
+    
+    Paramters
+    ---------
+    Graph: ig.Graph
+        The current graph, or a MaskedGraph view of it
+    
+    Return
+    ------
+    connectivity_bitsets : list
+        A Python int for each vertex
+    """
+    tracer = get_tracer()
+    with tracer.phase("connect_sets"):
+        count_igraph_calls(Graph, 3)                        # a MaskedGraph counts the calls it passes on itself
+        V_ordered = Graph.topological_sorting(mode='out')
+        in_adjlist = Graph.get_adjlist(mode='in')
+        connectivity_bitsets = [0] * Graph.vcount()
+        propagate_connect_bitsets(connectivity_bitsets, in_adjlist, V_ordered)
+    return connectivity_bitsets
+
+def propagate_connect_bitsets(bitsets, in_adjlist: list, vertices, cut_vertex: int=None):
+    """
+    Recomputes the connect sets of `vertices` in place by OR-ing the sets of their incoming neighbours. Every
+    incoming neighbour of a vertex must either precede it in `vertices` or already have its final set, so
+    `vertices` is usually in topological order.
+
+    Parameters
+    ----------
+    bitsets : list
+        One bitset per vertex (see `get_connect_bitsets`), or any mapping from vertex to bitset
+    in_adjlist : list
+        Incoming neighbours of each vertex
+    vertices : iterable
+        The vertices whose sets are recomputed
+    cut_vertex : int
+        If given, the incoming and outgoing edges of this vertex are ignored (see `mask_cut_vertex`)
+    """
+    for vertex in vertices:
+        bits = 1 << vertex                                  # vertex is in its own set
+        if vertex != cut_vertex:
+            for in_v in in_adjlist[vertex]:
+                if in_v != cut_vertex:
+                    bits |= bitsets[in_v]                   # incoming neighbours precede vertex, so their sets are complete
+        bitsets[vertex] = bits
+
+def bitset_to_list(bits: int):
+    """
+    Returns the vertices in a bitset as a list in ascending order.
+
+    Parameters
+    ----------
+    bits: int
+        Bitset where bit `v` represents vertex `v`
+
+    Returns
+    -------
+    :list
+    """
+    vertices = []
+    while bits:
+        low = bits & -bits                              # isolate the lowest set bit
+        v = low.bit_length() - 1
+        vertices.append(v)
+        bits ^= low
+    return vertices
 
 def get_intersection_set_H_edges(Graph: ig.Graph, connectivity_sets: list, in_cut_source_target: list):
     """
@@ -106,17 +178,67 @@ def get_intersection_set_H_edges(Graph: ig.Graph, connectivity_sets: list, in_cu
     # Check for intersection bewtween vertex sets, also add edges between sets that intersect
     NUM_V = Graph.vcount()
     edges_H = []
+    seen_edges_H = set()
     intersection_sets = [[] for i in range(NUM_V)]
-    for i in in_cut_source_target:      # may be better to use enumerate
+    H_index = {}                        # vertex -> its first position in in_cut_source_target
+    for index, vertex in enumerate(in_cut_source_target):
+        H_index.setdefault(vertex, index)
+    for i in in_cut_source_target:
+        set_i = set(connectivity_sets[i])
         for j in in_cut_source_target:
-            intersect = intersection(connectivity_sets[i], connectivity_sets[j])
-            if len(intersect) > 0 and (i != j):
-                if (in_cut_source_target.index(j), in_cut_source_target.index(i)) not in edges_H:
-                    edges_H.append((in_cut_source_target.index(i), in_cut_source_target.index(j)))
+            if i == j:
+                continue
+            intersect = list(set_i.intersection(connectivity_sets[j]))
+            if len(intersect) > 0:
+                if (H_index[j], H_index[i]) not in seen_edges_H:
+                    edges_H.append((H_index[i], H_index[j]))
+                    seen_edges_H.add((H_index[i], H_index[j]))
                 intersection_sets[i].append((j, intersect))
 
     return intersection_sets, edges_H
 
+def H_path_exists(connectivity_sets: list, in_cut_source_target: list, source: int, target: int):
+    """
+    Checks if the source and target are connected in meta graph H without building H. Every vertex of the graph
+    points to the first H vertex whose connect set contains it, and each later H vertex containing it is joined
+    to that one with a disjoint-set structure. Stops as soon as the source and target are joined.
+    
+    Parameters
+    ----------
+    connectivity_sets : list
+        List of connect sets
+    in_cut_source_target : list
+        List with source + incoming vertices to cut vertex + destination/target
+    source : int
+        Number of source vertex
+    target : int
+        Number of target vertex
+    
+    Returns
+    -------
+    :bool
+        True if there is a path between the source and target in H, False otherwise.
+    """
+    H_index = {}
+    for index, vertex in enumerate(in_cut_source_target):
+        H_index.setdefault(vertex, index)
+    source_H, target_H = H_index[source], H_index[target]
+    if source_H == target_H:
+        return True
+
+    components = DisjointSet(len(in_cut_source_target))
+    owner = {}                          # vertex of the graph -> first H vertex whose connect set contains it
+    for vertex in in_cut_source_target:
+        index = H_index[vertex]
+        for member in connectivity_sets[vertex]:
+            if member in owner:
+                components.union(owner[member], index)
+            else:
+                owner[member] = index
+        if components.connected(source_H, target_H):
+            return True
+    return False
+
 def alt_path_exists(Graph: ig.Graph, source, target, cut_vertex):
     """
     Given a graph, source, target and cut vertex, determine if an alternating path exists. In other words check if the
@@ -139,16 +261,15 @@ def alt_path_exists(Graph: ig.Graph, source, target, cut_vertex):
         True if there is an alternating path, False otherwise.
     """
     
-    P_alt_exists = False
-    
     # First check if u is a cut vertex or if source and target are connected
     # if (not _is_cut_vertex(G, source, target, cut_vertex)) or G.vertex_connectivity(source, target, neighbors="ignore") == 0:
     #     return P_alt_exists
     
     NUM_V = Graph.vcount()
-    G_tmp = del_cut_edges(Graph, cut_vertex)
+    G_tmp = mask_cut_vertex(Graph, cut_vertex)     # view of the graph with the cut vertex disconnected, no copy
     
     # add the target to list containing vertices in-coming to the cut vertex
+    count_igraph_calls(Graph)
     in_cut_target = Graph.neighbors(cut_vertex, mode='in')
     in_cut_target.append(target)
     
@@ -158,17 +279,10 @@ def alt_path_exists(Graph: ig.Graph, source, target, cut_vertex):
          in_cut_target.append(source)
     Connectivity_sets = get_connect_sets(G_tmp)
     
-    # Check for intersection bewtween vertex sets, also add edges between sets that intersect
-    Intersection_sets, edges_H = get_intersection_set_H_edges(Graph, Connectivity_sets, in_cut_target)
-    
-    # Now that we have intersection sets, make a meta graph H and find a path
-    num_vertices_H = len(in_cut_target)
-    H = ig.Graph(num_vertices_H, edges_H, directed=False)
-    
-    # Get a shortest path in the graph H.
-    P_alt_H = H.get_shortest_paths(in_cut_target.index(source), in_cut_target.index(target))[0]
-    if len(P_alt_H) > 0:
-        P_alt_exists = True
+    tracer = get_tracer()
+    with tracer.phase("H_construction"):
+        # Join intersecting connect sets until the source and target meet, which is a path in meta graph H
+        P_alt_exists = H_path_exists(Connectivity_sets, in_cut_target, source, target)
     
     return P_alt_exists
     
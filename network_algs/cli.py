@@ -0,0 +1,217 @@
+"""
+Headless command-line entry points, run with `python -m network_algs`.
+
+Usage
+-----
+    python -m network_algs run jobs.jsonl --output results.jsonl --workers 4
+    cat jobs.jsonl | python -m network_algs run - > results.jsonl
+    python -m network_algs serve --socket /tmp/keys.sock --graph jung=out.subelj_jung-j_jung-j
+
+`run` reads one job per line. A job names a graph file (see `load_graph`) or gives the graph inline, and either
+targets for `ShareKey` or a source and target for `ShareSecret`:
+
+    {"id": 1, "graph": "out.subelj_jung-j_jung-j", "orientation": "degree", "targets": [5, 9]}
+    {"id": 2, "graph": "out.subelj_jung-j_jung-j", "source": 0, "target": 9, "query": "cut_vertices"}
+    {"id": 3, "num_vertices": 4, "edges": [[0, 1], [1, 2], [0, 3], [3, 2]], "source": 0, "target": 2}
+
+"query" defaults to "does_scheme_exist" for targets and to "alternating_path" for a source and target (see
+`QUERIES`). One result is written per job as soon as it completes, so results can be out of order:
+
+    {"id": 1, "ok": true, "result": true, "load_seconds": 0.01, "run_seconds": 0.52}
+
+`serve` starts a `QueryServer`.
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import igraph as ig
+from .LRUCache import LRUCache
+from .ResultStore import ResultStore
+from .ShareKey import ShareKey
+from .ShareSecretBatch import ShareSecretBatch
+from .QueryServer import run_server
+from .loaders import load_graph
+
+# query -> whether it needs "targets" (ShareKey) rather than "source" and "target" (ShareSecret)
+QUERIES = {
+    "does_scheme_exist": True,
+    "min_source_set": True,
+    "cut_vertices": False,
+    "alternating_path": False,
+    "alternating_paths": False,
+}
+
+# graphs loaded by this process, kept for later jobs on the same graph: key -> (Graph, ShareSecretBatch)
+_graphs = LRUCache(4)
+_store = None
+
+def _init_worker(store_path: str):
+    global _store
+    _store = ResultStore(store_path) if store_path is not None else None
+
+def _get_graph(job: dict):
+    """
+    Returns the graph of a job and the `ShareSecretBatch` shared by the jobs on it. The `ShareKey` jobs use the
+    `GraphContext` of the batch.
+    """
+    if "graph" in job:
+        key = (job["graph"], job.get("orientation", "index"), job.get("seed"))
+    else:
+        key = (job["num_vertices"], tuple(map(tuple, job["edges"])))
+
+    def load():
+        if "graph" in job:
+            Graph = load_graph(*key).to_graph()
+        else:
+            Graph = ig.Graph(job["num_vertices"], [tuple(edge) for edge in job["edges"]], directed=True)
+        return Graph, ShareSecretBatch(Graph, store=_store)
+    return _graphs.get(key, load)
+
+def run_job(job: dict):
+    """
+    Runs a single job (see the module docstring) and returns its result.
+
+    Returns
+    -------
+    - :dict
+        - {"id", "ok", "result", "load_seconds", "run_seconds"}, or {"id", "ok", "error"} if the job failed
+    """
+    try:
+        query = job.get("query", "does_scheme_exist" if "targets" in job else "alternating_path")
+        if query not in QUERIES:
+            raise ValueError(f"Unknown query {query!r}.")
+        start = time.perf_counter()
+        Graph, batch = _get_graph(job)
+        loaded = time.perf_counter()
+
+        if QUERIES[query]:
+            share_key = ShareKey(Graph, job["targets"], store=_store, context=batch.context)
+            result = share_key.does_scheme_exist() if query == "does_scheme_exist" else share_key.get_min_source_set(exact=job.get("exact", False))
+        else:
+            share_secret = batch.share_secret(job["source"], job["target"])
+            if query == "cut_vertices":
+                result = share_secret.get_cut_vertices()
+            elif query == "alternating_path":
+                result = share_secret.get_alternating_path()
+            else:
+                # JSON object keys are strings, so the paths are written as [cut vertex, path] pairs
+                result = [[cut_vertex, path] for cut_vertex, path in share_secret.get_alternating_paths().items()]
+        done = time.perf_counter()
+    except KeyError as error:
+        return {"id": job.get("id"), "ok": False, "error": f"Missing field {error} in job."}
+    except Exception as error:
+        return {"id": job.get("id"), "ok": False, "error": f"{type(error).__name__}: {error}"}
+    return {"id": job.get("id"), "ok": True, "result": result, "load_seconds": loaded - start, "run_seconds": done - loaded}
+
+def _read_jobs(lines):
+    """
+    Parses the job lines. A line that is not a JSON object becomes a failed result instead of a job.
+
+    Yields
+    ------
+    - :tuple
+        - (job, None) or (None, result)
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError("A job must be a JSON object.")
+        except ValueError as error:
+            yield None, {"id": None, "ok": False, "error": f"Invalid job on line {number}: {error}"}
+            continue
+        yield job, None
+
+def run_jobs(lines, output, workers: int=1, store_path: str=None):
+    """
+    Runs the jobs in `lines` and writes one JSON result per line to `output` as each job completes. With several
+    workers, at most a few jobs per worker are in flight, so the input can be an unbounded stream.
+
+    Parameters
+    ----------
+    - lines : iterable
+        - Lines of JSON jobs, e.g. an open file
+    - output : file
+        - Text stream the results are written to
+    - workers : int
+        - Number of worker processes. 1 runs the jobs in this process.
+    - store_path : str
+        - Path of a `ResultStore` shared by the workers, or None
+
+    Returns
+    -------
+    - :int
+        - The number of failed jobs
+    """
+    failed = 0
+
+    def write(result: dict):
+        nonlocal failed
+        failed += not result["ok"]
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+
+    if workers <= 1:
+        _init_worker(store_path)
+        for job, result in _read_jobs(lines):
+            write(result if job is None else run_job(job))
+        return failed
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(store_path,)) as executor:
+        pending = set()
+        for job, result in _read_jobs(lines):
+            if job is None:
+                write(result)
+                continue
+            pending.add(executor.submit(run_job, job))
+            if len(pending) >= 4 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+        for future in wait(pending).done:
+            write(future.result())
+    return failed
+
+def main(argv: list=None):
+    parser = argparse.ArgumentParser(prog="python -m network_algs", description="Key dissemination and secret sharing analyses.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run a JSONL stream of jobs and write JSONL results")
+    run.add_argument("jobs", help="file with one JSON job per line, or - for standard input")
+    run.add_argument("-o", "--output", default="-", help="file for the results, or - for standard output (default)")
+    run.add_argument("-w", "--workers", type=int, default=1, help="number of worker processes (default 1)")
+    run.add_argument("--store", default=None, help="path of a result store shared by the workers")
+
+    serve = commands.add_parser("serve", help="start a query server, see QueryServer")
+    serve.add_argument("--socket", default=None, help="Unix socket path. Without it, listen on --host and --port.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--graph", action="append", default=[], metavar="NAME=PATH", help="graph to load at startup (repeatable)")
+    serve.add_argument("--max-graphs", type=int, default=8)
+    serve.add_argument("--idle-timeout", type=float, default=600)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        graphs = dict(graph.split("=", 1) for graph in args.graph)
+        try:
+            run_server(args.socket, args.host, args.port, graphs, max_graphs=args.max_graphs, idle_timeout=args.idle_timeout)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    jobs = sys.stdin if args.jobs == "-" else open(args.jobs)
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        failed = run_jobs(jobs, output, args.workers, args.store)
+    finally:
+        if jobs is not sys.stdin:
+            jobs.close()
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failed else 0
@@ -0,0 +1,201 @@
+import igraph as ig
+import numpy as np
+
+def _get_rng(seed):
+    """
+    Returns a NumPy generator. `seed` may be None, an int or an existing np.random.Generator.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+def _skip_sample(num_pairs: int, p: float, rng: np.random.Generator):
+    """
+    Selects each index in range(num_pairs) independently with probability p. Instead of drawing one
+    random number per index, the gaps between selected indices are drawn from a geometric distribution,
+    so the cost is proportional to the number of selected indices.
+
+    Returns
+    -------
+    indices : np.ndarray
+        Sorted int64 array of the selected indices
+    """
+    if num_pairs <= 0 or p <= 0:
+        return np.empty(0, dtype=np.int64)
+    if p >= 1:
+        return np.arange(num_pairs, dtype=np.int64)
+
+    expected = num_pairs * p
+    batch = int(expected + 5 * np.sqrt(expected) + 16)
+    chunks = []
+    position = -1
+    while True:
+        indices = position + np.cumsum(rng.geometric(p, size=batch), dtype=np.int64)
+        chunks.append(indices[indices < num_pairs])
+        if indices[-1] >= num_pairs:
+            break
+        position = indices[-1]
+    return np.concatenate(chunks)
+
+def _upper_triangle_pairs(NUM_V: int, indices: np.ndarray):
+    """
+    Maps indices of the strict upper triangle of an NUM_V x NUM_V matrix, numbered row by row, to (i, j) pairs with i < j.
+    """
+    k = indices.astype(np.float64)
+    b = 2 * NUM_V - 1
+    i = np.floor((b - np.sqrt(np.maximum(b * b - 8 * k, 0))) / 2).astype(np.int64)
+    # correct for floating point error in the square root
+    offset = i * NUM_V - i * (i + 1) // 2
+    i = np.where(offset > indices, i - 1, i)
+    next_offset = (i + 1) * NUM_V - (i + 1) * (i + 2) // 2
+    i = np.where(next_offset <= indices, i + 1, i)
+    offset = i * NUM_V - i * (i + 1) // 2
+    j = indices - offset + i + 1
+    return np.column_stack((i, j))
+
+def random_dag(NUM_V: int, p: float=0.5, seed=None):
+    """
+    Random DAG where each pair (i, j), i < j, is an edge i -> j with probability p. Same distribution as
+    `gen_DAG` in `alt_path_primitive`, but the cost is O(V + E) instead of O(V^2).
+
+    Parameters
+    ----------
+    NUM_V : int
+        The number of vertices in the graph.
+    p : float
+        The probability of connecting two vertices (v1, v2) where v2 is of higher topological order.
+    seed : int or np.random.Generator
+        Seed for reproducibility
+
+    Returns
+    -------
+    edges : np.ndarray
+        int64 array of shape (E, 2), ready for `ig.Graph(NUM_V, edges, directed=True)`
+    """
+    rng = _get_rng(seed)
+    indices = _skip_sample(NUM_V * (NUM_V - 1) // 2, p, rng)
+    return _upper_triangle_pairs(NUM_V, indices)
+
+def barabasi_albert_dag(NUM_V: int, m: int=2, seed=None):
+    """
+    Barabasi-Albert preferential attachment graph oriented as a DAG. Vertices arrive in order 0, 1, 2, ...
+    and each new vertex attaches to up to `m` earlier vertices chosen with probability proportional to their
+    degree. Edges point from the earlier vertex to the new one. Repeated choices are merged, so a vertex can
+    end up with fewer than `m` incoming edges.
+
+    Every endpoint choice is a uniformly random earlier edge slot. All choices are drawn at once and resolved
+    by pointer jumping, so there is no per-vertex Python loop.
+
+    Parameters
+    ----------
+    NUM_V : int
+        The number of vertices in the graph.
+    m : int
+        Number of edges added with each new vertex
+    seed : int or np.random.Generator
+        Seed for reproducibility
+
+    Returns
+    -------
+    edges : np.ndarray
+        int64 array of shape (E, 2), ready for `ig.Graph(NUM_V, edges, directed=True)`
+    """
+    rng = _get_rng(seed)
+    if NUM_V < 2 or m < 1:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # vertex 1 attaches to vertex 0, vertex v >= 2 adds min(m, v) edges
+    new_vertices = np.arange(2, NUM_V, dtype=np.int64)
+    edges_per_vertex = np.minimum(m, new_vertices)
+    new_endpoint = np.concatenate(([1], np.repeat(new_vertices, edges_per_vertex)))
+    NUM_E = len(new_endpoint)
+    first_edge = np.searchsorted(new_endpoint, new_endpoint, side='left')
+
+    # slot 2e holds the new vertex of edge e, slot 2e+1 the old vertex. The old vertex is copied from a
+    # uniformly random slot of the edges added before the new vertex arrived.
+    pointer = np.arange(2 * NUM_E, dtype=np.int64)
+    value = np.full(2 * NUM_E, -1, dtype=np.int64)
+    value[0::2] = new_endpoint
+    value[1] = 0
+    choices = np.floor(rng.random(NUM_E - 1) * (2 * first_edge[1:])).astype(np.int64)
+    pointer[3::2] = choices
+    while True:
+        unresolved = value[pointer] < 0
+        if not unresolved.any():
+            break
+        pointer[unresolved] = pointer[pointer[unresolved]]
+    old_endpoint = value[pointer[1::2]]
+
+    edges = np.unique(np.column_stack((old_endpoint, new_endpoint)), axis=0)
+    return edges
+
+def watts_strogatz_dag(NUM_V: int, k: int=4, p: float=0.1, seed=None):
+    """
+    Watts-Strogatz small-world graph oriented as a DAG. Starts from a ring lattice where every vertex is
+    joined to its `k // 2` nearest neighbours on each side, rewires the far endpoint of each edge with
+    probability p and orients every edge from the lower to the higher vertex number. Self-loops and repeated
+    edges created by rewiring are dropped.
+
+    Parameters
+    ----------
+    NUM_V : int
+        The number of vertices in the graph.
+    k : int
+        Degree of each vertex in the ring lattice
+    p : float
+        Rewiring probability
+    seed : int or np.random.Generator
+        Seed for reproducibility
+
+    Returns
+    -------
+    edges : np.ndarray
+        int64 array of shape (E, 2), ready for `ig.Graph(NUM_V, edges, directed=True)`
+    """
+    rng = _get_rng(seed)
+    half = k // 2
+    if NUM_V < 2 or half < 1:
+        return np.empty((0, 2), dtype=np.int64)
+
+    near = np.repeat(np.arange(NUM_V, dtype=np.int64), half)
+    far = (near + np.tile(np.arange(1, half + 1, dtype=np.int64), NUM_V)) % NUM_V
+    rewire = rng.random(len(far)) < p
+    far[rewire] = rng.integers(0, NUM_V, size=int(rewire.sum()))
+
+    keep = near != far
+    edges = np.column_stack((np.minimum(near, far)[keep], np.maximum(near, far)[keep]))
+    return np.unique(edges, axis=0)
+
+def layered_dag(layer_sizes: list, p: float=0.5, seed=None):
+    """
+    Layered DAG. Vertices are numbered layer by layer and each pair (v1, v2) with v1 in layer l and v2 in
+    layer l + 1 is an edge v1 -> v2 with probability p.
+
+    Parameters
+    ----------
+    layer_sizes : list
+        Number of vertices in each layer
+    p : float
+        The probability of connecting two vertices in consecutive layers
+    seed : int or np.random.Generator
+        Seed for reproducibility
+
+    Returns
+    -------
+    edges : np.ndarray
+        int64 array of shape (E, 2), ready for `ig.Graph(sum(layer_sizes), edges, directed=True)`
+    """
+    rng = _get_rng(seed)
+    offsets = np.concatenate(([0], np.cumsum(layer_sizes)))
+    blocks = [np.empty((0, 2), dtype=np.int64)]
+    for l in range(len(layer_sizes) - 1):
+        size_in, size_out = layer_sizes[l], layer_sizes[l + 1]
+        indices = _skip_sample(size_in * size_out, p, rng)
+        blocks.append(np.column_stack((offsets[l] + indices // size_out, offsets[l + 1] + indices % size_out)))
+    return np.concatenate(blocks).astype(np.int64)
+
+def to_graph(NUM_V: int, edges: np.ndarray):
+    """
+    Builds a directed `ig.Graph` from an edge array returned by one of the generators.
+    """
+    return ig.Graph(NUM_V, edges, directed=True)
@@ -0,0 +1,299 @@
+import array
+import bz2
+import gzip
+import lzma
+import os
+import xml.etree.ElementTree as ET
+import numpy as np
+from .CSRGraph import CSRGraph
+from .generators import _get_rng
+
+ORIENTATIONS = ("index", "degree", "random", "keep")
+CACHE_MAGIC = b"NACSR001"
+CACHE_HEADER_BYTES = len(CACHE_MAGIC) + 16     # magic, NUM_V and NUM_E as uint64
+GT_MAGIC = b"\xe2\x9b\xbe gt"
+
+def _open(path: str, mode: str='rb'):
+    """
+    Opens a file, decompressing it on the fly if its name ends in .gz, .bz2, .xz or .zst.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    if path.endswith(".bz2"):
+        return bz2.open(path, mode)
+    if path.endswith(".xz"):
+        return lzma.open(path, mode)
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("Reading .zst files requires the zstandard package.") from e
+        return zstandard.open(path, mode)
+    return open(path, mode)
+
+def read_konect(path: str):
+    """
+    Reads a KONECT edge list (the `out.*` TSV files). Lines starting with % are comments, the first two columns
+    of every other line are the endpoints of an edge and further columns (weights, timestamps) are ignored.
+    KONECT numbers vertices from 1, so vertex k of the file becomes vertex k - 1. Bipartite files (header
+    `% bip ...`) number the two sides independently, so the right-hand vertices are placed after the largest
+    left-hand vertex.
+
+    The file is parsed by NumPy's C reader in chunks, so no Python object is created per edge.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, optionally compressed (.gz, .bz2, .xz, .zst)
+
+    Returns
+    -------
+    NUM_V : int
+        The number of vertices (the largest vertex number in the file, or the sum of the largest numbers on
+        either side for bipartite files)
+    edges : np.ndarray
+        int64 array of shape (E, 2). Edges are as listed in the file and not yet oriented (see `orient_dag`).
+    """
+    with _open(path, "rt") as f:
+        header = f.readline()
+        bipartite = header.startswith("%") and header[1:].split()[:1] == ["bip"]
+        if not header.startswith("%"):
+            f.seek(0)
+        edges = np.loadtxt(f, dtype=np.int64, comments="%", usecols=(0, 1), ndmin=2)
+    if not len(edges):
+        return 0, edges.reshape(0, 2)
+    if edges.min() < 1:
+        raise ValueError(f"{path}: KONECT vertex numbers start at 1.")
+    if bipartite:
+        edges[:, 1] += edges[:, 0].max()
+    return int(edges.max()), edges - 1
+
+def read_graphml(path: str):
+    """
+    Reads the structure of a GraphML file with a streaming XML parser. Vertices are numbered in the order their
+    ids first appear, which is the order of the <node> elements in files that list the nodes before the edges.
+    Attributes are ignored.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, optionally compressed (.gz, .bz2, .xz, .zst)
+
+    Returns
+    -------
+    NUM_V : int
+        The number of vertices
+    edges : np.ndarray
+        int64 array of shape (E, 2), not yet oriented (see `orient_dag`)
+    """
+    index = {}      # vertex id -> vertex number
+    sources, targets = array.array("q"), array.array("q")
+    with _open(path, "rb") as f:
+        for _, element in ET.iterparse(f, events=("end",)):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag == "node":
+                index.setdefault(element.get("id"), len(index))
+            elif tag == "edge":
+                sources.append(index.setdefault(element.get("source"), len(index)))
+                targets.append(index.setdefault(element.get("target"), len(index)))
+            else:
+                continue
+            element.clear()     # keeps memory flat on large files
+    edges = np.column_stack((np.frombuffer(sources, dtype=np.int64), np.frombuffer(targets, dtype=np.int64)))
+    return len(index), edges
+
+def read_gt(path: str):
+    """
+    Reads the structure of a graph-tool binary file (.gt), the format of the Netzschleuder catalogue. Only the
+    adjacency list is read, property maps are ignored.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, optionally compressed (.gz, .bz2, .xz, .zst)
+
+    Returns
+    -------
+    NUM_V : int
+        The number of vertices
+    edges : np.ndarray
+        int64 array of shape (E, 2), not yet oriented (see `orient_dag`)
+    """
+    with _open(path, "rb") as f:
+        data = f.read()
+    if data[:len(GT_MAGIC)] != GT_MAGIC:
+        raise ValueError(f"{path} is not a graph-tool binary file.")
+    position = len(GT_MAGIC) + 1                            # skip the format version
+    byteorder = "big" if data[position] else "little"
+    position += 1
+    comment_length = int.from_bytes(data[position:position + 8], byteorder)
+    position += 8 + comment_length + 1                      # skip the comment and the directed flag
+    NUM_V = int.from_bytes(data[position:position + 8], byteorder)
+    position += 8
+
+    # vertex numbers are stored in the smallest unsigned type whose range exceeds the number of vertices
+    width = next(w for w, bits in ((1, 8), (2, 16), (4, 32), (8, 64)) if NUM_V < 2 ** bits)
+    dtype = np.dtype(f"u{width}").newbyteorder("<" if byteorder == "little" else ">")
+
+    # each vertex is stored as its out-degree (uint64) followed by its out-neighbours
+    starts = np.empty(NUM_V, dtype=np.int64)
+    degrees = np.empty(NUM_V, dtype=np.int64)
+    for v in range(NUM_V):
+        degree = int.from_bytes(data[position:position + 8], byteorder)
+        starts[v] = position + 8
+        degrees[v] = degree
+        position += 8 + degree * width
+
+    buffer = np.frombuffer(data, dtype=np.uint8, count=position)
+    byte_positions = np.repeat(starts - (np.cumsum(degrees) - degrees) * width, degrees) + np.arange(int(degrees.sum())) * width
+    neighbours = buffer[byte_positions[:, None] + np.arange(width)].copy().view(dtype).ravel()
+    edges = np.column_stack((np.repeat(np.arange(NUM_V, dtype=np.int64), degrees), neighbours.astype(np.int64)))
+    return NUM_V, edges
+
+def read_graph(path: str):
+    """
+    Reads a graph file, choosing the format from its name: GraphML (.graphml), graph-tool (.gt) or a KONECT
+    edge list (anything else). Compression suffixes are allowed.
+
+    Returns
+    -------
+    NUM_V : int
+        The number of vertices
+    edges : np.ndarray
+        int64 array of shape (E, 2), not yet oriented (see `orient_dag`)
+    """
+    name = path
+    for suffix in (".gz", ".bz2", ".xz", ".zst"):
+        name = name.removesuffix(suffix)
+    if name.endswith(".graphml"):
+        return read_graphml(path)
+    if name.endswith(".gt"):
+        return read_gt(path)
+    return read_konect(path)
+
+def orient_dag(NUM_V: int, edges: np.ndarray, rule: str="index", seed=None):
+    """
+    Turns a graph into a DAG by giving every edge a direction. Every rule ranks the vertices and points each
+    edge from its lower ranked to its higher ranked endpoint. Self-loops and repeated edges are dropped.
+
+    Parameters
+    ----------
+    NUM_V : int
+        The number of vertices
+    edges : np.ndarray
+        Integer array of shape (E, 2)
+    rule : str
+        - "index": rank by vertex number
+        - "degree": rank by degree, so edges point towards hubs. Ties are broken by vertex number.
+        - "random": rank by a random permutation drawn from `seed`
+        - "keep": keep the direction of every edge. Raises ValueError if the graph has a cycle.
+    seed : int or np.random.Generator
+        Seed for the "random" rule
+
+    Returns
+    -------
+    edges : np.ndarray
+        int64 array of shape (E', 2) sorted by source and then target
+    """
+    if rule not in ORIENTATIONS:
+        raise ValueError(f"Unknown orientation rule {rule!r}, expected one of {ORIENTATIONS}.")
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    sources, targets = edges[:, 0], edges[:, 1]
+    keep = sources != targets
+    sources, targets = sources[keep], targets[keep]
+
+    if rule != "keep":
+        if rule == "index":
+            rank = np.arange(NUM_V, dtype=np.int64)
+        else:
+            if rule == "degree":
+                degree = np.bincount(sources, minlength=NUM_V) + np.bincount(targets, minlength=NUM_V)
+                order = np.lexsort((np.arange(NUM_V), degree))
+            else:
+                order = _get_rng(seed).permutation(NUM_V)
+            rank = np.empty(NUM_V, dtype=np.int64)
+            rank[order] = np.arange(NUM_V)
+        swap = rank[sources] > rank[targets]
+        sources, targets = np.where(swap, targets, sources), np.where(swap, sources, targets)
+
+    keys = np.unique(sources * NUM_V + targets)     # sorts and drops repeated edges in one step
+    edges = np.column_stack((keys // NUM_V, keys % NUM_V)) if NUM_V else edges[:0]
+    if rule == "keep":
+        CSRGraph(NUM_V, edges).layers()     # raises ValueError if there is a cycle
+    return edges
+
+def save_graph_cache(path: str, csr: CSRGraph):
+    """
+    Writes the CSR arrays and the topological order of a graph to a binary file that `load_graph_cache` can
+    memory-map. The file holds an 8 byte magic string, the number of vertices and edges as uint64, and then
+    out_indptr, out_indices, in_indptr, in_indices and the topological order as little-endian int64 arrays.
+    The file is written to a temporary name first, so a partially written cache is never read.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(CACHE_MAGIC)
+        f.write(np.array([csr.NUM_V, csr.NUM_E], dtype="<u8").tobytes())
+        for arr in (csr.out_indptr, csr.out_indices, csr.in_indptr, csr.in_indices, csr.topological_sorting()):
+            np.asarray(arr, dtype="<i8").tofile(f)
+    os.replace(tmp_path, path)
+
+def load_graph_cache(path: str, mmap: bool=True):
+    """
+    Loads a graph written by `save_graph_cache`. With `mmap` the arrays are memory-mapped read-only, so loading
+    takes constant time and pages are read from disk when they are first used.
+
+    Returns
+    -------
+    :CSRGraph
+    """
+    with open(path, "rb") as f:
+        header = f.read(CACHE_HEADER_BYTES)
+    if header[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+        raise ValueError(f"{path} is not a graph cache file.")
+    NUM_V, NUM_E = (int(n) for n in np.frombuffer(header, dtype="<u8", offset=len(CACHE_MAGIC)))
+    count = 3 * NUM_V + 2 * NUM_E + 2
+    if mmap:
+        data = np.memmap(path, dtype="<i8", mode="r", offset=CACHE_HEADER_BYTES, shape=(count,))
+    else:
+        data = np.fromfile(path, dtype="<i8", offset=CACHE_HEADER_BYTES, count=count)
+    bounds = np.cumsum([0, NUM_V + 1, NUM_E, NUM_V + 1, NUM_E, NUM_V])
+    out_indptr, out_indices, in_indptr, in_indices, topological_order = (data[a:b] for a, b in zip(bounds[:-1], bounds[1:]))
+    return CSRGraph.from_arrays(NUM_V, out_indptr, out_indices, in_indptr, in_indices, topological_order)
+
+def load_graph(path: str, orientation: str="index", seed=None, cache: bool=True):
+    """
+    Loads a KONECT, GraphML or graph-tool file (see `read_graph`) as a DAG oriented by `orientation` (see
+    `orient_dag`). The result is cached next to the file as `<path>.<orientation>.csr` and later calls
+    memory-map the cache instead of parsing the file again, as long as the cache is newer than the file.
+    The "random" orientation is only cached when a seed is given.
+
+    Use `CSRGraph.to_graph()` to get an `ig.Graph` for `ShareKey` and `ShareSecret`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the graph file
+    orientation : str
+        Orientation rule, see `orient_dag`
+    seed : int
+        Seed for the "random" orientation
+    cache : bool
+        If False, neither read nor write the cache
+
+    Returns
+    -------
+    :CSRGraph
+    """
+    if orientation == "random":
+        cache = cache and seed is not None
+        cache_path = f"{path}.random{seed}.csr"
+    else:
+        cache_path = f"{path}.{orientation}.csr"
+    if cache and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(path):
+        return load_graph_cache(cache_path)
+
+    NUM_V, edges = read_graph(path)
+    csr = CSRGraph(NUM_V, orient_dag(NUM_V, edges, orientation, seed))
+    if cache:
+        save_graph_cache(cache_path, csr)
+    return csr
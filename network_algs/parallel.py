@@ -0,0 +1,136 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import igraph as ig
+import numpy as np
+from .SourceCutMatrix import SourceCutMatrix
+
+# ShareKey instance of the current worker process, built once by `_init_worker`
+_worker_share_key = None
+
+def _init_worker(shm_name: str, NUM_V: int, NUM_E: int, targets: list):
+    """
+    Rebuilds the graph in a worker process from the edge array in shared memory.
+    """
+    global _worker_share_key
+    from .ShareKey import ShareKey     # imported here to avoid a circular import
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        edges = np.ndarray((NUM_E, 2), dtype=np.int64, buffer=shm.buf)
+        Graph = ig.Graph(NUM_V, edges.tolist(), directed=True)
+    finally:
+        shm.close()
+    _worker_share_key = ShareKey(Graph, targets)
+
+def _evaluate_columns(columns: list, V_potential_sources: list):
+    """
+    Evaluates the given columns of the source/cut matrix in a worker process. Each column is returned packed into bits.
+    """
+    return [np.packbits(np.asarray(_worker_share_key._get_m_SU_column(u, V_potential_sources), dtype=bool), bitorder='little')
+            for u in columns]
+
+def _find_protecting_sources(columns: list, V_potential_sources: list):
+    """
+    Finds a protecting source for each of the given columns in a worker process.
+    """
+    return [_worker_share_key._find_protecting_source(u, V_potential_sources) for u in columns]
+
+@contextmanager
+def _share_graph_with_pool(Graph: ig.Graph, targets: list, workers: int):
+    """
+    Places the edge array of `Graph` in shared memory and yields a process pool whose workers rebuild it once.
+    """
+    NUM_V = Graph.vcount()
+    NUM_E = Graph.ecount()
+    edge_array = np.array(Graph.get_edgelist(), dtype=np.int64).reshape(NUM_E, 2)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, edge_array.nbytes))
+    try:
+        np.ndarray(edge_array.shape, dtype=np.int64, buffer=shm.buf)[:] = edge_array
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, NUM_V, NUM_E, list(targets))) as executor:
+            yield executor
+    finally:
+        shm.close()
+        shm.unlink()
+
+def _chunk(columns: list, workers: int, chunk_size: int=None):
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(columns) // (4 * workers)))
+    return [columns[i:i + chunk_size] for i in range(0, len(columns), chunk_size)]
+
+def get_m_SU_parallel(Graph: ig.Graph, targets: list, V_potential_sources: list, V_no_targets: list, workers: int, chunk_size: int=None):
+    """
+    Fills the matrix of potential sources and potential cut vertices used by `ShareKey.does_scheme_exist` with a
+    process pool. Columns are sharded across the workers, which receive the graph once as an edge array in
+    shared memory.
+
+    Parameters
+    ----------
+    Graph : ig.Graph
+        Input graph
+    targets : list
+        The target vertices
+    V_potential_sources : list
+        Vertices associated with the rows of the matrix
+    V_no_targets : list
+        Vertices associated with the columns of the matrix
+    workers : int
+        Number of worker processes
+    chunk_size : int
+        Number of columns per task. Defaults to an even split into four tasks per worker.
+
+    Returns
+    -------
+    m_SU : SourceCutMatrix
+        Packed 0/1 matrix of shape (len(V_potential_sources), len(V_no_targets))
+    """
+    m_SU = SourceCutMatrix(V_potential_sources, V_no_targets)
+    if len(V_potential_sources) == 0 or len(V_no_targets) == 0:
+        return m_SU
+
+    with _share_graph_with_pool(Graph, targets, workers) as executor:
+        futures = [executor.submit(_evaluate_columns, chunk, V_potential_sources) for chunk in _chunk(V_no_targets, workers, chunk_size)]
+        u_index = 0
+        for future in futures:
+            for column in future.result():
+                m_SU.set_column(u_index, np.unpackbits(column, count=len(V_potential_sources), bitorder='little'))
+                u_index += 1
+    return m_SU
+
+def all_columns_protected_parallel(Graph: ig.Graph, targets: list, V_potential_sources: list, V_no_targets: list, workers: int, chunk_size: int=None):
+    """
+    Column-at-a-time counterpart of `get_m_SU_parallel`. Each worker stops a column at its first protecting
+    source, and the remaining tasks are cancelled as soon as one column has no protecting source.
+
+    Parameters
+    ----------
+    Graph : ig.Graph
+        Input graph
+    targets : list
+        The target vertices
+    V_potential_sources : list
+        Potential sources, in the order they should be tried
+    V_no_targets : list
+        Vertices that must not learn the key
+    workers : int
+        Number of worker processes
+    chunk_size : int
+        Number of columns per task. Defaults to an even split into four tasks per worker.
+
+    Returns
+    -------
+    :bool
+        True if every vertex in `V_no_targets` has a protecting source
+    """
+    if len(V_no_targets) == 0:
+        return True
+
+    with _share_graph_with_pool(Graph, targets, workers) as executor:
+        futures = [executor.submit(_find_protecting_sources, chunk, V_potential_sources) for chunk in _chunk(V_no_targets, workers, chunk_size)]
+        for future in as_completed(futures):
+            if None in future.result():
+                for f in futures:
+                    f.cancel()
+                return False
+    return True
@@ -0,0 +1,133 @@
+import heapq
+from .tracing import get_tracer
+
+def greedy_set_cover(sets: list, universe: int):
+    """
+    Greedy set cover over bitsets. Repeatedly picks the set that covers the most uncovered elements, which is
+    within a factor ln(n) of the optimum. Gains only shrink as elements get covered, so a stale gain on the heap
+    is an upper bound and a set is only re-evaluated when it reaches the top (lazy greedy). Sets that the final
+    selection does not need are dropped afterwards.
+
+    Parameters
+    ----------
+    sets : list
+        Python ints, bit j of `sets[i]` is set if set i covers element j
+    universe : int
+        Bitset of the elements to cover
+
+    Returns
+    -------
+    :list
+        Indices of the selected sets in the order they were picked, or None if the union of all sets does not
+        cover `universe`
+    """
+    union = 0
+    for s in sets:
+        union |= s
+    if universe & ~union:
+        return None
+
+    heap = [(-(s & universe).bit_count(), i) for i, s in enumerate(sets) if s & universe]
+    heapq.heapify(heap)
+    uncovered = universe
+    chosen = []
+    while uncovered:
+        neg_gain, i = heapq.heappop(heap)
+        gain = (sets[i] & uncovered).bit_count()
+        if gain == 0:
+            continue
+        if gain < -neg_gain:
+            heapq.heappush(heap, (-gain, i))     # stale, re-insert with the current gain
+            continue
+        chosen.append(i)
+        uncovered &= ~sets[i]
+    return _drop_redundant(sets, universe, chosen)
+
+def _drop_redundant(sets: list, universe: int, chosen: list):
+    """
+    Removes sets from `chosen`, last picked first, whose elements are all covered by the other chosen sets.
+    """
+    chosen = list(chosen)
+    for i in reversed(list(chosen)):
+        others = 0
+        for j in chosen:
+            if j != i:
+                others |= sets[j]
+        if not universe & ~others:
+            chosen.remove(i)
+    return chosen
+
+def exact_set_cover(sets: list, universe: int, max_nodes: int=1000000):
+    """
+    Minimum set cover by branch and bound, for small instances. Starts from the greedy solution and branches on
+    the uncovered element with the fewest covering sets. A branch is cut when the number of sets chosen so far
+    plus a lower bound on the sets still needed (uncovered elements divided by the largest gain) cannot beat
+    the best cover found.
+
+    Parameters
+    ----------
+    sets : list
+        Python ints, bit j of `sets[i]` is set if set i covers element j
+    universe : int
+        Bitset of the elements to cover
+    max_nodes : int
+        Maximum number of search nodes. If the search is cut short, the best cover found so far is returned and
+        a "set_cover" event with `optimal=False` is emitted.
+
+    Returns
+    -------
+    :list
+        Indices of the selected sets in ascending order, or None if the union of all sets does not cover `universe`
+    """
+    best = greedy_set_cover(sets, universe)
+    if best is None or len(best) <= 1:
+        return best
+
+    # keep one copy of each distinct set restricted to the universe, and drop sets contained in another set
+    distinct = {}
+    for i, s in enumerate(sets):
+        s &= universe
+        if s and s not in distinct:
+            distinct[s] = i
+    candidates = [(s, i) for s, i in distinct.items() if not any(s != t and s & t == s for t in distinct)]
+
+    # element -> candidates that cover it, most elements first
+    covering = {}
+    for s, i in sorted(candidates, key=lambda c: -c[0].bit_count()):
+        bits = s
+        while bits:
+            low = bits & -bits
+            covering.setdefault(low, []).append((s, i))
+            bits ^= low
+
+    best = sorted(best)
+    nodes = 0
+
+    def search(uncovered: int, chosen: list):
+        nonlocal best, nodes
+        nodes += 1
+        if nodes > max_nodes:
+            return
+        if not uncovered:
+            best = sorted(chosen)
+            return
+        max_gain = max((s & uncovered).bit_count() for s, _ in candidates)
+        if len(chosen) + -(-uncovered.bit_count() // max_gain) >= len(best):
+            return
+        # branch on the uncovered element with the fewest candidates, one of which must be chosen
+        element = None
+        bits = uncovered
+        while bits:
+            low = bits & -bits
+            if element is None or len(covering[low]) < len(covering[element]):
+                element = low
+            bits ^= low
+        for s, i in covering[element]:
+            chosen.append(i)
+            search(uncovered & ~s, chosen)
+            chosen.pop()
+
+    search(universe, [])
+    if nodes > max_nodes:
+        get_tracer().event("set_cover", optimal=False, nodes=nodes, size=len(best))
+    return best
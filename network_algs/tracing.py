@@ -0,0 +1,144 @@
+import contextvars
+import functools
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+
+class Tracer:
+    def __init__(self):
+        """
+        Collects counters (e.g. igraph calls and graph copies) and the wall time spent in each phase of an analysis.
+        Subclasses decide where events go by overriding `emit`. The phases reported by this package are
+        "potential_sources", "cut_checks", "connect_sets", "H_construction", "set_cover" and "reachability_index".
+        """
+        self.counters = {}
+        self.phase_times = {}
+
+    def count(self, name: str, n: int=1):
+        """
+        Adds `n` to the counter `name`.
+        """
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Context manager that times a phase, adds it to `phase_times` and emits a "phase" event.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.phase_times[name] = self.phase_times.get(name, 0.0) + seconds
+            self.emit("phase", name=name, seconds=seconds)
+
+    def event(self, kind: str, /, **fields):
+        """
+        Reports an event, e.g. the outcome of a single check or a status message.
+        """
+        self.emit(kind, **fields)
+
+    def emit(self, kind: str, /, **fields):
+        """
+        Called for every event. Does nothing by default.
+        """
+        pass
+
+    def summary(self):
+        """
+        Returns the accumulated counters and phase times.
+
+        Returns
+        -------
+        - :dict
+            - {"counters": {...}, "phase_times": {...}}
+        """
+        return {"counters": dict(self.counters), "phase_times": dict(self.phase_times)}
+
+class NullTracer(Tracer):
+    """
+    Default tracer. Records nothing, so tracing costs no more than a method call.
+    """
+    def count(self, name: str, n: int=1):
+        pass
+
+    def phase(self, name: str):
+        return nullcontext()
+
+    def event(self, kind: str, /, **fields):
+        pass
+
+class LoggingTracer(Tracer):
+    def __init__(self, logger: logging.Logger=None, level: int=logging.DEBUG):
+        """
+        Sends every event to a `logging` logger.
+
+        Parameters
+        ----------
+        - logger : logging.Logger
+            - Defaults to the "network_algs" logger
+        - level : int
+            - Logging level of the records
+        """
+        super().__init__()
+        self.logger = logger if logger is not None else logging.getLogger("network_algs")
+        self.level = level
+
+    def event(self, kind: str, /, **fields):
+        if self.logger.isEnabledFor(self.level):
+            self.emit(kind, **fields)
+
+    def emit(self, kind: str, /, **fields):
+        self.logger.log(self.level, "%s %s", kind, fields)
+
+class CallbackTracer(Tracer):
+    def __init__(self, callback):
+        """
+        Calls `callback(kind, fields)` for every event.
+
+        Parameters
+        ----------
+        - callback : callable
+            - Receives the kind of event and a dict with its fields
+        """
+        super().__init__()
+        self.callback = callback
+
+    def emit(self, kind: str, /, **fields):
+        self.callback(kind, fields)
+
+# a context variable rather than a global, so analyses running in different threads or asyncio tasks (see
+# QueryServer and cli) each report to their own tracer
+_active_tracer = contextvars.ContextVar("network_algs_tracer", default=NullTracer())
+
+def get_tracer():
+    """
+    Returns the tracer that the functions in this package currently report to.
+    """
+    return _active_tracer.get()
+
+@contextmanager
+def use_tracer(tracer: Tracer):
+    """
+    Makes `tracer` the active tracer inside a `with` block, for the current thread or task only. Passing None
+    keeps the current tracer.
+    """
+    if tracer is None:
+        yield _active_tracer.get()
+        return
+    token = _active_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _active_tracer.reset(token)
+
+def traced(method):
+    """
+    Decorator for methods of classes with a `tracer` attribute. Makes that tracer active while the method runs.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with use_tracer(self.tracer):
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,106 @@
+"""
+The original implementations of the algorithms that were rewritten for speed, kept as references for the tests.
+"""
+import random
+
+import igraph as ig
+
+def baseline_get_cut_vertices(Graph: ig.Graph, source: int, target: int):
+    cut_vertices = []
+    topological_order = Graph.topological_sorting(mode='out')
+    source_i = topological_order.index(source)
+    target_i = topological_order.index(target)
+    if Graph.are_adjacent(source, target):
+        return cut_vertices
+    if Graph.vertex_connectivity(source, target, neighbors="ignore") == 0:
+        return cut_vertices
+    for u in topological_order[source_i+1:target_i]:
+        G_tmp = Graph.copy()
+        G_tmp.delete_vertices(u)
+        source_tmp = source - 1 if u < source else source
+        target_tmp = target - 1 if u < target else target
+        if G_tmp.vertex_connectivity(source_tmp, target_tmp, neighbors="ignore") == 0:
+            cut_vertices.append(u)
+    return cut_vertices
+
+def baseline_is_cut_vertex(Graph: ig.Graph, source: int, target: int, u: int):
+    G_tmp = Graph.copy()
+    G_tmp.delete_vertices(u)
+    source_tmp = source - 1 if u < source else source
+    target_tmp = target - 1 if u < target else target
+    if source == target:
+        return False
+    return G_tmp.vertex_connectivity(source_tmp, target_tmp, neighbors="negative") == 0 and \
+        Graph.vertex_connectivity(source, target, neighbors="negative") != 0
+
+def baseline_del_cut_edges(Graph: ig.Graph, cut_vertex: int):
+    G_tmp = Graph.copy()
+    rm_edges = [(i, cut_vertex) for i in Graph.neighbors(cut_vertex, mode='in')]
+    rm_edges += [(cut_vertex, i) for i in Graph.neighbors(cut_vertex, mode='out')]
+    G_tmp.delete_edges(rm_edges)
+    return G_tmp
+
+def baseline_get_connect_sets(Graph: ig.Graph):
+    V_ordered = Graph.topological_sorting(mode='out')
+    connectivity_sets = [[] for i in range(Graph.vcount())]
+    for i, vertex in enumerate(V_ordered):
+        connectivity_sets[vertex].append(vertex)
+        for rest_v in V_ordered[i+1:]:
+            if Graph.are_adjacent(vertex, rest_v):
+                connectivity_sets[rest_v].extend(connectivity_sets[vertex])
+        connectivity_sets[vertex] = list(set(connectivity_sets[vertex]))
+    return connectivity_sets
+
+def baseline_get_intersection_set_H_edges(Graph: ig.Graph, connectivity_sets: list, in_cut_source_target: list):
+    edges_H = []
+    intersection_sets = [[] for i in range(Graph.vcount())]
+    for i in in_cut_source_target:
+        for j in in_cut_source_target:
+            intersect = list(set(connectivity_sets[i]).intersection(connectivity_sets[j]))
+            if len(intersect) > 0 and (i != j):
+                if (in_cut_source_target.index(j), in_cut_source_target.index(i)) not in edges_H:
+                    edges_H.append((in_cut_source_target.index(i), in_cut_source_target.index(j)))
+                intersection_sets[i].append((j, intersect))
+    return intersection_sets, edges_H
+
+def baseline_in_cut_source_target(Graph: ig.Graph, source: int, target: int, cut_vertex: int):
+    in_cut_source_target = Graph.neighbors(cut_vertex, mode='in')
+    in_cut_source_target.append(target)
+    if source not in in_cut_source_target:
+        in_cut_source_target.append(source)
+    return in_cut_source_target
+
+def baseline_alt_path_exists(Graph: ig.Graph, source: int, target: int, cut_vertex: int):
+    G_tmp = baseline_del_cut_edges(Graph, cut_vertex)
+    in_cut_target = baseline_in_cut_source_target(Graph, source, target, cut_vertex)
+    connectivity_sets = baseline_get_connect_sets(G_tmp)
+    _, edges_H = baseline_get_intersection_set_H_edges(Graph, connectivity_sets, in_cut_target)
+    H = ig.Graph(len(in_cut_target), edges_H, directed=False)
+    return len(H.get_shortest_paths(in_cut_target.index(source), in_cut_target.index(target))[0]) > 0
+
+def baseline_get_alternating_path(Graph: ig.Graph, source: int, target: int):
+    cut_vertices = baseline_get_cut_vertices(Graph, source, target)
+    if len(cut_vertices) != 1:
+        return
+    in_cut_source_target = baseline_in_cut_source_target(Graph, source, target, cut_vertices[0])
+    G_tmp = baseline_del_cut_edges(Graph, cut_vertices[0])
+    connectivity_sets = baseline_get_connect_sets(G_tmp)
+    intersection_sets, edges_H = baseline_get_intersection_set_H_edges(G_tmp, connectivity_sets, in_cut_source_target)
+    H = ig.Graph(len(in_cut_source_target), edges_H)
+    P_alt_H = H.get_shortest_paths(in_cut_source_target.index(source), in_cut_source_target.index(target))[0]
+    if len(P_alt_H) == 0:
+        return
+    P_alt = []
+    for i in range(len(P_alt_H) - 1):
+        curr = in_cut_source_target[P_alt_H[i]]
+        next = in_cut_source_target[P_alt_H[i+1]]
+        for vertex, intersect in intersection_sets[curr]:
+            if vertex == next:
+                if curr != source or len(P_alt_H) == 2:
+                    P_alt.append(G_tmp.get_shortest_paths(intersect[0], curr)[0])
+                P_alt.append(G_tmp.get_shortest_paths(intersect[0], next)[0])
+    return P_alt
+
+def random_pairs(NUM_V: int, count: int, seed: int):
+    rng = random.Random(seed)
+    return [tuple(rng.sample(range(NUM_V), 2)) for _ in range(count)]
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from network_algs import random_dag, to_graph
+
+@pytest.fixture
+def make_dag():
+    """
+    Returns a function that builds a random DAG from `random_dag` with shuffled vertex labels, so that the
+    vertex numbering is not a topological order.
+    """
+    def make(NUM_V: int, p: float, seed: int):
+        rng = np.random.default_rng(seed)
+        edges = random_dag(NUM_V, p, rng)
+        perm = rng.permutation(NUM_V)
+        return to_graph(NUM_V, perm[edges])
+    return make
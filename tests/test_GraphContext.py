@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from network_algs import ShareKey, ShareSecretBatch, GraphContext
+
+def m_SU_entries(m_SU):
+    dense = m_SU.to_dense()
+    return {(s, u): bool(dense[i, j]) for i, s in enumerate(m_SU.rows) for j, u in enumerate(m_SU.columns)}
+
+@pytest.mark.parametrize("seed", range(20))
+def test_verify_edges_notices_edits_that_keep_the_counts(make_dag, seed):
+    rng = random.Random(seed)
+    Graph = make_dag(12, 0.3, seed)
+    targets = rng.sample(range(12), 2)
+    key = ShareKey(Graph, targets, context=GraphContext(Graph, verify_edges=True))
+    key.get_m_SU()
+
+    # replace an edge by one between two other vertices, so the vertex and edge counts stay the same
+    order = Graph.topological_sorting(mode='out')
+    position = {v: i for i, v in enumerate(order)}
+    missing = [(a, b) for a in range(12) for b in range(12) if position[a] < position[b] and not Graph.are_adjacent(a, b)]
+    Graph.delete_edges([rng.randrange(Graph.ecount())])
+    Graph.add_edges([rng.choice(missing)])
+
+    assert m_SU_entries(key.get_m_SU()) == m_SU_entries(ShareKey(Graph.copy(), targets).get_m_SU())
+
+def test_direct_edits_that_change_the_counts_are_noticed(make_dag):
+    Graph = make_dag(12, 0.3, 0)
+    key = ShareKey(Graph, [10, 11])
+    key.get_m_SU()
+    Graph.delete_edges([0])
+    assert m_SU_entries(key.get_m_SU()) == m_SU_entries(ShareKey(Graph.copy(), [10, 11]).get_m_SU())
+
+def test_iter_alternating_paths_checks_the_graph_once(make_dag, monkeypatch):
+    Graph = make_dag(20, 0.2, 0)
+    batch = ShareSecretBatch(Graph)
+    calls = []
+    check_graph = batch.context.check_graph
+    monkeypatch.setattr(batch.context, "check_graph", lambda: calls.append(1) or check_graph())
+    results = list(batch.iter_alternating_paths(sources=[0, 1, 2]))
+    assert len(results) > 3
+    assert len(calls) == 1
+
+    fresh = ShareSecretBatch(Graph.copy())
+    for source, target, P_alt in results:
+        assert P_alt == fresh.share_secret(source, target).get_alternating_path()
@@ -0,0 +1,100 @@
+"""
+Runs a `QueryServer` on a free localhost port and compares the answers of every operation with the analyses
+called directly.
+"""
+import asyncio
+
+from network_algs import QueryServer, ShareKey, ShareSecret, send_query
+
+def query(server: QueryServer, *requests: dict):
+    """
+    Sends `requests` over one connection from a thread, so the server keeps running on the event loop.
+    """
+    return asyncio.to_thread(send_query, server.address, *requests, timeout=10)
+
+def serve(main, **options):
+    """
+    Starts a server, awaits `main(server)` and closes the server again.
+    """
+    async def run():
+        server = QueryServer(**options)
+        await server.start()
+        try:
+            return await main(server)
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+def test_queries_match_analyses(make_dag):
+    Graph = make_dag(25, 0.15, 3)
+    edges = [list(edge) for edge in Graph.get_edgelist()]
+    targets = [0, 7, 12]
+    pairs = [(s, t) for s in range(0, 25, 4) for t in range(1, 25, 5) if s != t]
+
+    async def main(server):
+        requests = [{"op": "load", "graph": "g", "num_vertices": 25, "edges": edges},
+                    {"op": "does_scheme_exist", "graph": "g", "targets": targets},
+                    {"op": "min_source_set", "graph": "g", "targets": targets},
+                    {"op": "min_source_set", "graph": "g", "targets": targets, "exact": True}]
+        for source, target in pairs:
+            for op in ("cut_vertices", "alternating_path", "alternating_paths"):
+                requests.append({"op": op, "graph": "g", "source": source, "target": target})
+        return await query(server, *requests)
+
+    responses = serve(main)
+    assert all(response["ok"] for response in responses), [r for r in responses if not r["ok"]]
+    assert responses[0]["result"] == {"vertices": 25, "edges": Graph.ecount()}
+    key = ShareKey(Graph, targets)
+    assert responses[1]["result"] == key.does_scheme_exist()
+    assert responses[2]["result"] == key.get_min_source_set()
+    assert responses[3]["result"] == key.get_min_source_set(exact=True)
+
+    answers = iter(responses[4:])
+    for source, target in pairs:
+        secret = ShareSecret(Graph, source, target)
+        assert next(answers)["result"] == secret.get_cut_vertices()
+        assert next(answers)["result"] == secret.get_alternating_path()
+        assert next(answers)["result"] == [[u, path] for u, path in secret.get_alternating_paths().items()]
+
+def test_load_file_graphs_and_unload(tmp_path):
+    path = tmp_path / "out.graph"
+    path.write_text("1 2\n2 3\n1 3\n3 4\n")
+
+    async def main(server):
+        # the query is received before the file is read, and must wait for it
+        loaded = await query(server, {"op": "load", "graph": "f", "path": str(path)},
+                             {"op": "cut_vertices", "graph": "f", "source": 0, "target": 3})
+        listed = await query(server, {"op": "graphs"})
+        unloaded = await query(server, {"op": "unload", "graph": "f"}, {"op": "unload", "graph": "f"})
+        after = await query(server, {"op": "cut_vertices", "graph": "f", "source": 0, "target": 3})
+        return loaded, listed, unloaded, after
+
+    loaded, listed, unloaded, after = serve(main)
+    assert loaded[0]["result"] == {"vertices": 4, "edges": 4}
+    assert loaded[1]["result"] == [2]
+    assert listed[0]["result"]["f"]["vertices"] == 4
+    assert [response["result"] for response in unloaded] == [True, False]
+    assert not after[0]["ok"] and "Unknown graph" in after[0]["error"]
+
+def test_errors():
+    async def main(server):
+        return await query(server, {"op": "nope"}, {"op": "cut_vertices", "source": 0, "target": 1},
+                           {"op": "load", "graph": "c", "num_vertices": 2, "edges": [[0, 1], [1, 0]]},
+                           {"op": "does_scheme_exist", "graph": "missing", "targets": [0]})
+
+    responses = serve(main)
+    assert [response["ok"] for response in responses] == [False] * 4
+    assert "Unknown operation" in responses[0]["error"]
+    assert "Missing field" in responses[1]["error"]
+    assert "not a DAG" in responses[2]["error"]
+    assert "Unknown graph" in responses[3]["error"]
+
+def test_evicts_least_recently_used_graph():
+    async def main(server):
+        for name in ("a", "b", "c"):
+            await server.handle({"op": "load", "graph": name, "num_vertices": 3, "edges": [[0, 1], [1, 2]]})
+        await server.handle({"op": "cut_vertices", "graph": "a", "source": 0, "target": 2})
+        await server.handle({"op": "load", "graph": "d", "num_vertices": 2, "edges": [[0, 1]]})
+        return (await server.handle({"op": "graphs"}))["result"]
+
+    assert sorted(serve(main, max_graphs=3)) == ["a", "c", "d"]
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from network_algs import GraphContext, ReachabilityIndex, layered_dag, to_graph
+
+def assert_matches_bfs(index: ReachabilityIndex, Graph):
+    for u in range(Graph.vcount()):
+        reached = set(Graph.subcomponent(u, mode='out'))
+        for v in range(Graph.vcount()):
+            assert index.reaches(u, v) == (v in reached), (u, v)
+
+@pytest.mark.parametrize("num_labels", [1, 2, 3])
+@pytest.mark.parametrize("seed", range(4))
+def test_reaches_matches_bfs(make_dag, num_labels, seed):
+    Graph = make_dag(60, 0.05, seed)
+    assert_matches_bfs(ReachabilityIndex(Graph, num_labels, seed), Graph)
+
+def test_layered():
+    Graph = to_graph(80, layered_dag([20, 20, 20, 20], 0.1, seed=1))
+    assert_matches_bfs(ReachabilityIndex(Graph), Graph)
+
+@pytest.mark.parametrize("seed", range(10))
+def test_rebuilt_after_edits(make_dag, seed):
+    rng = random.Random(seed)
+    Graph = make_dag(40, 0.06, seed)
+    context = GraphContext(Graph)
+    assert_matches_bfs(context.get_reachability_index(), Graph)
+    for _ in range(8):
+        op = rng.random()
+        if op < 0.5:
+            try:
+                context.add_edges([tuple(rng.sample(range(Graph.vcount()), 2))])
+            except ValueError:
+                continue        # would create a cycle
+        elif op < 0.9:
+            index = context.get_reachability_index()
+            context.delete_edges([Graph.es[rng.randrange(Graph.ecount())].tuple])
+            # deleting edges makes no new pair reachable, so the index is kept
+            assert context.get_reachability_index(build=False) is index
+        else:
+            context.add_vertices(2)
+        assert_matches_bfs(context.get_reachability_index(), Graph)
+        for u, v in (rng.sample(range(Graph.vcount()), 2) for _ in range(20)):
+            assert context.reaches(u, v) == (v in Graph.subcomponent(u, mode='out'))
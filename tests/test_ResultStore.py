@@ -0,0 +1,87 @@
+import pickle
+import time
+
+import igraph as ig
+
+from network_algs import ResultStore, ShareKey, ShareSecretBatch, graph_fingerprint
+from network_algs.CSRGraph import CSRGraph
+from network_algs.MaskedGraph import MaskedGraph
+
+def m_SU_entries(m_SU):
+    dense = m_SU.to_dense()
+    return {(s, u): bool(dense[i, j]) for i, s in enumerate(m_SU.rows) for j, u in enumerate(m_SU.columns)}
+
+def test_fingerprint_depends_on_vertices_and_edges_only():
+    Graph = ig.Graph(4, [(0, 1), (1, 2), (0, 3)], directed=True)
+    fingerprint = graph_fingerprint(Graph)
+    same = ig.Graph(4, [(0, 3), (1, 2), (0, 1)], directed=True)
+    same.vs["name"] = ["a", "b", "c", "d"]
+    assert graph_fingerprint(same) == fingerprint
+    assert graph_fingerprint(MaskedGraph(Graph)) == fingerprint
+    assert graph_fingerprint(CSRGraph.from_graph(Graph)) == fingerprint
+    assert graph_fingerprint(ig.Graph(5, [(0, 1), (1, 2), (0, 3)], directed=True)) != fingerprint
+    assert graph_fingerprint(ig.Graph(4, [(0, 1), (1, 2), (1, 3)], directed=True)) != fingerprint
+    assert graph_fingerprint(ig.Graph(4, [(0, 1), (1, 2), (3, 0)], directed=True)) != fingerprint
+
+def test_get_computes_once_and_persists(tmp_path):
+    path = str(tmp_path / "store.sqlite")
+    calls = []
+    with ResultStore(path) as store:
+        assert store.get("graph", ("q", 1), lambda: calls.append(1) or [1, 2]) == [1, 2]
+        assert store.get("graph", ("q", 1), lambda: calls.append(1) or [3]) == [1, 2]
+        assert store.get("other", ("q", 1), lambda: calls.append(1) or [4]) == [4]
+        assert len(calls) == 2
+        assert store.info()[:3] == (1, 2, 2)
+    with ResultStore(path) as store:
+        assert ("graph", ("q", 1)) in store
+        assert store.get("graph", ("q", 1), lambda: calls.append(1)) == [1, 2]
+        store.clear("graph")
+        assert ("graph", ("q", 1)) not in store and len(store) == 1
+    assert len(calls) == 2
+
+def test_least_recently_used_values_are_evicted(tmp_path):
+    value = list(range(100))
+    size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    with ResultStore(str(tmp_path / "store.sqlite"), max_bytes=3 * size) as store:
+        for i in range(3):
+            store.put("graph", ("q", i), value)
+            time.sleep(0.01)
+        store.get("graph", ("q", 0), lambda: None)     # query 1 is now the least recently used
+        time.sleep(0.01)
+        store.put("graph", ("q", 3), value)
+        assert [("graph", ("q", i)) in store for i in range(4)] == [True, False, True, True]
+        assert store.info().currbytes <= 3 * size
+
+        store.put("graph", ("too large",), list(range(10000)))
+        assert ("graph", ("too large",)) not in store
+        assert len(store) == 3
+
+def test_results_are_recomputed_after_an_edit(tmp_path, make_dag):
+    Graph = make_dag(15, 0.25, 0)
+    with ResultStore(str(tmp_path / "store.sqlite")) as store:
+        key = ShareKey(Graph, [13, 14], store=store)
+        key.get_m_SU()
+        key.does_scheme_exist()
+        misses = store.misses
+
+        # an unchanged graph is read back, also by a new instance
+        assert ShareKey(Graph, [13, 14], store=store).get_m_SU() == key.get_m_SU()
+        assert store.misses == misses
+
+        old_fingerprint = key.context.fingerprint()
+        key.delete_edges([Graph.es[0].tuple])
+        assert key.context.fingerprint() == graph_fingerprint(Graph) != old_fingerprint
+        fresh = ShareKey(Graph.copy(), [13, 14])
+        assert m_SU_entries(key.get_m_SU()) == m_SU_entries(fresh.get_m_SU())
+        assert key.does_scheme_exist() == fresh.does_scheme_exist()
+        assert store.misses > misses
+
+        batch = ShareSecretBatch(Graph, store=store)
+        fresh_batch = ShareSecretBatch(Graph.copy())
+        for source, target in [(0, 14), (1, 13), (2, 12)]:
+            paths = batch.share_secret(source, target).get_alternating_paths()
+            batch.add_edges([(source, target)])
+            assert batch.share_secret(source, target).get_alternating_paths() == {}
+            batch.delete_edges([(source, target)])
+            assert batch.share_secret(source, target).get_alternating_paths() == paths == \
+                fresh_batch.share_secret(source, target).get_alternating_paths()
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from network_algs import CutVertexAnalysis, alt_path_exists, H_path_exists
+from baseline import (baseline_del_cut_edges, baseline_get_connect_sets, baseline_in_cut_source_target,
+                      baseline_alt_path_exists, random_pairs)
+
+# the baseline asks igraph for paths to vertices it cannot reach
+pytestmark = pytest.mark.filterwarnings("ignore:Couldn't reach some vertices")
+
+@pytest.mark.parametrize("seed", range(10))
+def test_alt_path_exists_matches_baseline(make_dag, seed):
+    Graph = make_dag(20, 0.15, seed)
+    rng = random.Random(seed)
+    for source, target in random_pairs(20, 15, seed):
+        cut_vertex = rng.choice([v for v in range(20) if v not in (source, target)])
+        expected = baseline_alt_path_exists(Graph, source, target, cut_vertex)
+        assert alt_path_exists(Graph, source, target, cut_vertex) == expected
+        assert CutVertexAnalysis(Graph, cut_vertex).alt_path_exists(source, target) == expected
+
+        connectivity_sets = baseline_get_connect_sets(baseline_del_cut_edges(Graph, cut_vertex))
+        in_cut_source_target = baseline_in_cut_source_target(Graph, source, target, cut_vertex)
+        assert H_path_exists(connectivity_sets, in_cut_source_target, source, target) == expected
+
+def pairwise_components(sets: list):
+    """
+    Components of the sets joined whenever two of them intersect, as the union of each component's sets.
+    """
+    components = []
+    for bits in sets:
+        joined = [c for c in components if c & bits]
+        components = [c for c in components if not c & bits]
+        for c in joined:
+            bits |= c
+        components.append(bits)
+    return components
+
+@pytest.mark.parametrize("seed", range(10))
+def test_components_of_in_neighbours(make_dag, seed):
+    Graph = make_dag(60, 0.15, seed)
+    for cut_vertex in range(60):
+        analysis = CutVertexAnalysis(Graph, cut_vertex)
+        sets = [analysis.connectivity_bitsets[v] for v in analysis.in_cut]
+        assert sorted(analysis._get_component_bitsets()) == sorted(pairwise_components(sets))
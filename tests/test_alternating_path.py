@@ -0,0 +1,24 @@
+"""
+Compares `ShareSecret.get_alternating_path` with the implementation it replaced (see `baseline`).
+"""
+import pytest
+
+from network_algs import ShareSecret
+from baseline import baseline_get_cut_vertices, baseline_get_alternating_path
+
+# the baseline asks igraph for paths to vertices it cannot reach
+pytestmark = pytest.mark.filterwarnings("ignore:Couldn't reach some vertices")
+
+@pytest.mark.parametrize("seed", range(10))
+def test_alternating_path_matches_baseline(make_dag, seed):
+    """user-024: one search per intersecting vertex and dict lookups for the intersections of each hop"""
+    Graph = make_dag(30, 0.1, seed)
+    checked = 0
+    for source in range(30):
+        for target in range(30):
+            if source == target or len(baseline_get_cut_vertices(Graph, source, target)) != 1:
+                continue
+            checked += 1
+            assert ShareSecret(Graph, source, target).get_alternating_path() == \
+                baseline_get_alternating_path(Graph, source, target)
+    assert checked > 0
@@ -0,0 +1,70 @@
+"""
+Runs `python -m network_algs run` on a JSONL job file with several workers and a result store, and compares the
+results with the analyses called directly.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from network_algs import ShareKey, ShareSecret, load_graph
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+def run(*args: str):
+    return subprocess.run([sys.executable, "-m", "network_algs", "run", *args], cwd=REPO, capture_output=True,
+                          text=True, timeout=120)
+
+def test_run_jobs_with_workers_and_store(tmp_path, make_dag):
+    Graph = make_dag(20, 0.2, 7)
+    graph_path = tmp_path / "out.graph"
+    graph_path.write_text("".join(f"{a + 1} {b + 1}\n" for a, b in Graph.get_edgelist()))
+    Graph = load_graph(str(graph_path)).to_graph()     # as the workers read it
+    edges = [list(edge) for edge in Graph.get_edgelist()]
+
+    jobs = [{"id": 0, "graph": str(graph_path), "targets": [3, 8]},
+            {"id": 1, "graph": str(graph_path), "targets": [3, 8], "query": "min_source_set"},
+            {"id": 2, "num_vertices": Graph.vcount(), "edges": edges, "targets": [5], "query": "min_source_set", "exact": True}]
+    pairs = [(s, t) for s in range(0, Graph.vcount(), 3) for t in range(1, Graph.vcount(), 4) if s != t]
+    for source, target in pairs:
+        for query in ("cut_vertices", "alternating_path", "alternating_paths"):
+            jobs.append({"id": len(jobs), "graph": str(graph_path), "source": source, "target": target, "query": query})
+    jobs.append({"id": "unknown", "graph": str(graph_path), "targets": [1], "query": "nope"})
+    jobs_path = tmp_path / "jobs.jsonl"
+    jobs_path.write_text("".join(json.dumps(job) + "\n" for job in jobs) + "not json\n")
+
+    store_path = str(tmp_path / "results.sqlite")
+    outputs = []
+    for _ in range(2):      # the second run reads the results back from the store
+        output_path = tmp_path / "results.jsonl"
+        completed = run(str(jobs_path), "--output", str(output_path), "--workers", "2", "--store", store_path)
+        assert completed.returncode == 1, completed.stderr       # two jobs fail
+        outputs.append([json.loads(line) for line in output_path.read_text().splitlines()])
+    assert os.path.exists(store_path)
+
+    for results in outputs:
+        assert len(results) == len(jobs) + 1
+        by_id = {result["id"]: result for result in results}
+        assert not by_id["unknown"]["ok"] and "Unknown query" in by_id["unknown"]["error"]
+        assert not by_id[None]["ok"] and "line" in by_id[None]["error"]
+
+        key = ShareKey(Graph, [3, 8])
+        assert by_id[0]["result"] == key.does_scheme_exist()
+        assert by_id[1]["result"] == key.get_min_source_set()
+        assert by_id[2]["result"] == ShareKey(Graph, [5]).get_min_source_set(exact=True)
+        i = 3
+        for source, target in pairs:
+            secret = ShareSecret(Graph, source, target)
+            assert by_id[i]["result"] == secret.get_cut_vertices()
+            assert by_id[i + 1]["result"] == secret.get_alternating_path()
+            assert by_id[i + 2]["result"] == [[u, path] for u, path in secret.get_alternating_paths().items()]
+            i += 3
+
+def test_run_from_stdin():
+    job = {"id": "a", "num_vertices": 4, "edges": [[0, 1], [1, 2], [0, 3], [3, 2]], "source": 0, "target": 2,
+           "query": "cut_vertices"}
+    completed = subprocess.run([sys.executable, "-m", "network_algs", "run", "-"], cwd=REPO, input=json.dumps(job) + "\n",
+                               capture_output=True, text=True, timeout=60)
+    assert completed.returncode == 0, completed.stderr
+    result = json.loads(completed.stdout)
+    assert result["ok"] and result["result"] == []
@@ -0,0 +1,21 @@
+import pytest
+
+from network_algs import get_connect_sets, get_connect_bitsets, bitset_to_list
+from baseline import baseline_get_connect_sets
+
+@pytest.mark.parametrize("seed", range(10))
+def test_connect_sets_match_baseline(make_dag, seed):
+    Graph = make_dag(40, 0.1, seed)
+    expected = [sorted(s) for s in baseline_get_connect_sets(Graph)]
+    assert get_connect_sets(Graph) == expected
+    assert [bitset_to_list(b) for b in get_connect_bitsets(Graph)] == expected
+    assert get_connect_sets(Graph, bitsets=True) == get_connect_bitsets(Graph)
+
+def test_bitset_to_list():
+    assert bitset_to_list(0) == []
+    assert bitset_to_list(0b1011) == [0, 1, 3]
+    assert bitset_to_list(1 << 200 | 1 << 64) == [64, 200]
+
+def test_graph_without_edges(make_dag):
+    Graph = make_dag(5, 0.0, 0)
+    assert get_connect_sets(Graph) == [[v] for v in range(5)]
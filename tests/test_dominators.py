@@ -0,0 +1,30 @@
+import random
+
+import pytest
+
+from network_algs import ShareSecret, is_cut_vertex
+from network_algs.dominators import get_all_cut_vertices
+from baseline import baseline_get_cut_vertices, baseline_is_cut_vertex
+
+@pytest.mark.parametrize("seed", range(10))
+def test_cut_vertices_match_baseline(make_dag, seed):
+    Graph = make_dag(20, 0.12, seed)
+    found = 0
+    for source in range(20):
+        for target in range(20):
+            if source == target:
+                continue
+            expected = baseline_get_cut_vertices(Graph, source, target)
+            found += len(expected)
+            assert ShareSecret(Graph, source, target).get_cut_vertices() == expected
+            for u in expected + random.Random(source * 20 + target).sample(range(20), 3):
+                if u not in (source, target):
+                    assert is_cut_vertex(Graph, source, target, u) == baseline_is_cut_vertex(Graph, source, target, u)
+    assert found > 0
+
+@pytest.mark.parametrize("seed", range(5))
+def test_all_cut_vertices_of_a_source(make_dag, seed):
+    Graph = make_dag(20, 0.12, seed)
+    for source in range(20):
+        cut_vertices = get_all_cut_vertices(Graph, source)
+        assert cut_vertices == {t: baseline_get_cut_vertices(Graph, source, t) if t != source else [] for t in range(20)}
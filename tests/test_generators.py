@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from network_algs import random_dag, barabasi_albert_dag, watts_strogatz_dag, layered_dag, to_graph
+
+GENERATORS = {
+    "random": (lambda seed: random_dag(60, 0.1, seed), 60),
+    "barabasi_albert": (lambda seed: barabasi_albert_dag(60, 3, seed), 60),
+    "watts_strogatz": (lambda seed: watts_strogatz_dag(60, 4, 0.3, seed), 60),
+    "layered": (lambda seed: layered_dag([10, 20, 15, 15], 0.3, seed), 60),
+}
+
+@pytest.mark.parametrize("family", sorted(GENERATORS))
+def test_output_is_a_simple_dag(family):
+    generate, NUM_V = GENERATORS[family]
+    for seed in range(5):
+        edges = generate(seed)
+        assert edges.dtype == np.int64 and edges.ndim == 2 and edges.shape[1] == 2
+        assert ((edges >= 0) & (edges < NUM_V)).all()
+        # every edge points from a lower to a higher vertex number, so there is no cycle and no self-loop
+        assert (edges[:, 0] < edges[:, 1]).all()
+        assert len(np.unique(edges, axis=0)) == len(edges)
+        Graph = to_graph(NUM_V, edges)
+        assert Graph.vcount() == NUM_V and Graph.ecount() == len(edges) and Graph.is_dag()
+
+@pytest.mark.parametrize("family", sorted(GENERATORS))
+def test_seed_reproduces_output(family):
+    generate, _ = GENERATORS[family]
+    assert np.array_equal(generate(7), generate(7))
+    assert np.array_equal(generate(np.random.default_rng(3)), generate(np.random.default_rng(3)))
+    assert not np.array_equal(generate(7), generate(8))
+
+def test_random_dag_edge_counts():
+    assert len(random_dag(30, 0.0, 0)) == 0
+    assert len(random_dag(30, 1.0, 0)) == 30 * 29 // 2
+    # the expected count is p * V * (V - 1) / 2 = 4995, with a standard deviation of about 70
+    assert abs(len(random_dag(1000, 0.01, 0)) - 4995) < 400
+
+def test_barabasi_albert_edge_counts():
+    edges = barabasi_albert_dag(200, 3, 0)
+    in_degree = np.bincount(edges[:, 1], minlength=200)
+    assert in_degree[0] == 0 and in_degree[1] == 1
+    # repeated choices are merged, so a vertex gets between 1 and m incoming edges
+    assert (in_degree[2:] >= 1).all() and (in_degree[2:] <= np.minimum(3, np.arange(2, 200))).all()
+    assert len(barabasi_albert_dag(1, 3, 0)) == 0
+    assert len(barabasi_albert_dag(50, 0, 0)) == 0
+
+def test_watts_strogatz_edge_counts():
+    # without rewiring, the ring lattice has k / 2 edges per vertex
+    assert len(watts_strogatz_dag(50, 4, 0.0, 0)) == 50 * 2
+    assert len(watts_strogatz_dag(50, 4, 0.5, 0)) <= 50 * 2
+    assert len(watts_strogatz_dag(50, 1, 0.1, 0)) == 0
+
+def test_layered_edge_counts():
+    layer_sizes = [3, 5, 2, 4]
+    edges = layered_dag(layer_sizes, 1.0, 0)
+    assert len(edges) == 3 * 5 + 5 * 2 + 2 * 4
+    assert len(layered_dag(layer_sizes, 0.0, 0)) == 0
+    # edges only join consecutive layers
+    layer = np.repeat(np.arange(len(layer_sizes)), layer_sizes)
+    edges = layered_dag(layer_sizes, 0.5, 1)
+    assert (layer[edges[:, 1]] == layer[edges[:, 0]] + 1).all()
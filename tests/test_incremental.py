@@ -0,0 +1,106 @@
+"""
+Edits graphs through `ShareKey`, `ShareSecretBatch` and directly, and compares every answer with a fresh instance
+built on a copy of the edited graph.
+"""
+import random
+
+import pytest
+
+from network_algs import ShareKey, ShareSecretBatch, GraphContext
+
+def m_SU_entries(m_SU):
+    """
+    The source/cut matrix keyed by (source, u), so that matrices with rows or columns in another order compare equal.
+    """
+    dense = m_SU.to_dense()
+    return {(s, u): bool(dense[i, j]) for i, s in enumerate(m_SU.rows) for j, u in enumerate(m_SU.columns)}
+
+def random_edit(editor, Graph, rng: random.Random):
+    """
+    Adds an edge, deletes an edge or adds a vertex through `editor`. Returns False if the edge would create a cycle.
+    """
+    op = rng.random()
+    if op < 0.5:
+        edge = tuple(rng.sample(range(Graph.vcount()), 2))
+        try:
+            editor.add_edges([edge])
+        except ValueError:
+            return False
+    elif op < 0.9 and Graph.ecount():
+        editor.delete_edges([Graph.es[rng.randrange(Graph.ecount())].tuple])
+    else:
+        editor.add_vertices(1)
+    return True
+
+def assert_same_as_fresh(key: ShareKey, batch: ShareSecretBatch, pairs: list):
+    Graph = key.Graph.copy()
+    fresh_key = ShareKey(Graph, key.targets)
+    assert m_SU_entries(key.get_m_SU()) == m_SU_entries(fresh_key.get_m_SU())
+    assert key.does_scheme_exist() == fresh_key.does_scheme_exist()
+
+    fresh_batch = ShareSecretBatch(Graph)
+    for source, target in pairs:
+        secret, fresh = batch.share_secret(source, target), fresh_batch.share_secret(source, target)
+        assert secret.get_cut_vertices() == fresh.get_cut_vertices()
+        assert secret.get_alternating_paths() == fresh.get_alternating_paths()
+        assert secret.get_alternating_path() == fresh.get_alternating_path()
+
+def setup(make_dag, seed: int):
+    rng = random.Random(seed)
+    NUM_V = rng.randint(8, 16)
+    Graph = make_dag(NUM_V, rng.uniform(0.15, 0.35), seed)
+    context = GraphContext(Graph)
+    key = ShareKey(Graph, rng.sample(range(NUM_V), rng.randint(1, 3)), context=context)
+    batch = ShareSecretBatch(Graph, context=context)
+    pairs = [tuple(rng.sample(range(NUM_V), 2)) for _ in range(8)]
+    # fill the caches so the edits have something to update
+    key.get_m_SU()
+    key.does_scheme_exist()
+    for source, target in pairs:
+        batch.share_secret(source, target).get_alternating_paths()
+    return rng, Graph, key, batch, pairs
+
+@pytest.mark.parametrize("seed", range(25))
+def test_edits_through_share_key(make_dag, seed):
+    rng, Graph, key, batch, pairs = setup(make_dag, seed)
+    for _ in range(6):
+        if random_edit(key, Graph, rng):
+            assert_same_as_fresh(key, batch, pairs)
+
+@pytest.mark.parametrize("seed", range(25))
+def test_edits_through_batch(make_dag, seed):
+    rng, Graph, key, batch, pairs = setup(make_dag, seed)
+    for _ in range(6):
+        if random_edit(batch, Graph, rng):
+            assert_same_as_fresh(key, batch, pairs)
+
+@pytest.mark.parametrize("seed", range(25))
+def test_direct_edits(make_dag, seed):
+    rng, Graph, key, batch, pairs = setup(make_dag, seed)
+    for _ in range(6):
+        if random_edit(Graph, Graph, rng) and Graph.is_dag():
+            assert_same_as_fresh(key, batch, pairs)
+        elif not Graph.is_dag():
+            Graph.delete_edges([Graph.ecount() - 1])
+
+@pytest.mark.parametrize("seed", range(10))
+def test_delete_vertices(make_dag, seed):
+    rng, Graph, key, batch, _ = setup(make_dag, seed)
+    deleted = rng.sample([v for v in range(Graph.vcount()) if v not in key.targets], 2)
+    key.delete_vertices(deleted)
+    pairs = [tuple(rng.sample(range(Graph.vcount()), 2)) for _ in range(8)]
+    assert_same_as_fresh(key, batch, pairs)
+
+@pytest.mark.parametrize("shared", ["batch", "key"])
+def test_query_added_vertex(make_dag, shared):
+    """Dominator trees cached before `add_vertices` must cover the new vertices"""
+    Graph = make_dag(12, 0.3, 0)
+    key = ShareKey(Graph, [11])
+    batch = ShareSecretBatch(Graph, context=key.context)
+    source = next(v for v in range(11) if key.context.reaches(v, 11))
+    batch.share_secret(source, 11).get_cut_vertices()
+    (batch if shared == "batch" else key).add_vertices(1)
+    assert batch.share_secret(source, 12).get_cut_vertices() == []
+    assert batch.share_secret(source, 12).get_source_to_target_path() is None
+    (batch if shared == "batch" else key).add_edges([(11, 12)])
+    assert_same_as_fresh(key, batch, [(source, 12), (source, 11)])
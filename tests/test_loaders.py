@@ -0,0 +1,62 @@
+import gzip
+
+import numpy as np
+import pytest
+
+from network_algs import read_konect, read_graphml, read_gt, read_graph
+from network_algs.loaders import GT_MAGIC
+
+def write_gt(path, NUM_V: int, edges: np.ndarray, byteorder: str="little"):
+    """
+    Writes a graph-tool binary file without property maps. Vertex numbers are stored in the smallest unsigned
+    type whose range exceeds NUM_V, like graph-tool does.
+    """
+    width = next(w for w, bits in ((1, 8), (2, 16), (4, 32), (8, 64)) if NUM_V < 2 ** bits)
+    dtype = np.dtype(f"u{width}").newbyteorder("<" if byteorder == "little" else ">")
+    comment = b"written by test_loaders"
+    with open(path, "wb") as f:
+        f.write(GT_MAGIC + bytes([1, byteorder == "big"]))
+        f.write(len(comment).to_bytes(8, byteorder) + comment + bytes([1]))
+        f.write(NUM_V.to_bytes(8, byteorder))
+        for v in range(NUM_V):
+            neighbours = edges[edges[:, 0] == v, 1]
+            f.write(len(neighbours).to_bytes(8, byteorder) + neighbours.astype(dtype).tobytes())
+        f.write((0).to_bytes(8, byteorder))     # no property maps
+
+@pytest.mark.parametrize("NUM_V", [2, 255, 256, 257, 65535, 65536])
+@pytest.mark.parametrize("byteorder", ["little", "big"])
+def test_gt_round_trip(tmp_path, NUM_V, byteorder):
+    rng = np.random.default_rng(NUM_V)
+    edges = rng.integers(0, NUM_V, size=(300, 2))
+    edges[0] = (0, NUM_V - 1)     # the largest vertex number must survive the round trip
+    edges = edges[np.lexsort((np.arange(len(edges)), edges[:, 0]))]
+    path = tmp_path / "graph.gt"
+    write_gt(path, NUM_V, edges, byteorder)
+    read_NUM_V, read_edges = read_gt(str(path))
+    assert read_NUM_V == NUM_V
+    assert np.array_equal(read_edges, edges)
+
+def test_konect(tmp_path):
+    path = tmp_path / "out.graph"
+    path.write_text("% sym unweighted\n% 3 4 4\n1 2\n2 3 1.5\n3 4\n1 4\n")
+    NUM_V, edges = read_konect(str(path))
+    assert NUM_V == 4
+    assert edges.tolist() == [[0, 1], [1, 2], [2, 3], [0, 3]]
+
+def test_konect_bipartite(tmp_path):
+    # both sides are numbered from 1, so right-hand vertex 1 must not become left-hand vertex 1
+    path = tmp_path / "out.graph.gz"
+    with gzip.open(path, "wt") as f:
+        f.write("% bip unweighted\n1 1\n2 1\n3 2\n")
+    NUM_V, edges = read_graph(str(path))
+    assert NUM_V == 5
+    assert edges.tolist() == [[0, 3], [1, 3], [2, 4]]
+
+def test_graphml(tmp_path):
+    path = tmp_path / "graph.graphml"
+    path.write_text('<?xml version="1.0"?><graphml xmlns="http://graphml.graphdrawing.org/xmlns">'
+                    '<graph edgedefault="directed"><node id="a"/><node id="b"/><node id="c"/>'
+                    '<edge source="a" target="c"/><edge source="c" target="b"/></graph></graphml>')
+    NUM_V, edges = read_graphml(str(path))
+    assert NUM_V == 3
+    assert edges.tolist() == [[0, 2], [2, 1]]
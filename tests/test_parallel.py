@@ -0,0 +1,31 @@
+import random
+
+import igraph as ig
+import pytest
+
+from network_algs import ShareKey
+from network_algs.parallel import get_m_SU_parallel, all_columns_protected_parallel
+
+def test_no_potential_sources():
+    # no vertex reaches both targets
+    Graph = ig.Graph(4, [(0, 1), (2, 3)], directed=True)
+    key = ShareKey(Graph, [1, 3])
+    m_SU = key.get_m_SU(workers=2)
+    assert m_SU.shape == (0, 2)
+    assert m_SU == ShareKey(Graph.copy(), [1, 3]).get_m_SU()
+    assert key.does_scheme_exist(workers=2) is False
+
+@pytest.mark.parametrize("seed", range(6))
+def test_parallel_matches_sequential(make_dag, seed):
+    rng = random.Random(seed)
+    Graph = make_dag(30, 0.15, seed)
+    targets = rng.sample(range(30), 2)
+    sequential = ShareKey(Graph, targets)
+    parallel = ShareKey(Graph.copy(), targets)
+    assert parallel.get_m_SU(workers=2) == sequential.get_m_SU()
+    assert ShareKey(Graph.copy(), targets).does_scheme_exist(workers=2) == sequential.does_scheme_exist()
+
+    V_potential_sources, V_no_targets = sequential._get_rows_and_columns()
+    assert get_m_SU_parallel(Graph, targets, V_potential_sources, V_no_targets, 2, chunk_size=1) == sequential.get_m_SU()
+    assert all_columns_protected_parallel(Graph, targets, V_potential_sources, V_no_targets, 2, chunk_size=1) == \
+        sequential.does_scheme_exist()
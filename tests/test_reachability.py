@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+import pytest
+
+from network_algs import GraphContext, layered_dag, to_graph
+from network_algs.CSRGraph import CSRGraph
+from network_algs.reachability import get_reachability_bitmap, update_reachability_bitmap, reaches_all_targets
+
+def unpack(bitmap: np.ndarray, num_targets: int):
+    """
+    Bool matrix with entry (v, j) True if bit j of row v is set.
+    """
+    bits = np.unpackbits(bitmap.astype("<u8").view(np.uint8), axis=1, bitorder='little')
+    return bits[:, :num_targets].astype(bool)
+
+def brute_force(Graph, targets: list):
+    reached = [set(Graph.subcomponent(v, mode='out')) for v in range(Graph.vcount())]
+    expected = np.zeros((Graph.vcount(), len(targets)), dtype=bool)
+    for v in range(Graph.vcount()):
+        for j, t in enumerate(targets):
+            expected[v, j] = t in reached[v]
+    return expected
+
+@pytest.mark.parametrize("num_targets", [0, 1, 63, 64, 65, 130])
+@pytest.mark.parametrize("seed", range(3))
+def test_bitmap_matches_brute_force(make_dag, num_targets, seed):
+    Graph = make_dag(200, 0.02, seed)
+    targets = random.Random(seed).sample(range(200), num_targets)
+    bitmap = get_reachability_bitmap(Graph, targets)
+    assert bitmap.dtype == np.uint64
+    assert bitmap.shape == (200, max(1, -(-num_targets // 64)))
+    expected = brute_force(Graph, targets)
+    assert np.array_equal(unpack(bitmap, num_targets), expected)
+    assert np.array_equal(reaches_all_targets(bitmap, num_targets), expected.all(axis=1))
+
+@pytest.mark.parametrize("num_targets", [5, 64, 100])
+def test_vectorized_pass_matches_brute_force(num_targets):
+    # a wide and shallow graph takes the layer by layer pass
+    Graph = to_graph(400, layered_dag([100] * 4, 0.05, 0))
+    assert CSRGraph.from_graph(Graph).vectorize_by_layers()
+    targets = random.Random(num_targets).sample(range(400), num_targets)
+    assert np.array_equal(unpack(get_reachability_bitmap(Graph, targets), num_targets), brute_force(Graph, targets))
+
+@pytest.mark.parametrize("num_targets", [3, 64, 70])
+@pytest.mark.parametrize("seed", range(3))
+def test_update_after_edits(make_dag, num_targets, seed):
+    rng = random.Random(seed)
+    Graph = make_dag(120, 0.03, seed)
+    targets = rng.sample(range(120), num_targets)
+    context = GraphContext(Graph)
+    context.get_reachability_bitmap(targets)
+    for _ in range(15):
+        if rng.random() < 0.6:
+            try:
+                context.add_edges([tuple(rng.sample(range(120), 2))])
+            except ValueError:
+                continue
+        else:
+            context.delete_edges([Graph.es[rng.randrange(Graph.ecount())].tuple])
+        assert np.array_equal(unpack(context.get_reachability_bitmap(targets), num_targets), brute_force(Graph, targets))
+
+def test_update_reachability_bitmap_rows(make_dag):
+    Graph = make_dag(80, 0.05, 1)
+    targets = list(range(0, 80, 2))
+    bitmap = get_reachability_bitmap(Graph, targets)
+    order = Graph.topological_sorting(mode='out')
+    source, target = order[10], order[70]
+    if not Graph.are_adjacent(source, target):
+        Graph.add_edges([(source, target)])
+    position = {v: i for i, v in enumerate(order)}
+    upstream = sorted(Graph.subcomponent(source, mode='in'), key=position.__getitem__, reverse=True)
+    update_reachability_bitmap(bitmap, Graph.get_adjlist(mode='out'), targets, upstream)
+    assert np.array_equal(unpack(bitmap, len(targets)), brute_force(Graph, targets))
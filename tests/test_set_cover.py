@@ -0,0 +1,107 @@
+import itertools
+import random
+
+import igraph as ig
+import pytest
+
+from network_algs import ShareKey, greedy_set_cover, exact_set_cover
+
+def brute_force_cover(sets: list, universe: int):
+    """
+    Size of a minimum cover found by trying every combination of sets, None if there is no cover.
+    """
+    for size in range(len(sets) + 1):
+        for combination in itertools.combinations(sets, size):
+            union = 0
+            for s in combination:
+                union |= s
+            if not universe & ~union:
+                return size
+    return None
+
+def covers(sets: list, universe: int, chosen: list):
+    union = 0
+    for i in chosen:
+        union |= sets[i]
+    return not universe & ~union
+
+def random_instance(rng: random.Random):
+    num_elements = rng.randint(1, 10)
+    sets = [rng.getrandbits(num_elements) & rng.getrandbits(num_elements) for _ in range(rng.randint(0, 9))]
+    return sets, (1 << num_elements) - 1
+
+@pytest.mark.parametrize("seed", range(200))
+def test_greedy_set_cover_is_an_irredundant_cover(seed):
+    sets, universe = random_instance(random.Random(seed))
+    chosen = greedy_set_cover(sets, universe)
+    minimum = brute_force_cover(sets, universe)
+    if minimum is None:
+        assert chosen is None
+        return
+    assert covers(sets, universe, chosen)
+    assert len(set(chosen)) == len(chosen) >= minimum
+    # no chosen set can be dropped
+    for i in chosen:
+        assert not covers(sets, universe, [j for j in chosen if j != i])
+
+@pytest.mark.parametrize("seed", range(200))
+def test_exact_set_cover_is_minimum(seed):
+    sets, universe = random_instance(random.Random(seed))
+    chosen = exact_set_cover(sets, universe)
+    minimum = brute_force_cover(sets, universe)
+    if minimum is None:
+        assert chosen is None
+        return
+    assert covers(sets, universe, chosen)
+    assert len(chosen) == minimum
+    assert chosen == sorted(chosen)
+
+def test_empty_universe_needs_no_sets():
+    assert greedy_set_cover([0b11, 0b1], 0) == []
+    assert exact_set_cover([0b11, 0b1], 0) == []
+
+def bits(elements):
+    return sum(1 << e for e in elements)
+
+def test_exact_set_cover_beats_greedy():
+    # two rows of 14 elements. Greedy takes the columns of 16, 8 and 4 elements, each larger than what is left of a row
+    rows = [bits(range(0, 14)), bits(range(14, 28))]
+    columns = [bits([0, 1, 14, 15]), bits([*range(2, 6), *range(16, 20)]), bits([*range(6, 14), *range(20, 28)])]
+    sets = rows + columns
+    universe = bits(range(28))
+    assert sorted(greedy_set_cover(sets, universe)) == [2, 3, 4]
+    assert exact_set_cover(sets, universe) == [0, 1]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_min_source_set_covers_m_SU(make_dag, seed):
+    rng = random.Random(seed)
+    Graph = make_dag(12, 0.3, seed)
+    targets = rng.sample(range(12), 2)
+    key = ShareKey(Graph, targets)
+    m_SU = key.get_m_SU()
+    rows = [m_SU.row_bitset(i) for i in range(len(m_SU.rows))]
+    universe = (1 << len(m_SU.columns)) - 1
+    minimum = brute_force_cover(rows, universe) if rows else None
+    for exact in (False, True):
+        sources = key.get_min_source_set(exact=exact)
+        if minimum is None:
+            assert sources is None
+            continue
+        assert set(sources) <= set(m_SU.rows)
+        assert covers(rows, universe, [m_SU.rows.index(s) for s in sources])
+        if exact:
+            assert len(sources) == minimum
+
+@pytest.mark.parametrize("exact", [False, True])
+def test_min_source_set_with_nothing_to_protect(exact):
+    # every vertex is a target, so the source/cut matrix has no columns
+    Graph = ig.Graph(3, [(0, 1), (1, 2)], directed=True)
+    assert ShareKey(Graph, [0, 1, 2]).get_min_source_set(exact=exact) == []
+    # no vertex outside the targets, and no vertex that reaches both targets
+    assert ShareKey(ig.Graph(2, [], directed=True), [0, 1]).get_min_source_set(exact=exact) == []
+
+@pytest.mark.parametrize("exact", [False, True])
+def test_min_source_set_without_sources(exact):
+    # no vertex reaches both targets
+    Graph = ig.Graph(4, [(0, 1), (2, 3)], directed=True)
+    assert ShareKey(Graph, [1, 3]).get_min_source_set(exact=exact) is None